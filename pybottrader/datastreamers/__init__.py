@@ -10,5 +10,11 @@ to bring access to the next data item. Current data streamers implemented:
 from typing import Optional
 import pandas as pd
 from .yfinance import YFHistory
+from .base import Bar
 from .base import DataStreamer
 from .base import CSVFileStreamer
+from .columnar import MmapStreamer
+from .columnar import write_columnar
+from .store import HistoryStore
+from .store import StoreStreamer
+from .cache import HistoryCache
@@ -3,8 +3,70 @@ Base classes for data streamers.
 All datastreamer should inherit from DataStreamer.
 """
 
-from typing import Optional
+from typing import Dict, Iterable, Iterator, Optional, Union
+from collections.abc import Mapping
+import queue
+import threading
+import numpy as np
 import pandas as pd
+from ..types import DateStamp
+
+TimeStamp = Union[float, DateStamp, pd.Timestamp]
+
+
+def to_seconds(time: TimeStamp) -> float:
+    """
+    Seconds since the epoch. Numbers are taken as seconds already, and dates
+    without a time zone as UTC.
+    """
+    if isinstance(time, (int, float, np.number)):
+        return float(time)
+    stamp = pd.Timestamp(time)
+    if stamp.tzinfo is None:
+        stamp = stamp.tz_localize("UTC")
+    return stamp.timestamp()
+
+
+def time_column(values: Union[np.ndarray, pd.Series]) -> np.ndarray:
+    """
+    Time stamps as seconds since the epoch. Numeric values, or strings of
+    numbers, are taken as seconds already. Other strings are parsed as dates.
+    """
+    values = np.asarray(values)
+    if np.issubdtype(values.dtype, np.number):
+        return values
+    try:
+        return np.asarray(pd.to_numeric(values), dtype=np.float64)
+    except (ValueError, TypeError):
+        times = pd.to_datetime(values, utc=True)
+        seconds = (times - pd.Timestamp(0, tz="UTC")) / pd.Timedelta(seconds=1)
+        return np.asarray(seconds, dtype=np.float64)
+
+
+class Bar(Mapping):
+    """
+    A row of data, read from the column arrays of a data streamer in fast
+    mode. It is accessed like the dictionaries returned by `next` in the
+    default mode, e.g. `bar["close"]`, but the row is not copied.
+    """
+
+    __slots__ = ("_columns", "_index")
+
+    def __init__(self, columns: Dict[str, np.ndarray], index: int):
+        self._columns = columns
+        self._index = index
+
+    def __getitem__(self, key: str):
+        return self._columns[key][self._index]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._columns)
+
+    def __len__(self) -> int:
+        return len(self._columns)
+
+    def __repr__(self) -> str:
+        return f"Bar({dict(self)})"
 
 
 class DataStreamer:
@@ -14,28 +76,136 @@ class DataStreamer:
     data = pd.DataFrame()
     symbol = ""
     label = ""
+    fast = False
+    _offset = 0  # Index of the first observation in `data`
+    _arrays: Optional[Dict[str, np.ndarray]] = None
+    _arrays_source = None
+    _times: Optional[np.ndarray] = None
+    _times_source = None
+
+    def __init__(self, fast: bool = False):
+        """
+        Init method
+        :param fast: In fast mode, the columns are extracted once as NumPy
+            arrays and observations are returned as `Bar` objects instead
+            of dictionaries.
+        """
+        self.fast = fast
+
+    def _columns(self) -> Dict[str, np.ndarray]:
+        """
+        The data as a dictionary of column arrays, used in fast mode
+        """
+        return {col: self.data[col].to_numpy() for col in self.data.columns}
+
+    def _column_arrays(self) -> Dict[str, np.ndarray]:
+        """
+        Column arrays, extracted again only when `data` is replaced
+        """
+        if self._arrays is None or self._arrays_source is not self.data:
+            self._arrays = self._columns()
+            self._arrays_source = self.data
+        return self._arrays
+
+    def _time_values(self) -> np.ndarray:
+        """
+        Time stamps of `data` in seconds, converted again only when `data`
+        is replaced
+        """
+        if self._times is None or self._times_source is not self.data:
+            self._times = time_column(self._column_arrays()["time"])
+            self._times_source = self.data
+        return self._times
+
+    def _time_search(self, seconds: float) -> int:
+        """
+        Index of the first observation at or after a time stamp. Streamers
+        that load their data in parts override it to load the right part.
+        """
+        return self._offset + int(np.searchsorted(self._time_values(), seconds))
+
+    def _length(self) -> int:
+        """Number of observations, up to the end of `data`"""
+        return self._offset + len(self.data)
 
-    def __init__(self):
-        """Init method"""
+    def _available(self, index: int) -> bool:
+        """
+        Whether there is an observation at the given index. Streamers that
+        load their data in parts override it to load the part with that
+        index into `data`.
+        """
+        return index < self._length()
 
-    def next(self) -> Optional[dict]:
+    def _row(self, index: int) -> Union[dict, Bar]:
+        """The observation at the given index"""
+        if self.fast:
+            return Bar(self._column_arrays(), index - self._offset)
+        return self.data.iloc[index - self._offset].to_dict()
+
+    def next(self) -> Optional[Union[dict, Bar]]:
         """Returns the next observation"""
-        if self.index >= len(self.data):
+        if not self._available(self.index):
             return None
-        result = self.data.iloc[self.index].to_dict()
+        result = self._row(self.index)
         self.index += 1
         return result
 
-    def result(self) -> Optional[dict]:
+    def result(self) -> Optional[Union[dict, Bar]]:
         """Returns the current observation"""
-        if self.index >= len(self.data):
+        if not self._available(self.index):
+            return None
+        return self._row(self.index)
+
+    def next_batch(self, n: int) -> Optional[Dict[str, np.ndarray]]:
+        """
+        Returns the next `n` observations, or the remaining ones if there
+        are less, as a dictionary of column arrays. Arrays are views of the
+        data when possible, so they must not be modified.
+        :param n: Number of observations
+        :return: None if there are no more observations
+        """
+        if n < 1:
+            raise ValueError("The batch size must be positive")
+        end = self.index + n
+        parts = []
+        while self.index < end and self._available(self.index):
+            start = self.index
+            self.index = min(end, self._length())
+            parts.append(
+                {
+                    col: values[start - self._offset : self.index - self._offset]
+                    for col, values in self._column_arrays().items()
+                }
+            )
+        if not parts:
             return None
-        return self.data.iloc[self.index].to_dict()
+        if len(parts) == 1:
+            return parts[0]
+        return {col: np.concatenate([part[col] for part in parts]) for col in parts[0]}
 
     def reset(self):
         """Resets the counter to 0"""
         self.index = 0
 
+    def seek_index(self, index: int):
+        """
+        Moves to an observation, so it is the next one returned by `next`
+        :param index: Index of the observation
+        """
+        if index < 0:
+            raise ValueError("The index must not be negative")
+        self.index = index
+
+    def seek(self, timestamp: TimeStamp) -> int:
+        """
+        Moves to the first observation at or after a time stamp, found by
+        binary search on the `time` column, which must be sorted.
+        :param timestamp: A date, or seconds since the epoch
+        :return: The index of the observation
+        """
+        self.seek_index(self._time_search(to_seconds(timestamp)))
+        return self.index
+
     @staticmethod
     def labels() -> dict:
         """Labeling helper"""
@@ -47,14 +217,189 @@ class DataStreamer:
         }
 
 
+class ChunkPrefetcher:
+    """
+    Reads chunks of data from an iterable in a background thread, keeping
+    at most `size` of them in memory ahead of the consumer.
+    """
+
+    def __init__(self, chunks: Iterable[pd.DataFrame], size: int = 1):
+        if size < 1:
+            raise ValueError("The prefetch size must be positive")
+        self._queue: queue.Queue = queue.Queue(maxsize=size)
+        self._stop = threading.Event()
+        self._done = False
+        self._thread = threading.Thread(target=self._read, args=(chunks,), daemon=True)
+        self._thread.start()
+
+    def _put(self, item) -> bool:
+        """Waits for room in the queue, unless the reading is stopped"""
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def _read(self, chunks: Iterable[pd.DataFrame]):
+        try:
+            for chunk in chunks:
+                if not self._put(chunk):
+                    return
+            self._put(None)
+        except Exception as error:  # pylint: disable=broad-exception-caught
+            # Raised again in the consumer thread
+            self._put(error)
+        finally:
+            close = getattr(chunks, "close", None)
+            if close:
+                close()
+
+    def get(self) -> Optional[pd.DataFrame]:
+        """
+        Returns the next chunk, waiting for it if needed.
+        :return: None when there are no more chunks
+        """
+        if self._done:
+            return None
+        item = self._queue.get()
+        if item is None or isinstance(item, Exception):
+            self._done = True
+        if isinstance(item, Exception):
+            raise item
+        return item
+
+    def stop(self):
+        """Stops reading, without waiting for the thread to finish"""
+        self._stop.set()
+        self._done = True
+
+    def close(self):
+        """Stops reading"""
+        self.stop()
+        self._thread.join()
+
+
 class CSVFileStreamer(DataStreamer):
     """
     An dataframe file streamer
+    By default, the whole file is loaded at once. With `chunksize`, it is
+    read in chunks by a background thread, which reads ahead at most
+    `prefetch` chunks, so memory use does not depend on the file size.
     """
 
     data: pd.DataFrame
     index: int
+    filename: str
+    chunksize: Optional[int]
+    dtype: Optional[dict]
+    usecols: Optional[list]
+    prefetch: int
+    _chunks: Optional[ChunkPrefetcher] = None
+    _chunk_rows = 0  # Rows per chunk, in chunked mode
+    _chunk_times: Optional[np.ndarray] = None
 
-    def __init__(self, filename: str):
+    def __init__(
+        self,
+        filename: str,
+        fast: bool = False,
+        chunksize: Optional[int] = None,
+        dtype: Optional[dict] = None,
+        usecols: Optional[list] = None,
+        prefetch: int = 1,
+    ):
+        """
+        :param filename: CSV file
+        :param fast: Fast mode (see `DataStreamer`)
+        :param chunksize: Number of rows per chunk, to read the file in chunks
+        :param dtype: Column types, passed to `pandas.read_csv`
+        :param usecols: Columns to read, passed to `pandas.read_csv`
+        :param prefetch: Number of chunks read ahead
+        """
+        super().__init__(fast=fast)
         self.index = 0
-        self.data = pd.read_csv(filename)
+        self.filename = filename
+        self.chunksize = chunksize
+        self.dtype = dtype
+        self.usecols = usecols
+        self.prefetch = prefetch
+        if chunksize is None:
+            self.data = pd.read_csv(filename, dtype=dtype, usecols=usecols)
+        else:
+            self._chunk_rows = chunksize
+            self._open()
+
+    def _open(self, start: int = 0):
+        """
+        Starts reading the file in chunks, from the given row. Rows before it
+        are skipped by the parser without being converted.
+        """
+        reader = pd.read_csv(
+            self.filename,
+            dtype=self.dtype,
+            usecols=self.usecols,
+            chunksize=self._chunk_rows,
+            skiprows=range(1, start + 1) if start else None,
+        )
+        self._chunks = ChunkPrefetcher(reader, self.prefetch)
+        self.data = pd.DataFrame()
+        self._offset = start
+
+    def _available(self, index: int) -> bool:
+        if self._chunks is None:
+            return super()._available(index)
+        while index >= self._length():
+            chunk = self._chunks.get()
+            if chunk is None:
+                return False
+            self._offset += len(self.data)
+            self.data = chunk
+        return index >= self._offset
+
+    def reset(self):
+        super().reset()
+        if self._chunks is not None:
+            self._chunks.close()
+            self._open()
+
+    def seek_index(self, index: int):
+        super().seek_index(index)
+        if self._chunks is None:
+            return
+        # Chunks up to the next one are read, otherwise the file is reopened
+        if not self._offset <= index < self._length() + self._chunk_rows:
+            self._chunks.close()
+            self._open(index - index % self._chunk_rows)
+
+    def _chunk_index(self) -> np.ndarray:
+        """
+        First time stamp of every chunk, read once from the time column only
+        """
+        if self._chunk_times is None:
+            reader = pd.read_csv(
+                self.filename, usecols=["time"], chunksize=self._chunk_rows
+            )
+            with reader:
+                self._chunk_times = np.array(
+                    [time_column(chunk["time"])[0] for chunk in reader]
+                )
+        return self._chunk_times
+
+    def _time_search(self, seconds: float) -> int:
+        if self._chunks is None:
+            return super()._time_search(seconds)
+        chunk = int(np.searchsorted(self._chunk_index(), seconds, side="right"))
+        self.seek_index(max(chunk - 1, 0) * self._chunk_rows)
+        if not self._available(self.index):
+            return self.index
+        return super()._time_search(seconds)
+
+    def close(self):
+        """Stops reading the file, in chunked mode"""
+        if self._chunks is not None:
+            self._chunks.close()
+
+    def __del__(self):
+        if self._chunks is not None:
+            self._chunks.stop()
@@ -0,0 +1,151 @@
+"""
+Local cache of histories
+
+Data retrieved from remote sources is kept in a `HistoryStore` for every
+source and interval, with the time ranges already retrieved for each symbol.
+A new request only retrieves the ranges that are missing. Ranges are only
+recorded up to one interval before the current time, so a bar still forming
+is retrieved again. Processes sharing a cache are serialized with a file lock
+(on POSIX systems).
+"""
+
+from contextlib import contextmanager
+import json
+import os
+import re
+import time
+from types import ModuleType
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import quote
+import pandas as pd
+from .store import HistoryStore
+from ..types import TickerSymbol, TimeFrame
+
+fcntl: Optional[ModuleType]
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+RANGES = "ranges.json"
+LOCK = ".lock"
+
+Range = Tuple[float, float]
+Fetcher = Callable[[float, float], pd.DataFrame]
+
+UNITS = {"m": 60, "h": 60 * 60, "d": 24 * 60 * 60, "wk": 7 * 24 * 60 * 60}
+
+
+def interval_seconds(interval: TimeFrame) -> int:
+    """
+    Length of an interval like "5m", "1h", "1d" or "1wk", in seconds.
+    Months ("mo") are taken as 31 days.
+    """
+    match = re.fullmatch(r"(\d+)(m|h|d|wk|mo)", interval)
+    if match is None:
+        raise ValueError(f"Unknown interval {interval}")
+    unit = match.group(2)
+    return int(match.group(1)) * (31 * UNITS["d"] if unit == "mo" else UNITS[unit])
+
+
+def merge_ranges(ranges: List[Range]) -> List[Range]:
+    """Merges overlapping or adjacent time ranges"""
+    merged: List[Range] = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def missing_ranges(covered: List[Range], start: float, end: float) -> List[Range]:
+    """Parts of the time range [start, end) not in the covered ranges"""
+    missing = []
+    for first, last in merge_ranges(covered):
+        if first > start:
+            missing.append((start, min(first, end)))
+        start = max(start, last)
+        if start >= end:
+            break
+    if start < end:
+        missing.append((start, end))
+    return missing
+
+
+class HistoryCache:
+    """
+    A cache of histories keyed by source, symbol and interval.
+    """
+
+    directory: str
+
+    def __init__(self, directory: Optional[str] = None):
+        """
+        :param directory: Cache directory, by default `~/.cache/pybottrader`
+        """
+        if directory is None:
+            directory = os.path.join(os.path.expanduser("~"), ".cache", "pybottrader")
+        self.directory = str(directory)
+
+    def _root(self, source: str, interval: TimeFrame) -> str:
+        return os.path.join(self.directory, quote(source, safe=""), interval)
+
+    @contextmanager
+    def _lock(self, root: str):
+        """Holds an exclusive lock on a store of the cache"""
+        os.makedirs(root, exist_ok=True)
+        with open(os.path.join(root, LOCK), "a", encoding="utf-8") as file:
+            if fcntl is not None:
+                fcntl.flock(file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(file, fcntl.LOCK_UN)
+
+    def get(
+        self,
+        source: str,
+        symbol: TickerSymbol,
+        interval: TimeFrame,
+        start: float,
+        end: float,
+        fetch: Fetcher,
+    ) -> pd.DataFrame:
+        """
+        Returns the data in the time range [start, end), calling `fetch` only
+        for the parts of the range not retrieved before. Parts less than one
+        interval before the current time are retrieved on every call.
+        :param source: Name of the data source
+        :param start: First time stamp, in seconds since the epoch
+        :param end: Last time stamp (excluded), in seconds since the epoch
+        :param fetch: A function taking the start and end of a range, in
+            seconds, and returning its data with a `time` column
+        """
+        root = self._root(source, interval)
+        # Bars starting after this time may not be complete
+        complete = time.time() - interval_seconds(interval)
+        with self._lock(root):
+            path = os.path.join(root, RANGES)
+            ranges: Dict[str, List[Range]] = {}
+            if os.path.exists(path):
+                with open(path, encoding="utf-8") as file:
+                    ranges = json.load(file)
+            covered = [
+                (float(first), float(last)) for first, last in ranges.get(symbol, [])
+            ]
+            missing = missing_ranges(covered, start, end)
+            if missing:
+                store = HistoryStore(root)
+                for first, last in missing:
+                    data = fetch(first, last)
+                    if len(data) > 0:
+                        store.write(symbol, data)
+                    if min(last, complete) > first:
+                        covered.append((first, min(last, complete)))
+                ranges[symbol] = merge_ranges(covered)
+                with open(path + ".tmp", "w", encoding="utf-8") as file:
+                    json.dump(ranges, file)
+                os.replace(path + ".tmp", path)
+            return HistoryStore(root).read(symbol, start, end)
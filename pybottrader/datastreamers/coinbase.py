@@ -3,25 +3,95 @@ Data Streamer for Coinbase
 """
 
 import os
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 import logging
 from datetime import datetime
+import threading
+import time
 import pandas as pd
-from requests.exceptions import HTTPError
+from requests.adapters import HTTPAdapter
+from requests.exceptions import ConnectionError as RequestsConnectionError
+from requests.exceptions import HTTPError, Timeout
 from coinbase.rest import RESTClient
 from .base import DataStreamer
+from .cache import HistoryCache
 from ..types import DateStamp, TickerSymbol, TimeFrame
 
 LIMIT = 350  # Limit set by Coinbase
+GRANULARITY = {
+    "ONE_MINUTE": 60,
+    "FIVE_MINUTE": 5 * 60,
+    "FIFTEEN_MINUTE": 15 * 60,
+    "THIRTY_MINUTE": 30 * 60,
+    "ONE_DAY": 24 * 60 * 60,
+}
+RETRIES = 3  # Retries of a failed request
+BACKOFF = 0.5  # Seconds before the first retry, doubled on each one
+
+
+class TokenBucket:
+    """
+    A token bucket rate limiter, shared by threads. Tokens are added at a
+    constant rate, up to `capacity`, and each request takes one.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        """
+        :param rate: Tokens per second
+        :param capacity: Maximum tokens, by default `rate` (one second of burst)
+        """
+        if rate <= 0:
+            raise ValueError("The rate must be positive")
+        self.rate = rate
+        self.capacity = rate if capacity is None else capacity
+        self.tokens = self.capacity
+        self.last = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Takes a token, waiting for it if needed"""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(
+                    self.capacity, self.tokens + (now - self.last) * self.rate
+                )
+                self.last = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+# Coinbase limits requests per client, so streamers share a rate limit
+LIMITER = TokenBucket(10.0)
+
+
+def retryable(error: Exception) -> bool:
+    """Whether a failed request may succeed if sent again"""
+    if isinstance(error, (RequestsConnectionError, Timeout)):
+        return True
+    response = getattr(error, "response", None)
+    return (
+        response is None or response.status_code == 429 or response.status_code >= 500
+    )
 
 
 class CBHistory(DataStreamer):
-    """Using Coinbase as a data streamer"""
+    """
+    Using Coinbase as a data streamer. Long time ranges are split into
+    requests of at most `LIMIT` candles, sent concurrently.
+    """
 
     start: int
     end: int
     period: str
+    workers: int
+    limiter: TokenBucket
     client: Optional[RESTClient] = None
+    cache: Optional[HistoryCache] = None
 
     def __init__(
         self,
@@ -29,9 +99,24 @@ class CBHistory(DataStreamer):
         start: DateStamp,
         end: Optional[DateStamp],
         interval: TimeFrame = "1d",
+        fast: bool = False,
+        cache: Optional[HistoryCache] = None,
+        workers: int = 4,
+        limiter: Optional[TokenBucket] = None,
     ):
-        super().__init__()
+        """
+        :param cache: A local cache, so only the candles not retrieved before
+            are requested
+        :param workers: Maximum number of concurrent requests
+        :param limiter: Rate limit of the requests, by default `LIMITER`,
+            shared by all the streamers (10 requests per second)
+        """
+        super().__init__(fast=fast)
         self.symbol = symbol
+        self.interval = interval
+        self.cache = cache
+        self.workers = workers
+        self.limiter = LIMITER if limiter is None else limiter
 
         # Setting the intervalo of time
         if interval == "1m":
@@ -50,12 +135,7 @@ class CBHistory(DataStreamer):
             self.end = int(datetime.fromisoformat(end).timestamp())
         else:
             self.end = int(datetime.now().timestamp())
-        factor = LIMIT * 60
-        if self.period == "ONE_DAY":
-            factor *= 60 * 24
-        limit = self.end - factor
         self.start = int(datetime.fromisoformat(start).timestamp())
-        self.start = self.start if self.start >= limit else limit
 
         # Credentials
         if not "COINBASE_API_KEY" in os.environ:
@@ -69,6 +149,8 @@ class CBHistory(DataStreamer):
                 api_key=os.environ["COINBASE_API_KEY"],
                 api_secret=os.environ["COINBASE_SECRET_KEY"],
             )
+            # RESTClient sends requests through a requests.Session
+            self.client.session.mount("https://", HTTPAdapter(pool_maxsize=workers))
         except HTTPError:
             logging.warning("Connection to Coinbase failed")
             return
@@ -78,16 +160,61 @@ class CBHistory(DataStreamer):
         if not self.client:
             return
         try:
-            response = self.client.get_candles(
-                self.symbol, self.start, self.end, self.period
-            )
-            self.data = (
-                pd.DataFrame(
-                    [candle.to_dict() for candle in response["candles"]]
-                ).rename(columns={"start": "time"})
-                # .set_index("time")
-            )
-            for col in ["open", "close", "low", "high", "volume"]:
-                self.data[col] = self.data[col].astype(float)
-        except HTTPError:
+            if self.cache is None:
+                self.data = self._fetch(self.start, self.end)
+            else:
+                self.data = self.cache.get(
+                    "coinbase",
+                    self.symbol,
+                    self.interval,
+                    self.start,
+                    self.end,
+                    lambda first, last: self._fetch(int(first), int(last)),
+                )
+        except (HTTPError, RequestsConnectionError, Timeout):
             logging.warning("Network error retrieving candles")
+
+    def _fetch(self, start: int, end: int) -> pd.DataFrame:
+        """
+        Requests the candles in a time range, in windows of at most `LIMIT`
+        candles, and merges them sorted by time
+        """
+        step = LIMIT * GRANULARITY[self.period]
+        windows = [
+            (first, min(first + step - GRANULARITY[self.period], end))
+            for first in range(start, end, step)
+        ]
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            frames = [
+                frame
+                for frame in executor.map(lambda w: self._fetch_window(*w), windows)
+                if len(frame) > 0
+            ]
+        if not frames:
+            return pd.DataFrame()
+        return (
+            pd.concat(frames, ignore_index=True)
+            .drop_duplicates("time", keep="last")
+            .sort_values("time", ignore_index=True)
+        )
+
+    def _fetch_window(self, start: int, end: int) -> pd.DataFrame:
+        """Requests the candles in a window, retrying failed requests"""
+        assert self.client is not None
+        for attempt in range(RETRIES + 1):
+            self.limiter.acquire()
+            try:
+                response = self.client.get_candles(self.symbol, start, end, self.period)
+                break
+            except (HTTPError, RequestsConnectionError, Timeout) as error:
+                if attempt == RETRIES or not retryable(error):
+                    raise
+                time.sleep(BACKOFF * 2**attempt)
+        candles = [candle.to_dict() for candle in response["candles"]]
+        if not candles:
+            return pd.DataFrame()
+        data = pd.DataFrame(candles).rename(columns={"start": "time"})
+        data["time"] = data["time"].astype(float)
+        for col in ["open", "close", "low", "high", "volume"]:
+            data[col] = data[col].astype(float)
+        return data
@@ -0,0 +1,137 @@
+"""
+Columnar data files
+
+Data can be stored in a directory with one file per column, holding the
+values as a little-endian binary array, and a `manifest.json` file that
+describes the columns. `MmapStreamer` opens these files as memory maps, so
+there is nothing to parse and many processes can share the same data through
+the page cache.
+"""
+
+import json
+import os
+from typing import Dict, Union
+import numpy as np
+import pandas as pd
+from .base import Bar, DataStreamer, time_column
+
+MANIFEST = "manifest.json"
+FORMAT = "pybottrader-columnar"
+VERSION = 1
+
+
+def _column_data(name: str, values: np.ndarray) -> np.ndarray:
+    """Values of a column, ready to be written"""
+    if name == "time":
+        values = time_column(values)
+    if not (np.issubdtype(values.dtype, np.number) or values.dtype == np.bool_):
+        raise ValueError(f"Column {name} is not numeric")
+    return values.astype(values.dtype.newbyteorder("<"), copy=False)
+
+
+def write_columnar(
+    source: Union[pd.DataFrame, DataStreamer],
+    directory: str,
+    batch_size: int = 100_000,
+):
+    """
+    Writes data in the columnar format. Columns must be numeric, except
+    `time`, which is converted to seconds since the epoch (see `time_column`).
+    :param source: A data frame, or a data streamer. Streamers are read from
+        the beginning, in batches, so files read in chunks by
+        `CSVFileStreamer` are never loaded at once.
+    :param directory: Output directory, created if it does not exist
+    :param batch_size: Number of observations read from streamers at once
+    """
+    symbol = ""
+    if isinstance(source, DataStreamer):
+        symbol = source.symbol
+        source.reset()
+        batches = iter(lambda: source.next_batch(batch_size), None)
+    else:
+        batches = iter([{col: source[col].to_numpy() for col in source.columns}])
+    os.makedirs(directory, exist_ok=True)
+    files = {}
+    dtypes: Dict[str, str] = {}
+    rows = 0
+    try:
+        for batch in batches:
+            for name, values in batch.items():
+                data = _column_data(name, np.asarray(values))
+                if name not in files:
+                    files[name] = open(  # pylint: disable=consider-using-with
+                        os.path.join(directory, f"{name}.bin"), "wb"
+                    )
+                    dtypes[name] = data.dtype.str
+                files[name].write(data.astype(dtypes[name], copy=False).tobytes())
+            rows += len(next(iter(batch.values()))) if batch else 0
+    finally:
+        for column_file in files.values():
+            column_file.close()
+    manifest = {
+        "format": FORMAT,
+        "version": VERSION,
+        "symbol": symbol,
+        "rows": rows,
+        "columns": [[name, dtype] for name, dtype in dtypes.items()],
+    }
+    # The manifest is written last, so an incomplete conversion cannot be opened
+    path = os.path.join(directory, MANIFEST)
+    with open(path + ".tmp", "w", encoding="utf-8") as manifest_file:
+        json.dump(manifest, manifest_file, indent=2)
+    os.replace(path + ".tmp", path)
+
+
+def read_manifest(directory: str) -> dict:
+    """
+    Reads the manifest of a directory in the columnar format
+    :raises ValueError: if it is not a manifest of this format
+    """
+    with open(os.path.join(directory, MANIFEST), encoding="utf-8") as file:
+        manifest = json.load(file)
+    if manifest.get("format") != FORMAT or manifest.get("version") != VERSION:
+        raise ValueError(f"Unsupported data format in {directory}")
+    return manifest
+
+
+class MmapStreamer(DataStreamer):
+    """
+    A data streamer on data in the columnar format (see `write_columnar`).
+    Columns are opened as read-only memory maps.
+    """
+
+    directory: str
+    rows: int
+    arrays: Dict[str, np.ndarray]
+
+    def __init__(self, directory: str, fast: bool = False):
+        """
+        :param directory: Directory with the data
+        :param fast: Fast mode (see `DataStreamer`)
+        """
+        super().__init__(fast=fast)
+        self.index = 0
+        self.directory = directory
+        manifest = read_manifest(directory)
+        self.symbol = manifest["symbol"]
+        self.rows = manifest["rows"]
+        self.arrays = {}
+        for name, dtype in manifest["columns"]:
+            path = os.path.join(directory, f"{name}.bin")
+            if self.rows == 0:
+                self.arrays[name] = np.empty(0, dtype=dtype)
+            else:
+                self.arrays[name] = np.memmap(
+                    path, dtype=dtype, mode="r", shape=(self.rows,)
+                )
+
+    def _columns(self) -> Dict[str, np.ndarray]:
+        return self.arrays
+
+    def _length(self) -> int:
+        return self.rows
+
+    def _row(self, index: int) -> Union[dict, Bar]:
+        if self.fast:
+            return Bar(self.arrays, index)
+        return {name: values[index].item() for name, values in self.arrays.items()}
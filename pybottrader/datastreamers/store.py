@@ -0,0 +1,295 @@
+"""
+Partitioned history store
+
+Histories of many symbols are stored in a directory partitioned by symbol and
+month, each partition in the columnar format (see `columnar`):
+
+    <root>/index.json
+    <root>/<symbol>/<YYYY-MM>/<column>.bin
+
+The index keeps the first and last time stamp and the number of rows of every
+partition, so `StoreStreamer` only opens the partitions that overlap the
+requested time range.
+"""
+
+import json
+import os
+import shutil
+from typing import Iterable, List, Optional, Tuple, Union
+from urllib.parse import quote
+import numpy as np
+import pandas as pd
+from .base import DataStreamer, TimeStamp, time_column, to_seconds
+from .columnar import MmapStreamer, write_columnar
+from ..types import TickerSymbol
+
+INDEX = "index.json"
+
+
+def time_bounds(
+    times: np.ndarray, start: Optional[float], end: Optional[float]
+) -> Tuple[int, int]:
+    """Rows in the time range [start, end), from sorted time stamps"""
+    first = 0 if start is None else int(np.searchsorted(times, start))
+    last = len(times) if end is None else int(np.searchsorted(times, end))
+    return first, last
+
+
+class HistoryStore:
+    """
+    A directory with histories of many symbols, partitioned by symbol and
+    month.
+    """
+
+    root: str
+    partitions: List[dict]
+
+    def __init__(self, root: str):
+        """
+        :param root: Directory of the store, created if it does not exist
+        """
+        self.root = str(root)
+        os.makedirs(self.root, exist_ok=True)
+        self.partitions = []
+        path = os.path.join(self.root, INDEX)
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as file:
+                self.partitions = json.load(file)["partitions"]
+
+    def _path(self, symbol: TickerSymbol, month: str) -> str:
+        return os.path.join(self.root, quote(symbol, safe=""), month)
+
+    def _save_index(self):
+        """Writes the index, replacing the previous one at once"""
+        self.partitions.sort(key=lambda part: (part["symbol"], part["month"]))
+        path = os.path.join(self.root, INDEX)
+        with open(path + ".tmp", "w", encoding="utf-8") as file:
+            json.dump({"partitions": self.partitions}, file, indent=1)
+        os.replace(path + ".tmp", path)
+
+    def read_partition(self, symbol: TickerSymbol, month: str) -> MmapStreamer:
+        """Opens a partition"""
+        return MmapStreamer(self._path(symbol, month))
+
+    def write(self, symbol: TickerSymbol, data: pd.DataFrame):
+        """
+        Adds data of a symbol. It is merged with the stored data, replacing
+        the rows with the same time stamps.
+        :param data: Data with a `time` column and numeric columns
+        """
+        data = data.reset_index(drop=True).assign(time=time_column(data["time"]))
+        months = pd.to_datetime(data["time"], unit="s", utc=True).dt.strftime("%Y-%m")
+        known = {part["month"] for part in self.partitions if part["symbol"] == symbol}
+        for key, part in data.groupby(months.to_numpy(), sort=True):
+            month = str(key)
+            if month in known:
+                arrays = self.read_partition(symbol, month).arrays
+                stored = pd.DataFrame(
+                    {col: np.array(val) for col, val in arrays.items()}
+                )
+                part = pd.concat([stored, part], ignore_index=True)
+            part = (
+                part.drop_duplicates("time", keep="last")
+                .sort_values("time", kind="stable")
+                .reset_index(drop=True)
+            )
+            # Written aside and swapped, so open memory maps stay valid
+            path = self._path(symbol, month)
+            write_columnar(part, path + ".tmp")
+            if os.path.exists(path):
+                os.replace(path, path + ".old")
+            os.replace(path + ".tmp", path)
+            shutil.rmtree(path + ".old", ignore_errors=True)
+            self.partitions = [
+                entry
+                for entry in self.partitions
+                if (entry["symbol"], entry["month"]) != (symbol, month)
+            ]
+            self.partitions.append(
+                {
+                    "symbol": symbol,
+                    "month": month,
+                    "start": float(part["time"].iloc[0]),
+                    "end": float(part["time"].iloc[-1]),
+                    "rows": len(part),
+                }
+            )
+        self._save_index()
+
+    def read(
+        self,
+        symbol: TickerSymbol,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+    ) -> pd.DataFrame:
+        """
+        Reads the stored data of a symbol in the time range [start, end). The
+        data is copied, so it does not depend on the files.
+        """
+        frames = []
+        for part in self.select([symbol], start, end):
+            arrays = self.read_partition(symbol, part["month"]).arrays
+            first, last = time_bounds(arrays["time"], start, end)
+            frames.append(
+                pd.DataFrame(
+                    {
+                        col: np.array(values[first:last])
+                        for col, values in arrays.items()
+                    }
+                )
+            )
+        if not frames:
+            return pd.DataFrame()
+        return pd.concat(frames, ignore_index=True)
+
+    def symbols(self) -> List[TickerSymbol]:
+        """Stored symbols"""
+        return sorted({part["symbol"] for part in self.partitions})
+
+    def select(
+        self,
+        symbols: Iterable[TickerSymbol],
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+    ) -> List[dict]:
+        """
+        Index entries of the partitions of the given symbols that overlap the
+        time range [start, end), ordered by month and symbol
+        """
+        symbols = set(symbols)
+        selected = [
+            part
+            for part in self.partitions
+            if part["symbol"] in symbols
+            and (start is None or part["end"] >= start)
+            and (end is None or part["start"] < end)
+        ]
+        return sorted(selected, key=lambda part: (part["month"], part["symbol"]))
+
+
+class StoreStreamer(DataStreamer):
+    """
+    A data streamer on a slice of a `HistoryStore`. Partitions are read one
+    month at a time, only if they overlap the time range, and the rows of all
+    the symbols in a month are ordered by time. Observations have a `symbol`
+    column with the symbol they belong to.
+    """
+
+    store: HistoryStore
+    symbols: List[TickerSymbol]
+    start: Optional[float]
+    end: Optional[float]
+    months: List[List[dict]]
+    _month = 0
+    _starts: Optional[np.ndarray] = None
+
+    def __init__(
+        self,
+        store: Union[HistoryStore, str],
+        symbols: Union[TickerSymbol, Iterable[TickerSymbol]],
+        start: Optional[TimeStamp] = None,
+        end: Optional[TimeStamp] = None,
+        fast: bool = False,
+    ):
+        """
+        :param store: A store, or its directory
+        :param symbols: A symbol or a list of symbols
+        :param start: First time stamp included, as a date or in seconds
+        :param end: First time stamp excluded, as a date or in seconds
+        :param fast: Fast mode (see `DataStreamer`)
+        """
+        super().__init__(fast=fast)
+        self.index = 0
+        self.store = store if isinstance(store, HistoryStore) else HistoryStore(store)
+        self.symbols = [symbols] if isinstance(symbols, str) else list(symbols)
+        if len(self.symbols) == 1:
+            self.symbol = self.symbols[0]
+        self.start = None if start is None else to_seconds(start)
+        self.end = None if end is None else to_seconds(end)
+        self.months = []
+        for part in self.store.select(self.symbols, self.start, self.end):
+            if self.months and self.months[-1][0]["month"] == part["month"]:
+                self.months[-1].append(part)
+            else:
+                self.months.append([part])
+        self.reset()
+
+    def _load(self, parts: List[dict]) -> pd.DataFrame:
+        """Reads the rows in the time range from partitions of the same month"""
+        frames = []
+        for part in parts:
+            arrays = self.store.read_partition(part["symbol"], part["month"]).arrays
+            first, last = time_bounds(arrays["time"], self.start, self.end)
+            frame = pd.DataFrame(
+                {col: values[first:last] for col, values in arrays.items()}
+            )
+            frame.insert(1, "symbol", part["symbol"])
+            frames.append(frame)
+        data = pd.concat(frames, ignore_index=True)
+        if len(frames) > 1:
+            data = data.sort_values("time", kind="stable", ignore_index=True)
+        return data
+
+    def _month_starts(self) -> np.ndarray:
+        """
+        Index of the first observation of every month, followed by the number
+        of observations. Only partitions cut by the time range are opened to
+        count their rows, the others are counted from the index.
+        """
+        if self._starts is None:
+            counts = []
+            for parts in self.months:
+                count = 0
+                for part in parts:
+                    if (self.start is None or part["start"] >= self.start) and (
+                        self.end is None or part["end"] < self.end
+                    ):
+                        count += part["rows"]
+                    else:
+                        partition = self.store.read_partition(
+                            part["symbol"], part["month"]
+                        )
+                        first, last = time_bounds(
+                            partition.arrays["time"], self.start, self.end
+                        )
+                        count += last - first
+                counts.append(count)
+            self._starts = np.concatenate([[0], np.cumsum(counts, dtype=np.int64)])
+        return self._starts
+
+    def _available(self, index: int) -> bool:
+        while index >= self._length():
+            if self._month >= len(self.months):
+                return False
+            self._offset += len(self.data)
+            self.data = self._load(self.months[self._month])
+            self._month += 1
+        return index >= self._offset
+
+    def reset(self):
+        super().reset()
+        self.data = pd.DataFrame()
+        self._offset = 0
+        self._month = 0
+
+    def seek_index(self, index: int):
+        super().seek_index(index)
+        starts = self._month_starts()
+        month = int(np.searchsorted(starts, index, side="right")) - 1
+        if month >= len(self.months):
+            self.data = pd.DataFrame()
+            self._offset = int(starts[-1])
+            self._month = len(self.months)
+        elif self._month != month + 1 or self._offset != starts[month]:
+            self._offset = int(starts[month])
+            self.data = self._load(self.months[month])
+            self._month = month + 1
+
+    def _time_search(self, seconds: float) -> int:
+        # Months do not overlap, so their last time stamps are sorted
+        ends = [max(part["end"] for part in parts) for parts in self.months]
+        month = int(np.searchsorted(ends, seconds))
+        if month >= len(self.months):
+            return int(self._month_starts()[-1])
+        self.seek_index(int(self._month_starts()[month]))
+        return super()._time_search(seconds)
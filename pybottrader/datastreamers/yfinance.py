@@ -2,11 +2,13 @@
 Data streamear for yfinance
 """
 
-from typing import Union
-from datetime import datetime
+from typing import Optional, Union
+from datetime import datetime, timezone
 import numpy as np
+import pandas as pd
 import yfinance
-from .base import DataStreamer
+from .base import DataStreamer, to_seconds
+from .cache import HistoryCache
 from ..types import DateStamp, TickerSymbol, TimeFrame
 
 
@@ -19,14 +21,38 @@ class YFHistory(DataStreamer):
         start: DateStamp,
         end: Union[DateStamp, None] = None,
         interval: TimeFrame = "1d",
+        fast: bool = False,
+        cache: Optional[HistoryCache] = None,
     ):
-        super().__init__()
+        """
+        Dates without a time zone are taken as UTC.
+        :param end: By default, the current time
+        :param cache: A local cache, so only the data not retrieved before is
+            downloaded
+        """
+        super().__init__(fast=fast)
         self.symbol = symbol
-        ticker = yfinance.Ticker(symbol)
-        if end is None:
-            end = datetime.now().isoformat()
-        self.data = ticker.history(start=start, end=end, interval=interval)
-        self.data.columns = [col.lower() for col in self.data.columns]
-        self.data.index.names = ["time"]
-        self.data.index = self.data.index.astype(np.int64) / 1e9
-        self.data.reset_index(inplace=True)
+        self.interval = interval
+        first = to_seconds(start)
+        last = (
+            datetime.now(timezone.utc).timestamp() if end is None else to_seconds(end)
+        )
+        if cache is None:
+            self.data = self._download(first, last)
+        else:
+            self.data = cache.get(
+                "yfinance", symbol, interval, first, last, self._download
+            )
+
+    def _download(self, start: float, end: float) -> pd.DataFrame:
+        """Downloads the data in a time range, given in seconds"""
+        ticker = yfinance.Ticker(self.symbol)
+        data = ticker.history(
+            start=datetime.fromtimestamp(start, timezone.utc),
+            end=datetime.fromtimestamp(end, timezone.utc),
+            interval=self.interval,
+        )
+        data.columns = [col.lower() for col in data.columns]
+        data.index.names = ["time"]
+        data.index = data.index.astype(np.int64) / 1e9
+        return data.reset_index()
@@ -1 +1,2 @@
 from ._indicators import *
+from .parallel import update_many_parallel
@@ -5,17 +5,117 @@
  * Library of indicators
  */
 
+#include <climits>
 #include <cmath>
 #include <vector>
+#include <functional>
+#include <algorithm>
 #include <stdexcept>
+#include <string>
+#include <cstring>
+#include <type_traits>
+#include <array>
+#include <memory>
+#include <utility>
 
 namespace indicators {
 
+    /**
+    * Validate a period or a window size, before any memory is allocated
+    * for it
+    * @param minimum: the smallest valid value
+    * @throws std::invalid_argument if `value` is less than `minimum`
+    */
+    inline int check_size(int value, int minimum = 1) {
+        if (value < minimum) {
+            throw std::invalid_argument(minimum > 0 ? "The period must be positive"
+                                                    : "The size must not be negative");
+        }
+        return value;
+    }
+
+    /**
+    * Binary state serialization
+    * Indicators write their full internal state (parameters, counters,
+    * windows and memory) with `save` and restore it with `load`. Values are
+    * stored with their native binary layout, so a state can only be loaded
+    * by the same build of the library on the same platform.
+    */
+    class StateWriter {
+    private:
+        std::string buffer;
+
+    public:
+        template <typename T>
+        void write(const T &value) {
+            static_assert(std::is_trivially_copyable<T>::value,
+                          "Only trivially copyable values can be written");
+            buffer.append(reinterpret_cast<const char *>(&value), sizeof(T));
+        }
+
+        template <typename T>
+        void write(const std::vector<T> &values) {
+            write(values.size());
+            for (const T &value : values) {
+                write(value);
+            }
+        }
+
+        const std::string &data() const { return buffer; }
+    };
+
+    class StateReader {
+    private:
+        const std::string &buffer;
+        size_t pos;
+
+    public:
+        StateReader(const std::string &buffer) : buffer(buffer), pos(0) {}
+
+        /**
+        * @throws std::invalid_argument if there is not enough data
+        */
+        template <typename T>
+        void read(T &value) {
+            static_assert(std::is_trivially_copyable<T>::value,
+                          "Only trivially copyable values can be read");
+            if (buffer.size() - pos < sizeof(T)) {
+                throw std::invalid_argument("Invalid indicator state");
+            }
+            std::memcpy(&value, buffer.data() + pos, sizeof(T));
+            pos += sizeof(T);
+        }
+
+        template <typename T>
+        void read(std::vector<T> &values) {
+            size_t size;
+            read(size);
+            if (size > (buffer.size() - pos) / sizeof(T)) {
+                throw std::invalid_argument("Invalid indicator state");
+            }
+            values.resize(size);
+            for (T &value : values) {
+                read(value);
+            }
+        }
+
+        /** True when all the data has been read */
+        bool done() const { return pos == buffer.size(); }
+    };
+
     /**
     * Indicator class
     * This class is a base class for all indicators. It provides a way to store
     * the values of the indicator in a circular buffer.
     * The class is templated to allow for any type of data to be stored.
+    * Indicators have an `update` method, to process a new input, and a
+    * `revise` method, taking the same arguments, that replaces the most
+    * recent input (e.g. while the current bar is still open) and recomputes
+    * the output without advancing the buffer. If there has not been any
+    * update yet, `revise` works as `update`.
+    * Every value is written twice, at its slot and `mem_size` positions
+    * after it, so the last `mem_size` values are always available as a
+    * contiguous block in chronological order (see `history`).
     */
     template <typename T>
     class Indicator {
@@ -30,7 +130,7 @@ namespace indicators {
         * @param mem_size: size of the circular buffer
         */
         Indicator(int mem_size = 1)
-            : mem_data(mem_size), mem_pos(0), mem_size(mem_size) {}
+            : mem_data(2 * mem_size), mem_pos(0), mem_size(mem_size) {}
 
         /**
         * Destructor. No need to do anything.
@@ -51,8 +151,7 @@ namespace indicators {
             if (key > 0 || -key >= mem_size) {
                 throw std::out_of_range("Invalid index");
             }
-            int real_pos = (mem_pos + mem_size + key) % mem_size;
-            return mem_data[real_pos];
+            return mem_data[mem_pos + mem_size + key];
         }
 
         /**
@@ -64,6 +163,7 @@ namespace indicators {
         void push(T value) {
             mem_pos = (mem_pos + 1) % mem_size;
             mem_data[mem_pos] = value;
+            mem_data[mem_pos + mem_size] = value;
         }
 
         /**
@@ -76,22 +176,74 @@ namespace indicators {
         * @throws std::out_of_range if the index is out of range
         */
         T get(int key = 0) const { return (*this)[key]; }
+
+        /**
+        * Overwrite the most recent value in the circular buffer, without
+        * advancing it. Used to revise the output for the current bar.
+        * @param value: new most recent value
+        */
+        void replace(T value) {
+            mem_data[mem_pos] = value;
+            mem_data[mem_pos + mem_size] = value;
+        }
+
+        /**
+        * Get the values kept in memory, in chronological order.
+        * @return pointer to the oldest of `memory_size()` contiguous values.
+        *     The last one is the most recent value. The pointer is valid
+        *     until the next push.
+        */
+        const T *history() const { return mem_data.data() + mem_pos + 1; }
+
+        /**
+        * Number of values kept in memory
+        */
+        int memory_size() const { return mem_size; }
+
+        /**
+        * Clear the values in memory, keeping the buffer
+        */
+        void reset() {
+            std::fill(mem_data.begin(), mem_data.end(), T{});
+            mem_pos = 0;
+        }
+
+        void save(StateWriter &state) const {
+            state.write(mem_data);
+            state.write(mem_pos);
+            state.write(mem_size);
+        }
+
+        void load(StateReader &state) {
+            state.read(mem_data);
+            state.read(mem_pos);
+            state.read(mem_size);
+        }
     };
 
-    class MA : public Indicator<double> {
+    /**
+    * MA, EMA, RSI and ATR, along with their banks, are templates on the
+    * type of the values they store and return. The `double` versions keep
+    * the plain names, and the `float` ones have a 32 suffix (e.g. MA32),
+    * halving memory use and bandwidth where single precision is enough.
+    * The running sums of moving averages are always kept in double
+    * precision, so they do not drift.
+    */
+    template <typename T>
+    class BasicMA : public Indicator<T> {
     private:
     int period;
-    std::vector<double> prevs;
+    std::vector<T> prevs;
     int length;
     int pos;
     double accum;
 
     public:
-    MA(int period, int mem_size = 1)
-        : Indicator(mem_size), period(period), prevs(period, 0.0), length(0), pos(0),
+    BasicMA(int period, int mem_size = 1)
+        : Indicator<T>(mem_size), period(check_size(period)), prevs(period, 0.0), length(0), pos(0),
             accum(0.0) {}
 
-    double update(double value) {
+    T update(T value) {
         if (length < period) {
         length++;
         } else {
@@ -102,179 +254,2956 @@ namespace indicators {
         pos = (pos + 1) % period;
 
         if (length < period) {
-        push(std::nan(""));
+        this->push(std::nan(""));
+        } else {
+        this->push(accum / period);
+        }
+        return (*this)[0];
+    }
+
+    T revise(T value) {
+        if (length == 0) {
+        return update(value);
+        }
+        int last = (pos + period - 1) % period;
+        accum -= prevs[last];
+        prevs[last] = value;
+        accum += value;
+
+        if (length < period) {
+        this->replace(std::nan(""));
         } else {
-        push(accum / period);
+        this->replace(accum / period);
         }
         return (*this)[0];
     }
+
+    /**
+    * Clear the state and set a new period, reusing the memory of the window
+    * when it is large enough
+    * @throws std::invalid_argument if `period` is less than 1
+    */
+    void reconfigure(int period) {
+        check_size(period);
+        Indicator<T>::reset();
+        this->period = period;
+        prevs.assign(period, 0.0);
+        length = 0;
+        pos = 0;
+        accum = 0.0;
+    }
+
+    void reset() { reconfigure(period); }
+
+    void save(StateWriter &state) const {
+        Indicator<T>::save(state);
+        state.write(period);
+        state.write(prevs);
+        state.write(length);
+        state.write(pos);
+        state.write(accum);
+    }
+
+    void load(StateReader &state) {
+        Indicator<T>::load(state);
+        state.read(period);
+        state.read(prevs);
+        state.read(length);
+        state.read(pos);
+        state.read(accum);
+    }
     };
 
+    using MA = BasicMA<double>;
+    using MA32 = BasicMA<float>;
+
     /**
-    * MV - Moving Variance
+    * Compensated (Neumaier) summation.
+    * Keeps track of the low order bits lost when adding values of
+    * different magnitudes, so long running sums do not drift.
     */
-    class MV : public Indicator<double> {
+    class CompensatedSum {
+    private:
+        double sum;
+        double comp;
+    public:
+        CompensatedSum(double value = 0.0) : sum(value), comp(0.0) {}
+        void add(double value) {
+            double t = sum + value;
+            if (std::fabs(sum) >= std::fabs(value)) {
+                comp += (sum - t) + value;
+            } else {
+                comp += (value - t) + sum;
+            }
+            sum = t;
+        }
+        double value() const { return sum + comp; }
+
+        /**
+        * Difference with another sum, keeping the low order bits of both
+        */
+        double difference(const CompensatedSum &other) const {
+            return (sum - other.sum) + (comp - other.comp);
+        }
+
+        void reset() {
+            sum = 0.0;
+            comp = 0.0;
+        }
+
+        void save(StateWriter &state) const {
+            state.write(sum);
+            state.write(comp);
+        }
+
+        void load(StateReader &state) {
+            state.read(sum);
+            state.read(comp);
+        }
+    };
+
+    /**
+    * Moving averages of the same series for many periods
+    * The averages are computed from a single pass of compensated prefix
+    * sums, so the cost does not depend on the periods. Outputs are written
+    * row major, one row per value and one column per period, and are NaN
+    * until there are `period` values, like MA.
+    * @throws std::invalid_argument if a period is less than 1
+    */
+    inline void multi_ma(const double *values, int n, const std::vector<int> &periods,
+                         double *out) {
+        for (int period : periods) {
+            if (period < 1) {
+                throw std::invalid_argument("Periods must be positive");
+            }
+        }
+        std::vector<CompensatedSum> prefix(n + 1);
+        for (int i = 0; i < n; i++) {
+            prefix[i + 1] = prefix[i];
+            prefix[i + 1].add(values[i]);
+        }
+        size_t n_periods = periods.size();
+        for (int i = 0; i < n; i++) {
+            double *row = out + i * n_periods;
+            for (size_t k = 0; k < n_periods; k++) {
+                int period = periods[k];
+                row[k] = i + 1 < period
+                    ? std::nan("")
+                    : prefix[i + 1].difference(prefix[i + 1 - period]) / period;
+            }
+        }
+    }
+
+    /**
+    * RollingStats - Mean and variance over a sliding window
+    * This is a kernel, not an indicator. Every update costs O(1): while
+    * the window is filling up, values are added with Welford's algorithm;
+    * once it is full, the oldest value is replaced by the newest one with
+    * the sliding version of the same update. Mean and second moment are
+    * accumulated with compensated summation.
+    */
+    class RollingStats {
     private:
-        MA ma;
         std::vector<double> prevs;
         int period;
         int length;
         int pos;
+        CompensatedSum mean_;
+        CompensatedSum m2;
     public:
-        MV(int period, int mem_size = 1)
-            : Indicator(mem_size), ma(period), prevs(period, 0.0), period(period), length(0), pos(0) {}
-        double update(double value) {
+        /**
+        * @throws std::invalid_argument if `period` is less than 1
+        */
+        RollingStats(int period)
+            : prevs(check_size(period), 0.0), period(period), length(0), pos(0) {}
+
+        void add(double value) {
+            double prev_mean = mean_.value();
             if (length < period) {
                 length++;
+                double delta = value - prev_mean;
+                mean_.add(delta / length);
+                m2.add(delta * (value - mean_.value()));
+            } else {
+                double old = prevs[pos];
+                double delta = value - old;
+                mean_.add(delta / period);
+                m2.add(delta * (value - mean_.value() + old - prev_mean));
             }
             prevs[pos] = value;
             pos = (pos + 1) % period;
-            ma.update(value);
-            if (length < period) {
-                push(std::nan(""));
-            } else {
-                double accum = 0.0;
-                for (size_t i = 0; i < prevs.size(); i++) {
-                    double diff = prevs[i] - ma[0];
-                    accum += diff * diff;
-                }
-                push(accum / period);
+        }
+
+        /**
+        * Replace the most recently added value.
+        * If no value has been added yet, it works as `add`.
+        */
+        void replace_last(double value) {
+            if (length == 0) {
+                add(value);
+                return;
             }
-            return (*this)[0];
+            int last = (pos + period - 1) % period;
+            double old = prevs[last];
+            double delta = value - old;
+            double prev_mean = mean_.value();
+            mean_.add(delta / length);
+            m2.add(delta * (value - mean_.value() + old - prev_mean));
+            prevs[last] = value;
         }
-    };
 
-    class EMA : public Indicator<double> {
-    private:
-    int period;
-    double alpha;
-    double smooth_factor;
-    int length;
-    double prev;
+        /** True when the window is full */
+        bool ready() const { return length == period; }
 
-    public:
-    EMA(int period, double alpha = 2.0, int mem_size=1)
-        : Indicator(mem_size), period(period), alpha(alpha),
-            smooth_factor(alpha / (1.0 + period)), length(0), prev(0.0) {}
+        double mean() const { return mean_.value(); }
 
-    double update(double value) {
-        length++;
-        if (length < period) {
-        prev += value;
-        } else if (length == period) {
-        prev += value;
-        prev /= period;
-        } else {
-        prev = (value * smooth_factor) + prev * (1.0 - smooth_factor);
+        /** Population variance of the values in the window */
+        double variance() const {
+            double var = m2.value() / length;
+            return var > 0.0 ? var : 0.0;
         }
 
-        if (length < period) {
-        push(std::nan(""));
-        } else {
-        push(prev);
+        double stddev() const { return std::sqrt(variance()); }
+
+        /**
+        * Clear the state and set a new period, reusing the memory of the window
+        * when it is large enough
+        * @throws std::invalid_argument if `period` is less than 1
+        */
+        void reconfigure(int period) {
+            check_size(period);
+            prevs.assign(period, 0.0);
+            this->period = period;
+            length = 0;
+            pos = 0;
+            mean_.reset();
+            m2.reset();
+        }
+
+        void reset() { reconfigure(period); }
+
+        void save(StateWriter &state) const {
+            state.write(prevs);
+            state.write(period);
+            state.write(length);
+            state.write(pos);
+            mean_.save(state);
+            m2.save(state);
+        }
+
+        void load(StateReader &state) {
+            state.read(prevs);
+            state.read(period);
+            state.read(length);
+            state.read(pos);
+            mean_.load(state);
+            m2.load(state);
         }
-        return (*this)[0];
-    }
     };
 
-    class RSI : public Indicator<double> {
+    /**
+    * MV - Moving Variance
+    */
+    class MV : public Indicator<double> {
     private:
-        MA gains;
-        MA losses;
-
+        RollingStats stats;
     public:
-        RSI(int period = 14, int mem_size = 1)
-            : Indicator(mem_size), gains(period), losses(period){}
-        double update(double open_price, double close_price) {
-            double diff = close_price - open_price;
-            gains.update(diff >= 0.0 ? diff : 0.0);
-            losses.update(diff < 0 ? -diff : 0.0);
-            if (std::isnan(losses[0])) {
-                push(std::nan(""));
-            } else {
-                double rsi = 100.0 - 100.0 / (1.0 + gains[0] / losses[0]);
-                push(rsi);
-            }
+        MV(int period, int mem_size = 1)
+            : Indicator(mem_size), stats(period) {}
+        double update(double value) {
+            stats.add(value);
+            push(stats.ready() ? stats.variance() : std::nan(""));
+            return (*this)[0];
+        }
+        double revise(double value) {
+            stats.replace_last(value);
+            replace(stats.ready() ? stats.variance() : std::nan(""));
             return (*this)[0];
         }
-    };
 
+        void reset() {
+            Indicator::reset();
+            stats.reset();
+        }
 
-    inline double calculate_roi(double initial_value, double final_value) {
-    if (initial_value == 0 || std::isnan(initial_value)) {
-        return std::nan("");
-    }
-    return final_value / initial_value - 1.0;
-    }
+        void reconfigure(int period) {
+            check_size(period);
+            Indicator::reset();
+            stats.reconfigure(period);
+        }
 
-    class ROI : public Indicator<double> {
-    private:
-    double prev;
+        void save(StateWriter &state) const {
+            Indicator::save(state);
+            stats.save(state);
+        }
+
+        void load(StateReader &state) {
+            Indicator::load(state);
+            stats.load(state);
+        }
+    };
 
+    /**
+    * StdDev - Moving Standard Deviation
+    */
+    class StdDev : public Indicator<double> {
+    private:
+        RollingStats stats;
     public:
-    ROI(int mem_size = 1) : Indicator(mem_size), prev(std::nan("")) {}
+        StdDev(int period, int mem_size = 1)
+            : Indicator(mem_size), stats(period) {}
+        double update(double value) {
+            stats.add(value);
+            push(stats.ready() ? stats.stddev() : std::nan(""));
+            return (*this)[0];
+        }
+        double revise(double value) {
+            stats.replace_last(value);
+            replace(stats.ready() ? stats.stddev() : std::nan(""));
+            return (*this)[0];
+        }
 
-    double update(double value) {
-        double curr = calculate_roi(prev, value);
-        push(curr);
-        prev = value;
-        return (*this)[0];
-    }
-    };
+        void reset() {
+            Indicator::reset();
+            stats.reset();
+        }
 
-    struct MACDResult {
-    double macd;
-    double signal;
-    double hist;
+        void reconfigure(int period) {
+            check_size(period);
+            Indicator::reset();
+            stats.reconfigure(period);
+        }
+
+        void save(StateWriter &state) const {
+            Indicator::save(state);
+            stats.save(state);
+        }
+
+        void load(StateReader &state) {
+            Indicator::load(state);
+            stats.load(state);
+        }
     };
 
-    class MACD : public Indicator<MACDResult> {
+    /**
+    * ZScore - Distance of the current value to the moving average,
+    * measured in standard deviations. NaN when the window has no
+    * dispersion.
+    */
+    class ZScore : public Indicator<double> {
     private:
-    EMA short_ema;
-    EMA long_ema;
-    EMA diff_ema;
-    int start;
-    int counter;
-
+        RollingStats stats;
+        double compute(double value) const {
+            double std = stats.stddev();
+            if (!stats.ready() || std == 0.0) {
+                return std::nan("");
+            }
+            return (value - stats.mean()) / std;
+        }
     public:
-    MACD(int short_period, int long_period, int diff_period, int mem_size = 1)
-        : Indicator(mem_size), short_ema(short_period),
-            long_ema(long_period),
-            diff_ema(diff_period),
-            start(std::max(long_period, short_period)), counter(0) {}
+        ZScore(int period, int mem_size = 1)
+            : Indicator(mem_size), stats(period) {}
+        double update(double value) {
+            stats.add(value);
+            push(compute(value));
+            return (*this)[0];
+        }
+        double revise(double value) {
+            stats.replace_last(value);
+            replace(compute(value));
+            return (*this)[0];
+        }
 
-    MACDResult update(double value) {
-        counter++;
-        short_ema.update(value);
-        long_ema.update(value);
+        void reset() {
+            Indicator::reset();
+            stats.reset();
+        }
 
-        MACDResult result;
-        if (counter >= start) {
-        double diff = short_ema[0] - long_ema[0];
-        diff_ema.update(diff);
-        result = {diff, diff_ema[0], diff - diff_ema[0]};
-        } else {
-        result = {std::nan(""), std::nan(""), std::nan("")};
+        void reconfigure(int period) {
+            check_size(period);
+            Indicator::reset();
+            stats.reconfigure(period);
+        }
+
+        void save(StateWriter &state) const {
+            Indicator::save(state);
+            stats.save(state);
+        }
+
+        void load(StateReader &state) {
+            Indicator::load(state);
+            stats.load(state);
         }
-        push(result);
-        return (*this)[0];
-    }
     };
 
-    class ATR : public Indicator<double> {
-    private:
-    MA prevs;
+    struct BandsResult {
+        double upper;
+        double middle;
+        double lower;
+    };
 
+    /**
+    * BollingerBands - Moving average plus/minus `k` standard deviations
+    */
+    class BollingerBands : public Indicator<BandsResult> {
+    private:
+        RollingStats stats;
+        double k;
+        BandsResult compute() const {
+            if (!stats.ready()) {
+                return {std::nan(""), std::nan(""), std::nan("")};
+            }
+            double mean = stats.mean();
+            double width = k * stats.stddev();
+            return {mean + width, mean, mean - width};
+        }
     public:
-    ATR(int period, int mem_size = 1) : Indicator(mem_size), prevs(period) {}
+        BollingerBands(int period = 20, double k = 2.0, int mem_size = 1)
+            : Indicator(mem_size), stats(period), k(k) {}
+        BandsResult update(double value) {
+            stats.add(value);
+            push(compute());
+            return (*this)[0];
+        }
+        BandsResult revise(double value) {
+            stats.replace_last(value);
+            replace(compute());
+            return (*this)[0];
+        }
 
-    double update(double low_price, double high_price, double close_price) {
-        double tr = std::max(std::max(high_price - low_price, high_price - close_price),
-                        (low_price - close_price));
-        prevs.update(tr);
-        push(prevs[0]);
-        return (*this)[0];
+        void reset() {
+            Indicator::reset();
+            stats.reset();
+        }
+
+        /**
+        * Clear the state and set a new period, keeping `k`
+        * @throws std::invalid_argument if `period` is less than 1
+        */
+        void reconfigure(int period = 20) { reconfigure(period, k); }
+
+        /**
+        * @throws std::invalid_argument if `period` is less than 1
+        */
+        void reconfigure(int period, double k) {
+            check_size(period);
+            Indicator::reset();
+            stats.reconfigure(period);
+            this->k = k;
+        }
+
+        void save(StateWriter &state) const {
+            Indicator::save(state);
+            stats.save(state);
+            state.write(k);
+        }
+
+        void load(StateReader &state) {
+            Indicator::load(state);
+            stats.load(state);
+            state.read(k);
+        }
+    };
+
+    /**
+    * RollingExtremum - Maximum or minimum over a sliding window
+    * This is a kernel, not an indicator. It keeps a monotonic deque of
+    * (position, value) pairs, stored in a ring of `period` slots, with
+    * the values that can still become the extremum. The most recent value
+    * is kept apart, with the number of deque entries it does not replace,
+    * found by a galloping search from the back. Entries it replaces are
+    * only dropped when the next value arrives, so `replace_last` does not
+    * have to restore them, and both `add` and `replace_last` cost O(1)
+    * when few entries are replaced, and O(log period) at most.
+    * @param Compare: `std::greater<double>` for maximum,
+    *     `std::less<double>` for minimum.
+    */
+    template <typename Compare>
+    class RollingExtremum {
+    private:
+        std::vector<long> positions;
+        std::vector<double> values;
+        int period;
+        int head;
+        int size;
+        int keep;  // Entries of the deque kept with the most recent value
+        long count;
+        double last;  // Most recent value, at position count - 1
+        Compare compare;
+
+        int slot(int i) const { return (head + i) % period; }
+
+        /** Number of entries at the front of the deque kept with a value */
+        int search(double value) const {
+            int low = 0;
+            int high = size;
+            for (int step = 1; ; step *= 2) {
+                int i = size - step;
+                if (i <= 0) {
+                    break;
+                }
+                if (compare(values[slot(i)], value)) {
+                    low = i + 1;
+                    break;
+                }
+                high = i;
+            }
+            while (low < high) {
+                int middle = low + (high - low) / 2;
+                if (compare(values[slot(middle)], value)) {
+                    low = middle + 1;
+                } else {
+                    high = middle;
+                }
+            }
+            return low;
+        }
+
+    public:
+        RollingExtremum(int period)
+            : positions(), values(), period(period), head(0), size(0), keep(0),
+              count(0), last(0.0) {
+            reconfigure(period);
+        }
+
+        void add(double value) {
+            if (count > 0) {
+                size = keep;
+                positions[slot(size)] = count - 1;
+                values[slot(size)] = last;
+                size++;
+            }
+            while (size > 0 && positions[head] <= count - period) {
+                head = (head + 1) % period;
+                size--;
+            }
+            last = value;
+            keep = search(value);
+            count++;
+        }
+
+        /**
+        * Replace the most recently added value. If no value has been added
+        * yet, it works as `add`.
+        */
+        void replace_last(double value) {
+            if (count == 0) {
+                add(value);
+                return;
+            }
+            last = value;
+            keep = search(value);
+        }
+
+        /** True when the window is full */
+        bool ready() const { return count >= period; }
+
+        double value() const { return keep > 0 ? values[head] : last; }
+
+        /**
+        * Clear the state and set a new period, reusing the memory of the ring
+        * when it is large enough
+        * @throws std::invalid_argument if the period is less than 1
+        */
+        void reconfigure(int period) {
+            if (period < 1) {
+                throw std::invalid_argument("The period must be positive");
+            }
+            positions.assign(period, 0);
+            values.assign(period, 0.0);
+            this->period = period;
+            head = 0;
+            size = 0;
+            keep = 0;
+            count = 0;
+            last = 0.0;
+        }
+
+        void reset() { reconfigure(period); }
+
+        void save(StateWriter &state) const {
+            state.write(positions);
+            state.write(values);
+            state.write(period);
+            state.write(head);
+            state.write(size);
+            state.write(keep);
+            state.write(count);
+            state.write(last);
+        }
+
+        void load(StateReader &state) {
+            state.read(positions);
+            state.read(values);
+            state.read(period);
+            state.read(head);
+            state.read(size);
+            state.read(keep);
+            state.read(count);
+            state.read(last);
+        }
+    };
+
+    using RollingMax = RollingExtremum<std::greater<double>>;
+    using RollingMin = RollingExtremum<std::less<double>>;
+
+    /**
+    * MovingMax - Highest value in the last `period` updates
+    */
+    class MovingMax : public Indicator<double> {
+    private:
+        RollingMax extremum;
+    public:
+        MovingMax(int period, int mem_size = 1)
+            : Indicator(mem_size), extremum(period) {}
+        double update(double value) {
+            extremum.add(value);
+            push(extremum.ready() ? extremum.value() : std::nan(""));
+            return (*this)[0];
+        }
+        double revise(double value) {
+            extremum.replace_last(value);
+            replace(extremum.ready() ? extremum.value() : std::nan(""));
+            return (*this)[0];
+        }
+
+        void reset() {
+            Indicator::reset();
+            extremum.reset();
+        }
+
+        void reconfigure(int period) {
+            check_size(period);
+            Indicator::reset();
+            extremum.reconfigure(period);
+        }
+
+        void save(StateWriter &state) const {
+            Indicator::save(state);
+            extremum.save(state);
+        }
+
+        void load(StateReader &state) {
+            Indicator::load(state);
+            extremum.load(state);
+        }
+    };
+
+    /**
+    * MovingMin - Lowest value in the last `period` updates
+    */
+    class MovingMin : public Indicator<double> {
+    private:
+        RollingMin extremum;
+    public:
+        MovingMin(int period, int mem_size = 1)
+            : Indicator(mem_size), extremum(period) {}
+        double update(double value) {
+            extremum.add(value);
+            push(extremum.ready() ? extremum.value() : std::nan(""));
+            return (*this)[0];
+        }
+        double revise(double value) {
+            extremum.replace_last(value);
+            replace(extremum.ready() ? extremum.value() : std::nan(""));
+            return (*this)[0];
+        }
+
+        void reset() {
+            Indicator::reset();
+            extremum.reset();
+        }
+
+        void reconfigure(int period) {
+            check_size(period);
+            Indicator::reset();
+            extremum.reconfigure(period);
+        }
+
+        void save(StateWriter &state) const {
+            Indicator::save(state);
+            extremum.save(state);
+        }
+
+        void load(StateReader &state) {
+            Indicator::load(state);
+            extremum.load(state);
+        }
+    };
+
+    /**
+    * RollingQuantile - Quantile of the values in a sliding window
+    * This is a kernel, not an indicator. The window is split in two heaps:
+    * a max-heap with the lowest values and a min-heap with the rest, sized
+    * so that the tops are the order statistics around the quantile. Values
+    * leaving the window are deleted lazily: they are marked as stale and
+    * discarded when they reach the top of their heap, and the heaps are
+    * rebuilt when stale entries take more than half of them. Every update
+    * costs O(log n). Quantiles are interpolated linearly between order
+    * statistics, like NumPy's default method.
+    */
+    class RollingQuantile {
+    private:
+        /**
+        * Entries are ordered by value and then by id, so they are all
+        * distinct and every one belongs to a single heap.
+        */
+        struct Entry {
+            double value;
+            long id;
+            int slot;
+            bool operator<(const Entry &other) const {
+                return value < other.value || (value == other.value && id < other.id);
+            }
+            bool operator>(const Entry &other) const { return other < *this; }
+        };
+
+        std::vector<double> prevs;
+        std::vector<long> ids;
+        std::vector<Entry> lower;
+        std::vector<Entry> upper;
+        double quantile;
+        int period;
+        int length;
+        int pos;
+        int lower_size;
+        int upper_size;
+        long next_id;
+
+        bool stale(const Entry &entry) const { return ids[entry.slot] != entry.id; }
+
+        void prune() {
+            while (!lower.empty() && stale(lower.front())) {
+                std::pop_heap(lower.begin(), lower.end());
+                lower.pop_back();
+            }
+            while (!upper.empty() && stale(upper.front())) {
+                std::pop_heap(upper.begin(), upper.end(), std::greater<Entry>());
+                upper.pop_back();
+            }
+        }
+
+        void compact() {
+            auto is_stale = [this](const Entry &entry) { return stale(entry); };
+            lower.erase(std::remove_if(lower.begin(), lower.end(), is_stale), lower.end());
+            upper.erase(std::remove_if(upper.begin(), upper.end(), is_stale), upper.end());
+            std::make_heap(lower.begin(), lower.end());
+            std::make_heap(upper.begin(), upper.end(), std::greater<Entry>());
+        }
+
+        void insert(int slot, double value) {
+            Entry entry{value, next_id++, slot};
+            prevs[slot] = value;
+            ids[slot] = entry.id;
+            if (lower_size > 0 && entry < lower.front()) {
+                lower.push_back(entry);
+                std::push_heap(lower.begin(), lower.end());
+                lower_size++;
+            } else {
+                upper.push_back(entry);
+                std::push_heap(upper.begin(), upper.end(), std::greater<Entry>());
+                upper_size++;
+            }
+        }
+
+        void remove(int slot) {
+            Entry entry{prevs[slot], ids[slot], slot};
+            if (lower_size > 0 && !(lower.front() < entry)) {
+                lower_size--;
+            } else {
+                upper_size--;
+            }
+            ids[slot] = -1;
+            prune();
+        }
+
+        /** Move entries between the heaps to keep the order statistics at their tops */
+        void rebalance() {
+            int target = static_cast<int>(std::floor(quantile * (length - 1))) + 1;
+            while (lower_size > target) {
+                Entry entry = lower.front();
+                std::pop_heap(lower.begin(), lower.end());
+                lower.pop_back();
+                upper.push_back(entry);
+                std::push_heap(upper.begin(), upper.end(), std::greater<Entry>());
+                lower_size--;
+                upper_size++;
+                prune();
+            }
+            while (lower_size < target) {
+                Entry entry = upper.front();
+                std::pop_heap(upper.begin(), upper.end(), std::greater<Entry>());
+                upper.pop_back();
+                lower.push_back(entry);
+                std::push_heap(lower.begin(), lower.end());
+                upper_size--;
+                lower_size++;
+                prune();
+            }
+            if (lower.size() + upper.size() > 2 * static_cast<size_t>(period)) {
+                compact();
+            }
+        }
+
+    public:
+        /**
+        * @throws std::invalid_argument if `period` is less than 1 or
+        *     `quantile` is not in [0, 1]
+        */
+        RollingQuantile(int period, double quantile = 0.5)
+            : prevs(check_size(period), 0.0), ids(period, -1), quantile(quantile),
+              period(period),
+              length(0), pos(0), lower_size(0), upper_size(0), next_id(0) {
+            if (!(quantile >= 0.0 && quantile <= 1.0)) {
+                throw std::invalid_argument("Quantile must be between 0 and 1");
+            }
+            lower.reserve(2 * period);
+            upper.reserve(2 * period);
+        }
+
+        void add(double value) {
+            if (length < period) {
+                length++;
+            } else {
+                remove(pos);
+            }
+            insert(pos, value);
+            pos = (pos + 1) % period;
+            rebalance();
+        }
+
+        /**
+        * Replace the most recently added value.
+        * If no value has been added yet, it works as `add`.
+        */
+        void replace_last(double value) {
+            if (length == 0) {
+                add(value);
+                return;
+            }
+            int last = (pos + period - 1) % period;
+            remove(last);
+            insert(last, value);
+            rebalance();
+        }
+
+        /** True when the window is full */
+        bool ready() const { return length == period; }
+
+        double value() const {
+            double h = quantile * (length - 1);
+            double frac = h - std::floor(h);
+            double low = lower.front().value;
+            if (frac == 0.0) {
+                return low;
+            }
+            return low + frac * (upper.front().value - low);
+        }
+
+        /**
+        * Clear the state and set new parameters, reusing the memory of the
+        * window and the heaps when it is large enough
+        * @throws std::invalid_argument if `period` is less than 1 or
+        *     `quantile` is not in [0, 1]
+        */
+        void reconfigure(int period, double quantile) {
+            check_size(period);
+            if (!(quantile >= 0.0 && quantile <= 1.0)) {
+                throw std::invalid_argument("Quantile must be between 0 and 1");
+            }
+            prevs.assign(period, 0.0);
+            ids.assign(period, -1);
+            lower.clear();
+            upper.clear();
+            this->quantile = quantile;
+            this->period = period;
+            length = 0;
+            pos = 0;
+            lower_size = 0;
+            upper_size = 0;
+            next_id = 0;
+        }
+
+        void reset() { reconfigure(period, quantile); }
+
+        void save(StateWriter &state) const {
+            state.write(prevs);
+            state.write(ids);
+            state.write(lower);
+            state.write(upper);
+            state.write(quantile);
+            state.write(period);
+            state.write(length);
+            state.write(pos);
+            state.write(lower_size);
+            state.write(upper_size);
+            state.write(next_id);
+        }
+
+        void load(StateReader &state) {
+            state.read(prevs);
+            state.read(ids);
+            state.read(lower);
+            state.read(upper);
+            state.read(quantile);
+            state.read(period);
+            state.read(length);
+            state.read(pos);
+            state.read(lower_size);
+            state.read(upper_size);
+            state.read(next_id);
+        }
+    };
+
+    /**
+    * MovingQuantile - Quantile of the last `period` updates
+    * @param quantile: between 0 and 1, e.g. 0.5 for the median
+    */
+    class MovingQuantile : public Indicator<double> {
+    private:
+        RollingQuantile window;
+    public:
+        MovingQuantile(int period, double quantile, int mem_size = 1)
+            : Indicator(mem_size), window(period, quantile) {}
+        double update(double value) {
+            window.add(value);
+            push(window.ready() ? window.value() : std::nan(""));
+            return (*this)[0];
+        }
+        double revise(double value) {
+            window.replace_last(value);
+            replace(window.ready() ? window.value() : std::nan(""));
+            return (*this)[0];
+        }
+
+        void reset() {
+            Indicator::reset();
+            window.reset();
+        }
+
+        void reconfigure(int period, double quantile) {
+            window.reconfigure(period, quantile);
+            Indicator::reset();
+        }
+
+        void save(StateWriter &state) const {
+            Indicator::save(state);
+            window.save(state);
+        }
+
+        void load(StateReader &state) {
+            Indicator::load(state);
+            window.load(state);
+        }
+    };
+
+    /**
+    * MovingMedian - Median of the last `period` updates
+    */
+    class MovingMedian : public MovingQuantile {
+    public:
+        MovingMedian(int period, int mem_size = 1)
+            : MovingQuantile(period, 0.5, mem_size) {}
+
+        void reconfigure(int period) { MovingQuantile::reconfigure(period, 0.5); }
+    };
+
+    /**
+    * Donchian - Donchian Channels
+    * Upper band is the highest high and lower band the lowest low
+    * of the last `period` bars. Middle is the average of both.
+    */
+    class Donchian : public Indicator<BandsResult> {
+    private:
+        RollingMax highs;
+        RollingMin lows;
+        BandsResult compute() const {
+            if (!highs.ready()) {
+                return {std::nan(""), std::nan(""), std::nan("")};
+            }
+            double upper = highs.value();
+            double lower = lows.value();
+            return {upper, (upper + lower) / 2.0, lower};
+        }
+    public:
+        Donchian(int period = 20, int mem_size = 1)
+            : Indicator(mem_size), highs(period), lows(period) {}
+        BandsResult update(double low_price, double high_price) {
+            highs.add(high_price);
+            lows.add(low_price);
+            push(compute());
+            return (*this)[0];
+        }
+        BandsResult revise(double low_price, double high_price) {
+            highs.replace_last(high_price);
+            lows.replace_last(low_price);
+            replace(compute());
+            return (*this)[0];
+        }
+
+        void reset() {
+            Indicator::reset();
+            highs.reset();
+            lows.reset();
+        }
+
+        void reconfigure(int period) {
+            check_size(period);
+            Indicator::reset();
+            highs.reconfigure(period);
+            lows.reconfigure(period);
+        }
+
+        void save(StateWriter &state) const {
+            Indicator::save(state);
+            highs.save(state);
+            lows.save(state);
+        }
+
+        void load(StateReader &state) {
+            Indicator::load(state);
+            highs.load(state);
+            lows.load(state);
+        }
+    };
+
+    /**
+    * Position of `value` in the range [lower, upper], as a proportion.
+    * A range with no width is reported as 0.
+    */
+    inline double range_position(double value, double lower, double upper) {
+        double width = upper - lower;
+        return width == 0.0 ? 0.0 : (value - lower) / width;
     }
+
+    struct StochResult {
+        double k;
+        double d;
+    };
+
+    /**
+    * Stochastic - Stochastic Oscillator
+    * %K is the position of the close price in the range of the last
+    * `k_period` bars, scaled to [0, 100]. %D is the moving average of
+    * %K over `d_period` bars.
+    */
+    class Stochastic : public Indicator<StochResult> {
+    private:
+        RollingMax highs;
+        RollingMin lows;
+        MA d_ma;
+    public:
+        Stochastic(int k_period = 14, int d_period = 3, int mem_size = 1)
+            : Indicator(mem_size), highs(k_period), lows(k_period), d_ma(d_period) {}
+        StochResult update(double low_price, double high_price, double close_price) {
+            highs.add(high_price);
+            lows.add(low_price);
+            if (highs.ready()) {
+                double k = 100.0 * range_position(close_price, lows.value(), highs.value());
+                push({k, d_ma.update(k)});
+            } else {
+                push({std::nan(""), std::nan("")});
+            }
+            return (*this)[0];
+        }
+        StochResult revise(double low_price, double high_price, double close_price) {
+            highs.replace_last(high_price);
+            lows.replace_last(low_price);
+            if (highs.ready()) {
+                double k = 100.0 * range_position(close_price, lows.value(), highs.value());
+                replace({k, d_ma.revise(k)});
+            } else {
+                replace({std::nan(""), std::nan("")});
+            }
+            return (*this)[0];
+        }
+
+        void reset() {
+            Indicator::reset();
+            highs.reset();
+            lows.reset();
+            d_ma.reset();
+        }
+
+        void reconfigure(int k_period = 14, int d_period = 3) {
+            check_size(k_period);
+            check_size(d_period);
+            Indicator::reset();
+            highs.reconfigure(k_period);
+            lows.reconfigure(k_period);
+            d_ma.reconfigure(d_period);
+        }
+
+        void save(StateWriter &state) const {
+            Indicator::save(state);
+            highs.save(state);
+            lows.save(state);
+            d_ma.save(state);
+        }
+
+        void load(StateReader &state) {
+            Indicator::load(state);
+            highs.load(state);
+            lows.load(state);
+            d_ma.load(state);
+        }
+    };
+
+    /**
+    * WilliamsR - Williams %R
+    * Distance of the close price to the highest high of the last `period`
+    * bars, relative to the range, scaled to [-100, 0]. A range with no
+    * width is reported as 0.
+    */
+    class WilliamsR : public Indicator<double> {
+    private:
+        RollingMax highs;
+        RollingMin lows;
+        double compute(double close_price) const {
+            if (!highs.ready()) {
+                return std::nan("");
+            }
+            double upper = highs.value();
+            double width = upper - lows.value();
+            return width == 0.0 ? 0.0 : -100.0 * (upper - close_price) / width;
+        }
+    public:
+        WilliamsR(int period = 14, int mem_size = 1)
+            : Indicator(mem_size), highs(period), lows(period) {}
+        double update(double low_price, double high_price, double close_price) {
+            highs.add(high_price);
+            lows.add(low_price);
+            push(compute(close_price));
+            return (*this)[0];
+        }
+        double revise(double low_price, double high_price, double close_price) {
+            highs.replace_last(high_price);
+            lows.replace_last(low_price);
+            replace(compute(close_price));
+            return (*this)[0];
+        }
+
+        void reset() {
+            Indicator::reset();
+            highs.reset();
+            lows.reset();
+        }
+
+        void reconfigure(int period) {
+            check_size(period);
+            Indicator::reset();
+            highs.reconfigure(period);
+            lows.reconfigure(period);
+        }
+
+        void save(StateWriter &state) const {
+            Indicator::save(state);
+            highs.save(state);
+            lows.save(state);
+        }
+
+        void load(StateReader &state) {
+            Indicator::load(state);
+            highs.load(state);
+            lows.load(state);
+        }
+    };
+
+    template <typename T>
+    class BasicEMA : public Indicator<T> {
+    private:
+    int period;
+    double alpha;
+    double smooth_factor;
+    int length;
+    T prev;
+    T last_prev;
+
+    void step(T value) {
+        if (length < period) {
+        prev += value;
+        } else if (length == period) {
+        prev += value;
+        prev /= period;
+        } else {
+        prev = (value * smooth_factor) + prev * (1.0 - smooth_factor);
+        }
+    }
+
+    public:
+    BasicEMA(int period, double alpha = 2.0, int mem_size=1)
+        : Indicator<T>(mem_size), period(check_size(period)), alpha(alpha),
+            smooth_factor(alpha / (1.0 + period)), length(0), prev(0.0),
+            last_prev(0.0) {}
+
+    T update(T value) {
+        length++;
+        last_prev = prev;
+        step(value);
+
+        if (length < period) {
+        this->push(std::nan(""));
+        } else {
+        this->push(prev);
+        }
+        return (*this)[0];
+    }
+
+    T revise(T value) {
+        if (length == 0) {
+        return update(value);
+        }
+        prev = last_prev;
+        step(value);
+
+        if (length < period) {
+        this->replace(std::nan(""));
+        } else {
+        this->replace(prev);
+        }
+        return (*this)[0];
+    }
+
+    /**
+    * Clear the state and set a new period, keeping `alpha`
+    * @throws std::invalid_argument if `period` is less than 1
+    */
+    void reconfigure(int period) { reconfigure(period, alpha); }
+
+    /**
+    * @throws std::invalid_argument if `period` is less than 1
+    */
+    void reconfigure(int period, double alpha) {
+        check_size(period);
+        Indicator<T>::reset();
+        this->period = period;
+        this->alpha = alpha;
+        smooth_factor = alpha / (1.0 + period);
+        length = 0;
+        prev = 0.0;
+        last_prev = 0.0;
+    }
+
+    void reset() { reconfigure(period, alpha); }
+
+    void save(StateWriter &state) const {
+        Indicator<T>::save(state);
+        state.write(period);
+        state.write(alpha);
+        state.write(smooth_factor);
+        state.write(length);
+        state.write(prev);
+        state.write(last_prev);
+    }
+
+    void load(StateReader &state) {
+        Indicator<T>::load(state);
+        state.read(period);
+        state.read(alpha);
+        state.read(smooth_factor);
+        state.read(length);
+        state.read(prev);
+        state.read(last_prev);
+    }
+    };
+
+    using EMA = BasicEMA<double>;
+    using EMA32 = BasicEMA<float>;
+
+    template <typename T>
+    class BasicRSI : public Indicator<T> {
+    private:
+        BasicMA<T> gains;
+        BasicMA<T> losses;
+        T compute() const {
+            if (std::isnan(losses[0])) {
+                return std::nan("");
+            }
+            return 100.0 - 100.0 / (1.0 + gains[0] / losses[0]);
+        }
+
+    public:
+        BasicRSI(int period = 14, int mem_size = 1)
+            : Indicator<T>(mem_size), gains(period), losses(period){}
+        T update(T open_price, T close_price) {
+            double diff = close_price - open_price;
+            gains.update(diff >= 0.0 ? diff : 0.0);
+            losses.update(diff < 0 ? -diff : 0.0);
+            this->push(compute());
+            return (*this)[0];
+        }
+        T revise(T open_price, T close_price) {
+            double diff = close_price - open_price;
+            gains.revise(diff >= 0.0 ? diff : 0.0);
+            losses.revise(diff < 0 ? -diff : 0.0);
+            this->replace(compute());
+            return (*this)[0];
+        }
+
+        void reset() {
+            Indicator<T>::reset();
+            gains.reset();
+            losses.reset();
+        }
+
+        void reconfigure(int period = 14) {
+            check_size(period);
+            Indicator<T>::reset();
+            gains.reconfigure(period);
+            losses.reconfigure(period);
+        }
+
+        void save(StateWriter &state) const {
+            Indicator<T>::save(state);
+            gains.save(state);
+            losses.save(state);
+        }
+
+        void load(StateReader &state) {
+            Indicator<T>::load(state);
+            gains.load(state);
+            losses.load(state);
+        }
+    };
+
+    using RSI = BasicRSI<double>;
+    using RSI32 = BasicRSI<float>;
+
+
+    inline double calculate_roi(double initial_value, double final_value) {
+    if (initial_value == 0 || std::isnan(initial_value)) {
+        return std::nan("");
+    }
+    return final_value / initial_value - 1.0;
+    }
+
+    /**
+    * Return series
+    * Array versions of `calculate_roi`. Each one writes `n` outputs, which
+    * are NaN where there is no previous value, or where the initial value
+    * is zero or NaN.
+    */
+
+    /** Element-wise return from `initial_values` to `final_values` */
+    inline void roi_array(const double *initial_values, const double *final_values, int n,
+                          double *out) {
+        for (int i = 0; i < n; i++) {
+            out[i] = calculate_roi(initial_values[i], final_values[i]);
+        }
+    }
+
+    /** Logarithm of the ratio of every value to the previous one */
+    inline void log_returns(const double *values, int n, double *out) {
+        if (n > 0) {
+            out[0] = std::nan("");
+        }
+        for (int i = 1; i < n; i++) {
+            out[i] = std::log1p(calculate_roi(values[i - 1], values[i]));
+        }
+    }
+
+    /** Return of every value from the first one */
+    inline void cumulative_returns(const double *values, int n, double *out) {
+        for (int i = 0; i < n; i++) {
+            out[i] = calculate_roi(values[0], values[i]);
+        }
+    }
+
+    /**
+    * Return of every value from the one `window` positions before it
+    * @throws std::invalid_argument if `window` is less than 1
+    */
+    inline void rolling_returns(const double *values, int n, int window, double *out) {
+        if (window < 1) {
+            throw std::invalid_argument("Window must be positive");
+        }
+        for (int i = 0; i < n && i < window; i++) {
+            out[i] = std::nan("");
+        }
+        for (int i = window; i < n; i++) {
+            out[i] = calculate_roi(values[i - window], values[i]);
+        }
+    }
+
+    class ROI : public Indicator<double> {
+    private:
+    double prev;
+    double last_prev;
+    bool started;
+
+    public:
+    ROI(int mem_size = 1)
+        : Indicator(mem_size), prev(std::nan("")), last_prev(std::nan("")), started(false) {}
+
+    double update(double value) {
+        double curr = calculate_roi(prev, value);
+        push(curr);
+        last_prev = prev;
+        prev = value;
+        started = true;
+        return (*this)[0];
+    }
+
+    double revise(double value) {
+        if (!started) {
+        return update(value);
+        }
+        replace(calculate_roi(last_prev, value));
+        prev = value;
+        return (*this)[0];
+    }
+
+    void reset() {
+        Indicator::reset();
+        prev = std::nan("");
+        last_prev = std::nan("");
+        started = false;
+    }
+
+    void save(StateWriter &state) const {
+        Indicator::save(state);
+        state.write(prev);
+        state.write(last_prev);
+        state.write(started);
+    }
+
+    void load(StateReader &state) {
+        Indicator::load(state);
+        state.read(prev);
+        state.read(last_prev);
+        state.read(started);
+    }
+    };
+
+    struct MACDResult {
+    double macd;
+    double signal;
+    double hist;
+    };
+
+    class MACD : public Indicator<MACDResult> {
+    private:
+    EMA short_ema;
+    EMA long_ema;
+    EMA diff_ema;
+    int start;
+    int counter;
+
+    public:
+    MACD(int short_period, int long_period, int diff_period, int mem_size = 1)
+        : Indicator(mem_size), short_ema(short_period),
+            long_ema(long_period),
+            diff_ema(diff_period),
+            start(std::max(long_period, short_period)), counter(0) {}
+
+    MACDResult update(double value) {
+        counter++;
+        short_ema.update(value);
+        long_ema.update(value);
+
+        MACDResult result;
+        if (counter >= start) {
+        double diff = short_ema[0] - long_ema[0];
+        diff_ema.update(diff);
+        result = {diff, diff_ema[0], diff - diff_ema[0]};
+        } else {
+        result = {std::nan(""), std::nan(""), std::nan("")};
+        }
+        push(result);
+        return (*this)[0];
+    }
+
+    MACDResult revise(double value) {
+        if (counter == 0) {
+        return update(value);
+        }
+        short_ema.revise(value);
+        long_ema.revise(value);
+
+        MACDResult result;
+        if (counter >= start) {
+        double diff = short_ema[0] - long_ema[0];
+        diff_ema.revise(diff);
+        result = {diff, diff_ema[0], diff - diff_ema[0]};
+        } else {
+        result = {std::nan(""), std::nan(""), std::nan("")};
+        }
+        replace(result);
+        return (*this)[0];
+    }
+
+    void reset() {
+        Indicator::reset();
+        short_ema.reset();
+        long_ema.reset();
+        diff_ema.reset();
+        counter = 0;
+    }
+
+    void reconfigure(int short_period, int long_period, int diff_period) {
+        check_size(short_period);
+        check_size(long_period);
+        check_size(diff_period);
+        Indicator::reset();
+        short_ema.reconfigure(short_period);
+        long_ema.reconfigure(long_period);
+        diff_ema.reconfigure(diff_period);
+        start = std::max(long_period, short_period);
+        counter = 0;
+    }
+
+    void save(StateWriter &state) const {
+        Indicator::save(state);
+        short_ema.save(state);
+        long_ema.save(state);
+        diff_ema.save(state);
+        state.write(start);
+        state.write(counter);
+    }
+
+    void load(StateReader &state) {
+        Indicator::load(state);
+        short_ema.load(state);
+        long_ema.load(state);
+        diff_ema.load(state);
+        state.read(start);
+        state.read(counter);
+    }
+    };
+
+    inline double true_range(double low_price, double high_price, double close_price) {
+        return std::max(std::max(high_price - low_price, high_price - close_price),
+                        (low_price - close_price));
+    }
+
+    template <typename T>
+    class BasicATR : public Indicator<T> {
+    private:
+    BasicMA<T> prevs;
+
+    public:
+    BasicATR(int period, int mem_size = 1) : Indicator<T>(mem_size), prevs(period) {}
+
+    T update(T low_price, T high_price, T close_price) {
+        prevs.update(true_range(low_price, high_price, close_price));
+        this->push(prevs[0]);
+        return (*this)[0];
+    }
+
+    T revise(T low_price, T high_price, T close_price) {
+        prevs.revise(true_range(low_price, high_price, close_price));
+        this->replace(prevs[0]);
+        return (*this)[0];
+    }
+
+    void reset() {
+        Indicator<T>::reset();
+        prevs.reset();
+    }
+
+    void reconfigure(int period) {
+        check_size(period);
+        Indicator<T>::reset();
+        prevs.reconfigure(period);
+    }
+
+    void save(StateWriter &state) const {
+        Indicator<T>::save(state);
+        prevs.save(state);
+    }
+
+    void load(StateReader &state) {
+        Indicator<T>::load(state);
+        prevs.load(state);
+    }
+    };
+
+    using ATR = BasicATR<double>;
+    using ATR32 = BasicATR<float>;
+
+    /**
+    * TimeWindow - Values in a sliding time window
+    * This is a kernel, not an indicator. It keeps (timestamp, value, weight)
+    * entries in a ring buffer, which grows when it is full, along with the
+    * sums of values, weights and weighted values. When an entry is added,
+    * the entries with a timestamp at or before `timestamp - duration` leave
+    * the window, so every update costs amortized O(1). Timestamps can be in
+    * any unit, as long as `duration` is in the same one, and must not
+    * decrease. The entries evicted by the last `add` stay in the buffer
+    * until the next one, so it can be undone to replace the most recent
+    * entry.
+    */
+    class TimeWindow {
+    private:
+        std::vector<double> times;
+        std::vector<double> values;
+        std::vector<double> weights;
+        double duration;
+        int head;
+        int size;
+        int prev_head;
+        long count;
+        double first_time;
+        double last_time;
+        double prev_time;
+        CompensatedSum values_sum;
+        CompensatedSum weights_sum;
+        CompensatedSum weighted_sum_;
+
+        int capacity() const { return static_cast<int>(times.size()); }
+        int slot(int i) const { return (head + i) % capacity(); }
+
+        void grow() {
+            int new_capacity = 2 * capacity();
+            std::vector<double> new_times(new_capacity);
+            std::vector<double> new_values(new_capacity);
+            std::vector<double> new_weights(new_capacity);
+            for (int i = 0; i < size; i++) {
+                new_times[i] = times[slot(i)];
+                new_values[i] = values[slot(i)];
+                new_weights[i] = weights[slot(i)];
+            }
+            times.swap(new_times);
+            values.swap(new_values);
+            weights.swap(new_weights);
+            head = 0;
+        }
+
+        void accumulate(int s, double sign) {
+            values_sum.add(sign * values[s]);
+            weights_sum.add(sign * weights[s]);
+            weighted_sum_.add(sign * values[s] * weights[s]);
+        }
+
+    public:
+        /**
+        * @throws std::invalid_argument if `duration` is not positive
+        */
+        TimeWindow(double duration, int capacity = 16)
+            : times(capacity), values(capacity), weights(capacity),
+              duration(duration), head(0), size(0), prev_head(0), count(0),
+              first_time(0.0), last_time(-HUGE_VAL), prev_time(-HUGE_VAL) {
+            if (!(duration > 0.0)) {
+                throw std::invalid_argument("Duration must be positive");
+            }
+        }
+
+        /**
+        * @throws std::invalid_argument if `timestamp` is before the one
+        *     of the most recent entry
+        */
+        void add(double timestamp, double value, double weight = 1.0) {
+            if (timestamp < last_time) {
+                throw std::invalid_argument("Timestamps must be non-decreasing");
+            }
+            if (size == capacity()) {
+                grow();
+            }
+            prev_head = head;
+            prev_time = last_time;
+            if (count == 0) {
+                first_time = timestamp;
+            }
+            int s = slot(size);
+            times[s] = timestamp;
+            values[s] = value;
+            weights[s] = weight;
+            accumulate(s, 1.0);
+            size++;
+            count++;
+            last_time = timestamp;
+            while (times[head] <= timestamp - duration) {
+                accumulate(head, -1.0);
+                head = (head + 1) % capacity();
+                size--;
+            }
+        }
+
+        /**
+        * Replace the most recently added entry. With the same timestamp,
+        * the entry is replaced in place, in O(1). Otherwise, it undoes the
+        * last `add`, restoring the entries it evicted, and adds the new
+        * entry, so it costs O(entries evicted by the last `add`), which can
+        * be the whole window after a gap in the timestamps.
+        * If no entry has been added yet, it works as `add`.
+        * @throws std::invalid_argument if `timestamp` is before the one
+        *     of the entry previous to the most recent one
+        */
+        void replace_last(double timestamp, double value, double weight = 1.0) {
+            if (count == 0) {
+                add(timestamp, value, weight);
+                return;
+            }
+            if (timestamp == last_time) {
+                int s = slot(size - 1);
+                accumulate(s, -1.0);
+                values[s] = value;
+                weights[s] = weight;
+                accumulate(s, 1.0);
+                return;
+            }
+            if (timestamp < prev_time) {
+                throw std::invalid_argument("Timestamps must be non-decreasing");
+            }
+            size--;
+            accumulate(slot(size), -1.0);
+            while (head != prev_head) {
+                head = (head + capacity() - 1) % capacity();
+                size++;
+                accumulate(head, 1.0);
+            }
+            count--;
+            last_time = prev_time;
+            add(timestamp, value, weight);
+        }
+
+        /**
+        * Clear the state and set a new duration, keeping the buffer
+        * @throws std::invalid_argument if `duration` is not positive
+        */
+        void reconfigure(double duration) {
+            if (!(duration > 0.0)) {
+                throw std::invalid_argument("Duration must be positive");
+            }
+            this->duration = duration;
+            head = 0;
+            size = 0;
+            prev_head = 0;
+            count = 0;
+            first_time = 0.0;
+            last_time = -HUGE_VAL;
+            prev_time = -HUGE_VAL;
+            values_sum.reset();
+            weights_sum.reset();
+            weighted_sum_.reset();
+        }
+
+        void reset() { reconfigure(duration); }
+
+        /** True when the entries span a whole window */
+        bool ready() const { return count > 0 && last_time - first_time >= duration; }
+
+        /** Number of entries in the window */
+        int length() const { return size; }
+
+        double sum() const { return values_sum.value(); }
+
+        double weight() const { return weights_sum.value(); }
+
+        double weighted_sum() const { return weighted_sum_.value(); }
+
+        void save(StateWriter &state) const {
+            state.write(times);
+            state.write(values);
+            state.write(weights);
+            state.write(duration);
+            state.write(head);
+            state.write(size);
+            state.write(prev_head);
+            state.write(count);
+            state.write(first_time);
+            state.write(last_time);
+            state.write(prev_time);
+            values_sum.save(state);
+            weights_sum.save(state);
+            weighted_sum_.save(state);
+        }
+
+        void load(StateReader &state) {
+            state.read(times);
+            state.read(values);
+            state.read(weights);
+            state.read(duration);
+            state.read(head);
+            state.read(size);
+            state.read(prev_head);
+            state.read(count);
+            state.read(first_time);
+            state.read(last_time);
+            state.read(prev_time);
+            values_sum.load(state);
+            weights_sum.load(state);
+            weighted_sum_.load(state);
+        }
+    };
+
+    /**
+    * TimeMA - Moving Average over a time window
+    * Average of the values received in the last `duration` time units.
+    * It is NaN until the updates span a whole window.
+    */
+    class TimeMA : public Indicator<double> {
+    private:
+        TimeWindow window;
+        double compute() const {
+            return window.ready() ? window.sum() / window.length() : std::nan("");
+        }
+    public:
+        TimeMA(double duration, int mem_size = 1)
+            : Indicator(mem_size), window(duration) {}
+        double update(double timestamp, double value) {
+            window.add(timestamp, value);
+            push(compute());
+            return (*this)[0];
+        }
+        double revise(double timestamp, double value) {
+            window.replace_last(timestamp, value);
+            replace(compute());
+            return (*this)[0];
+        }
+
+        void reset() {
+            Indicator::reset();
+            window.reset();
+        }
+
+        void reconfigure(double duration) {
+            window.reconfigure(duration);
+            Indicator::reset();
+        }
+
+        void save(StateWriter &state) const {
+            Indicator::save(state);
+            window.save(state);
+        }
+
+        void load(StateReader &state) {
+            Indicator::load(state);
+            window.load(state);
+        }
+    };
+
+    /**
+    * TimeEMA - Exponential Moving Average with a time constant
+    * For irregularly spaced values, every update decays the previous
+    * average by `exp(-dt / duration)`, where `dt` is the time elapsed since
+    * the previous update, and gives the rest of the weight to the new value.
+    * It is NaN until the updates span `duration` time units.
+    */
+    class TimeEMA : public Indicator<double> {
+    private:
+        double duration;
+        long length;
+        double first_time;
+        double last_time;
+        double prev_time;
+        double prev;
+        double last_prev;
+
+        void step(double timestamp, double value) {
+            if (timestamp < last_time) {
+                throw std::invalid_argument("Timestamps must be non-decreasing");
+            }
+            if (length == 0) {
+                first_time = timestamp;
+                prev = value;
+            } else {
+                double alpha = 1.0 - std::exp(-(timestamp - last_time) / duration);
+                prev += alpha * (value - prev);
+            }
+            length++;
+            last_time = timestamp;
+        }
+
+        double compute() const {
+            return last_time - first_time >= duration ? prev : std::nan("");
+        }
+
+    public:
+        /**
+        * @throws std::invalid_argument if `duration` is not positive
+        */
+        TimeEMA(double duration, int mem_size = 1)
+            : Indicator(mem_size), duration(duration), length(0), first_time(0.0),
+              last_time(-HUGE_VAL), prev_time(-HUGE_VAL), prev(0.0), last_prev(0.0) {
+            if (!(duration > 0.0)) {
+                throw std::invalid_argument("Duration must be positive");
+            }
+        }
+
+        /**
+        * @throws std::invalid_argument if `timestamp` is before the one
+        *     of the previous update
+        */
+        double update(double timestamp, double value) {
+            double time = last_time;
+            double prev_value = prev;
+            step(timestamp, value);
+            prev_time = time;
+            last_prev = prev_value;
+            push(compute());
+            return (*this)[0];
+        }
+
+        double revise(double timestamp, double value) {
+            if (length == 0) {
+                return update(timestamp, value);
+            }
+            if (timestamp < prev_time) {
+                throw std::invalid_argument("Timestamps must be non-decreasing");
+            }
+            length--;
+            last_time = prev_time;
+            prev = last_prev;
+            step(timestamp, value);
+            replace(compute());
+            return (*this)[0];
+        }
+
+        /**
+        * @throws std::invalid_argument if `duration` is not positive
+        */
+        void reconfigure(double duration) {
+            if (!(duration > 0.0)) {
+                throw std::invalid_argument("Duration must be positive");
+            }
+            Indicator::reset();
+            this->duration = duration;
+            length = 0;
+            first_time = 0.0;
+            last_time = -HUGE_VAL;
+            prev_time = -HUGE_VAL;
+            prev = 0.0;
+            last_prev = 0.0;
+        }
+
+        void reset() { reconfigure(duration); }
+
+        void save(StateWriter &state) const {
+            Indicator::save(state);
+            state.write(duration);
+            state.write(length);
+            state.write(first_time);
+            state.write(last_time);
+            state.write(prev_time);
+            state.write(prev);
+            state.write(last_prev);
+        }
+
+        void load(StateReader &state) {
+            Indicator::load(state);
+            state.read(duration);
+            state.read(length);
+            state.read(first_time);
+            state.read(last_time);
+            state.read(prev_time);
+            state.read(prev);
+            state.read(last_prev);
+        }
+    };
+
+    /**
+    * VWAP - Volume Weighted Average Price over a time window
+    * Average of the prices received in the last `duration` time units,
+    * weighted by their volumes. It is NaN until the updates span a whole
+    * window, and while there is no volume in the window.
+    */
+    class VWAP : public Indicator<double> {
+    private:
+        TimeWindow window;
+        double compute() const {
+            double volume = window.weight();
+            return window.ready() && volume > 0.0 ? window.weighted_sum() / volume
+                                                  : std::nan("");
+        }
+    public:
+        VWAP(double duration, int mem_size = 1)
+            : Indicator(mem_size), window(duration) {}
+        double update(double timestamp, double price, double volume) {
+            window.add(timestamp, price, volume);
+            push(compute());
+            return (*this)[0];
+        }
+        double revise(double timestamp, double price, double volume) {
+            window.replace_last(timestamp, price, volume);
+            replace(compute());
+            return (*this)[0];
+        }
+
+        void reset() {
+            Indicator::reset();
+            window.reset();
+        }
+
+        void reconfigure(double duration) {
+            window.reconfigure(duration);
+            Indicator::reset();
+        }
+
+        void save(StateWriter &state) const {
+            Indicator::save(state);
+            window.save(state);
+        }
+
+        void load(StateReader &state) {
+            Indicator::load(state);
+            window.load(state);
+        }
+    };
+
+    /**
+    * IndicatorGraph - A set of indicators evaluated together
+    * Values live in numbered slots. The first `N_INPUTS` slots hold the
+    * fields of the current bar (open, high, low, close and volume). Every
+    * node reads its inputs from existing slots and writes its outputs to
+    * new slots, so a node can take the output of another one (e.g. an EMA
+    * of the difference of two EMAs). Nodes are evaluated in the order they
+    * were added, which is a valid topological order because a node can
+    * only refer to slots created before it.
+    */
+
+    /**
+    * Kinds of graph nodes. Values are part of the serialized state, so
+    * new kinds must be added at the end.
+    */
+    enum class NodeKind : int {
+        MA, EMA, MV, STDDEV, ZSCORE, BOLLINGER, ROI, RSI, ATR, MACD,
+        MAX, MIN, DONCHIAN, STOCHASTIC, WILLIAMS_R,
+        ADD, SUB, MUL, DIV,
+    };
+
+    class GraphNode {
+    public:
+        virtual ~GraphNode() {}
+        virtual void update(double *slots) = 0;
+        virtual void revise(double *slots) = 0;
+        virtual void save(StateWriter &state) const = 0;
+        virtual void load(StateReader &state) = 0;
+    };
+
+    template <typename T> struct output_size { static const int value = 1; };
+    template <> struct output_size<MACDResult> { static const int value = 3; };
+    template <> struct output_size<BandsResult> { static const int value = 3; };
+    template <> struct output_size<StochResult> { static const int value = 2; };
+
+    inline void write_output(double *out, double value) { out[0] = value; }
+    inline void write_output(double *out, const MACDResult &value) {
+        out[0] = value.macd;
+        out[1] = value.signal;
+        out[2] = value.hist;
+    }
+    inline void write_output(double *out, const BandsResult &value) {
+        out[0] = value.upper;
+        out[1] = value.middle;
+        out[2] = value.lower;
+    }
+    inline void write_output(double *out, const StochResult &value) {
+        out[0] = value.k;
+        out[1] = value.d;
+    }
+
+    /**
+    * Graph node wrapping an indicator with `NIn` inputs
+    * The indicator is not updated on bars where any of its inputs is NaN,
+    * e.g. while an upstream indicator is warming up. The outputs for those
+    * bars are NaN. When a bar is revised, the indicator is revised if it
+    * was updated with that bar, and updated otherwise.
+    */
+    template <typename Ind, size_t NIn>
+    class IndicatorNode : public GraphNode {
+    private:
+        Ind indicator;
+        std::array<int, NIn> inputs;
+        int output;
+        bool updated;
+
+        template <size_t... I>
+        void update(double *slots, bool revise, std::index_sequence<I...>) {
+            for (int input : inputs) {
+                if (std::isnan(slots[input])) {
+                    using Out = decltype(indicator.update(slots[inputs[I]]...));
+                    std::fill(slots + output, slots + output + output_size<Out>::value,
+                              std::nan(""));
+                    updated = updated && revise;
+                    return;
+                }
+            }
+            if (revise && updated) {
+                write_output(slots + output, indicator.revise(slots[inputs[I]]...));
+            } else {
+                write_output(slots + output, indicator.update(slots[inputs[I]]...));
+            }
+            updated = true;
+        }
+
+    public:
+        template <typename... Args>
+        IndicatorNode(const std::vector<int> &inputs, int output, Args... args)
+            : indicator(args...), output(output), updated(false) {
+            std::copy(inputs.begin(), inputs.end(), this->inputs.begin());
+        }
+        void update(double *slots) override {
+            update(slots, false, std::make_index_sequence<NIn>());
+        }
+        void revise(double *slots) override {
+            update(slots, true, std::make_index_sequence<NIn>());
+        }
+        void save(StateWriter &state) const override {
+            indicator.save(state);
+            state.write(updated);
+        }
+        void load(StateReader &state) override {
+            indicator.load(state);
+            state.read(updated);
+        }
+    };
+
+    /**
+    * Graph node for element-wise arithmetic between two slots
+    */
+    class BinaryNode : public GraphNode {
+    private:
+        NodeKind kind;
+        int a;
+        int b;
+        int output;
+
+    public:
+        BinaryNode(NodeKind kind, int a, int b, int output)
+            : kind(kind), a(a), b(b), output(output) {}
+        void update(double *slots) override {
+            switch (kind) {
+                case NodeKind::ADD: slots[output] = slots[a] + slots[b]; break;
+                case NodeKind::SUB: slots[output] = slots[a] - slots[b]; break;
+                case NodeKind::MUL: slots[output] = slots[a] * slots[b]; break;
+                default: slots[output] = slots[a] / slots[b]; break;
+            }
+        }
+        void revise(double *slots) override { update(slots); }
+        void save(StateWriter &) const override {}
+        void load(StateReader &) override {}
+    };
+
+    class IndicatorGraph {
+    public:
+        enum Input { OPEN, HIGH, LOW, CLOSE, VOLUME, N_INPUTS };
+
+    private:
+        struct NodeSpec {
+            NodeKind kind;
+            std::vector<int> inputs;
+            std::vector<double> params;
+        };
+        std::vector<NodeSpec> specs;
+        std::vector<std::unique_ptr<GraphNode>> nodes;
+        std::vector<double> slots;
+
+        template <typename Ind, size_t NIn, typename... Args>
+        int make_node(const std::vector<int> &inputs, Args... args) {
+            using Out = decltype(std::declval<Ind &>()[0]);
+            int output = static_cast<int>(slots.size());
+            nodes.emplace_back(new IndicatorNode<Ind, NIn>(inputs, output, args...));
+            slots.resize(slots.size() + output_size<typename std::decay<Out>::type>::value,
+                         std::nan(""));
+            return output;
+        }
+
+    public:
+        IndicatorGraph() : slots(N_INPUTS, std::nan("")) {}
+
+        /**
+        * Add a node to the graph
+        * @param kind: kind of node
+        * @param inputs: slots the node reads from, in the order the
+        *     underlying indicator `update` method takes them
+        * @param params: constructor arguments of the indicator
+        * @return first slot written by the node. Nodes with more than one
+        *     output use consecutive slots.
+        * @throws std::invalid_argument on wrong inputs or parameters
+        */
+        int add(NodeKind kind, const std::vector<int> &inputs,
+                const std::vector<double> &params) {
+            size_t n_inputs = 1;
+            size_t n_params = 1;
+            switch (kind) {
+                case NodeKind::EMA: n_params = 2; break;
+                case NodeKind::BOLLINGER: n_params = 2; break;
+                case NodeKind::ROI: n_params = 0; break;
+                case NodeKind::RSI: n_inputs = 2; break;
+                case NodeKind::ATR: n_inputs = 3; break;
+                case NodeKind::MACD: n_params = 3; break;
+                case NodeKind::DONCHIAN: n_inputs = 2; break;
+                case NodeKind::STOCHASTIC: n_inputs = 3; n_params = 2; break;
+                case NodeKind::WILLIAMS_R: n_inputs = 3; break;
+                case NodeKind::ADD:
+                case NodeKind::SUB:
+                case NodeKind::MUL:
+                case NodeKind::DIV: n_inputs = 2; n_params = 0; break;
+                default: break;
+            }
+            if (inputs.size() != n_inputs || params.size() != n_params) {
+                throw std::invalid_argument("Wrong number of node inputs or parameters");
+            }
+            for (int input : inputs) {
+                if (input < 0 || input >= static_cast<int>(slots.size())) {
+                    throw std::invalid_argument("Invalid input slot");
+                }
+            }
+            int output;
+            // Integer parameters are periods
+            auto param = [&params](size_t i) {
+                if (!(params[i] >= 1 && params[i] <= INT_MAX)) {
+                    throw std::invalid_argument("Periods must be positive");
+                }
+                return static_cast<int>(params[i]);
+            };
+            switch (kind) {
+                case NodeKind::MA: output = make_node<MA, 1>(inputs, param(0)); break;
+                case NodeKind::EMA:
+                    output = make_node<EMA, 1>(inputs, param(0), params[1]);
+                    break;
+                case NodeKind::MV: output = make_node<MV, 1>(inputs, param(0)); break;
+                case NodeKind::STDDEV: output = make_node<StdDev, 1>(inputs, param(0)); break;
+                case NodeKind::ZSCORE: output = make_node<ZScore, 1>(inputs, param(0)); break;
+                case NodeKind::BOLLINGER:
+                    output = make_node<BollingerBands, 1>(inputs, param(0), params[1]);
+                    break;
+                case NodeKind::ROI: output = make_node<ROI, 1>(inputs); break;
+                case NodeKind::RSI: output = make_node<RSI, 2>(inputs, param(0)); break;
+                case NodeKind::ATR: output = make_node<ATR, 3>(inputs, param(0)); break;
+                case NodeKind::MACD:
+                    output = make_node<MACD, 1>(inputs, param(0), param(1), param(2));
+                    break;
+                case NodeKind::MAX: output = make_node<MovingMax, 1>(inputs, param(0)); break;
+                case NodeKind::MIN: output = make_node<MovingMin, 1>(inputs, param(0)); break;
+                case NodeKind::DONCHIAN:
+                    output = make_node<Donchian, 2>(inputs, param(0));
+                    break;
+                case NodeKind::STOCHASTIC:
+                    output = make_node<Stochastic, 3>(inputs, param(0), param(1));
+                    break;
+                case NodeKind::WILLIAMS_R:
+                    output = make_node<WilliamsR, 3>(inputs, param(0));
+                    break;
+                case NodeKind::ADD:
+                case NodeKind::SUB:
+                case NodeKind::MUL:
+                case NodeKind::DIV:
+                    output = static_cast<int>(slots.size());
+                    nodes.emplace_back(new BinaryNode(kind, inputs[0], inputs[1], output));
+                    slots.push_back(std::nan(""));
+                    break;
+                default:
+                    throw std::invalid_argument("Unknown node kind");
+            }
+            specs.push_back({kind, inputs, params});
+            return output;
+        }
+
+        /**
+        * Update all the nodes with a new bar
+        * @return pointer to the slots. It is valid until a node is added.
+        */
+        const double *update(double open_price, double high_price, double low_price,
+                             double close_price, double volume) {
+            slots[OPEN] = open_price;
+            slots[HIGH] = high_price;
+            slots[LOW] = low_price;
+            slots[CLOSE] = close_price;
+            slots[VOLUME] = volume;
+            for (auto &node : nodes) {
+                node->update(slots.data());
+            }
+            return slots.data();
+        }
+
+        /**
+        * Revise all the nodes with new values for the current bar
+        * @return pointer to the slots. It is valid until a node is added.
+        */
+        const double *revise(double open_price, double high_price, double low_price,
+                             double close_price, double volume) {
+            slots[OPEN] = open_price;
+            slots[HIGH] = high_price;
+            slots[LOW] = low_price;
+            slots[CLOSE] = close_price;
+            slots[VOLUME] = volume;
+            for (auto &node : nodes) {
+                node->revise(slots.data());
+            }
+            return slots.data();
+        }
+
+        /** Number of slots, including the bar fields */
+        int size() const { return static_cast<int>(slots.size()); }
+
+        void save(StateWriter &state) const {
+            state.write(specs.size());
+            for (const NodeSpec &spec : specs) {
+                state.write(spec.kind);
+                state.write(spec.inputs);
+                state.write(spec.params);
+            }
+            for (const auto &node : nodes) {
+                node->save(state);
+            }
+            state.write(slots);
+        }
+
+        void load(StateReader &state) {
+            specs.clear();
+            nodes.clear();
+            slots.assign(N_INPUTS, std::nan(""));
+            size_t n_nodes;
+            state.read(n_nodes);
+            for (size_t i = 0; i < n_nodes; i++) {
+                NodeSpec spec;
+                state.read(spec.kind);
+                state.read(spec.inputs);
+                state.read(spec.params);
+                add(spec.kind, spec.inputs, spec.params);
+            }
+            for (auto &node : nodes) {
+                node->load(state);
+            }
+            state.read(slots);
+        }
+    };
+
+    /**
+    * Indicator banks
+    * A bank holds the state of the same indicator for `n_series` independent
+    * series (e.g. a universe of symbols) that are updated together, one
+    * value per series on every call. State is laid out as struct-of-arrays,
+    * with the values of all the series for the same step next to each other,
+    * so updates are plain loops over contiguous memory that the compiler can
+    * vectorize. The math is the same as in the single series indicators.
+    * Output arrays must have room for `n_series` values. Like indicators,
+    * banks can `revise` the values of the current step.
+    */
+
+    /**
+    * MABank - Moving Average for many series
+    */
+    template <typename T>
+    class BasicMABank {
+    private:
+        int n_series;
+        int period;
+        std::vector<T> prevs;
+        std::vector<double> accum;
+        int length;
+        int pos;
+
+        void output(T *out) const {
+            if (length < period) {
+                std::fill(out, out + n_series, std::nan(""));
+            } else {
+                for (int i = 0; i < n_series; i++) {
+                    out[i] = accum[i] / period;
+                }
+            }
+        }
+
+    public:
+        using value_type = T;
+
+        /**
+        * @throws std::invalid_argument if `n_series` is negative or `period`
+        *     is less than 1
+        */
+        BasicMABank(int n_series, int period)
+            : n_series(check_size(n_series, 0)), period(check_size(period)),
+              prevs(n_series * period, 0.0),
+              accum(n_series, 0.0), length(0), pos(0) {}
+
+        void update(const T *values, T *out) {
+            T *row = prevs.data() + pos * n_series;
+            if (length < period) {
+                length++;
+            } else {
+                for (int i = 0; i < n_series; i++) {
+                    accum[i] -= row[i];
+                }
+            }
+            for (int i = 0; i < n_series; i++) {
+                row[i] = values[i];
+                accum[i] += values[i];
+            }
+            pos = (pos + 1) % period;
+            output(out);
+        }
+
+        void revise(const T *values, T *out) {
+            if (length == 0) {
+                update(values, out);
+                return;
+            }
+            T *row = prevs.data() + ((pos + period - 1) % period) * n_series;
+            for (int i = 0; i < n_series; i++) {
+                accum[i] -= row[i];
+                row[i] = values[i];
+                accum[i] += values[i];
+            }
+            output(out);
+        }
+
+        int size() const { return n_series; }
+
+        void save(StateWriter &state) const {
+            state.write(n_series);
+            state.write(period);
+            state.write(prevs);
+            state.write(accum);
+            state.write(length);
+            state.write(pos);
+        }
+
+        void load(StateReader &state) {
+            state.read(n_series);
+            state.read(period);
+            state.read(prevs);
+            state.read(accum);
+            state.read(length);
+            state.read(pos);
+        }
+    };
+
+    using MABank = BasicMABank<double>;
+    using MABank32 = BasicMABank<float>;
+
+    /**
+    * EMABank - Exponential Moving Average for many series
+    */
+    template <typename T>
+    class BasicEMABank {
+    private:
+        int n_series;
+        int period;
+        double alpha;
+        double smooth_factor;
+        int length;
+        std::vector<T> prev;
+        std::vector<T> last_prev;
+
+        void step(const T *values, T *out) {
+            if (length <= period) {
+                for (int i = 0; i < n_series; i++) {
+                    prev[i] += values[i];
+                }
+                if (length == period) {
+                    for (int i = 0; i < n_series; i++) {
+                        prev[i] /= period;
+                    }
+                }
+            } else {
+                for (int i = 0; i < n_series; i++) {
+                    prev[i] = (values[i] * smooth_factor) + prev[i] * (1.0 - smooth_factor);
+                }
+            }
+            if (length < period) {
+                std::fill(out, out + n_series, std::nan(""));
+            } else {
+                std::copy(prev.begin(), prev.end(), out);
+            }
+        }
+
+    public:
+        using value_type = T;
+
+        /**
+        * @throws std::invalid_argument if `n_series` is negative or `period`
+        *     is less than 1
+        */
+        BasicEMABank(int n_series, int period, double alpha = 2.0)
+            : n_series(check_size(n_series, 0)), period(check_size(period)), alpha(alpha),
+              smooth_factor(alpha / (1.0 + period)), length(0), prev(n_series, 0.0),
+              last_prev(n_series, 0.0) {}
+
+        void update(const T *values, T *out) {
+            length++;
+            last_prev = prev;
+            step(values, out);
+        }
+
+        void revise(const T *values, T *out) {
+            if (length == 0) {
+                update(values, out);
+                return;
+            }
+            prev = last_prev;
+            step(values, out);
+        }
+
+        int size() const { return n_series; }
+
+        void save(StateWriter &state) const {
+            state.write(n_series);
+            state.write(period);
+            state.write(alpha);
+            state.write(smooth_factor);
+            state.write(length);
+            state.write(prev);
+            state.write(last_prev);
+        }
+
+        void load(StateReader &state) {
+            state.read(n_series);
+            state.read(period);
+            state.read(alpha);
+            state.read(smooth_factor);
+            state.read(length);
+            state.read(prev);
+            state.read(last_prev);
+        }
+    };
+
+    using EMABank = BasicEMABank<double>;
+    using EMABank32 = BasicEMABank<float>;
+
+    /**
+    * MultiEMA - EMAs of the same series with many periods
+    * Every update feeds one value to all the EMAs, and writes their outputs
+    * contiguously, in the order of `periods`. Each one matches an EMA with
+    * the same period: the simple average of the first `period` values is
+    * its seed.
+    */
+    class MultiEMA {
+    private:
+        std::vector<int> periods;
+        double alpha;
+        std::vector<double> smooth_factors;
+        int max_period;
+        int length;
+        std::vector<double> prev;
+        std::vector<double> last_prev;
+
+        void step(double value, double *out) {
+            int n_spans = static_cast<int>(periods.size());
+            if (length > max_period) {
+                for (int i = 0; i < n_spans; i++) {
+                    prev[i] = (value * smooth_factors[i]) + prev[i] * (1.0 - smooth_factors[i]);
+                    out[i] = prev[i];
+                }
+                return;
+            }
+            for (int i = 0; i < n_spans; i++) {
+                if (length < periods[i]) {
+                    prev[i] += value;
+                    out[i] = std::nan("");
+                } else if (length == periods[i]) {
+                    prev[i] += value;
+                    prev[i] /= periods[i];
+                    out[i] = prev[i];
+                } else {
+                    prev[i] = (value * smooth_factors[i]) + prev[i] * (1.0 - smooth_factors[i]);
+                    out[i] = prev[i];
+                }
+            }
+        }
+
+    public:
+        /**
+        * @throws std::invalid_argument if a period is less than 1
+        */
+        MultiEMA(const std::vector<int> &periods, double alpha = 2.0)
+            : periods(periods), alpha(alpha), smooth_factors(periods.size()),
+              max_period(0), length(0), prev(periods.size(), 0.0),
+              last_prev(periods.size(), 0.0) {
+            for (size_t i = 0; i < periods.size(); i++) {
+                check_size(periods[i]);
+                smooth_factors[i] = alpha / (1.0 + periods[i]);
+                max_period = std::max(max_period, periods[i]);
+            }
+        }
+
+        void update(double value, double *out) {
+            length++;
+            last_prev = prev;
+            step(value, out);
+        }
+
+        void revise(double value, double *out) {
+            if (length == 0) {
+                update(value, out);
+                return;
+            }
+            prev = last_prev;
+            step(value, out);
+        }
+
+        /**
+        * Batch version of `update`, writing `size()` outputs per value
+        */
+        void update_many(const double *values, int n, double *out) {
+            int n_spans = static_cast<int>(periods.size());
+            for (int i = 0; i < n; i++) {
+                update(values[i], out + static_cast<size_t>(i) * n_spans);
+            }
+        }
+
+        int size() const { return static_cast<int>(periods.size()); }
+
+        void save(StateWriter &state) const {
+            state.write(periods);
+            state.write(alpha);
+            state.write(smooth_factors);
+            state.write(max_period);
+            state.write(length);
+            state.write(prev);
+            state.write(last_prev);
+        }
+
+        void load(StateReader &state) {
+            state.read(periods);
+            state.read(alpha);
+            state.read(smooth_factors);
+            state.read(max_period);
+            state.read(length);
+            state.read(prev);
+            state.read(last_prev);
+        }
+    };
+
+    /**
+    * RSIBank - Relative Strength Index for many series
+    */
+    template <typename T>
+    class BasicRSIBank {
+    private:
+        int n_series;
+        BasicMABank<T> gains;
+        BasicMABank<T> losses;
+        std::vector<T> gain;
+        std::vector<T> loss;
+
+        void step(const T *open_price, const T *close_price, T *out,
+                  bool revise) {
+            for (int i = 0; i < n_series; i++) {
+                double diff = close_price[i] - open_price[i];
+                gain[i] = diff >= 0.0 ? diff : 0.0;
+                loss[i] = diff < 0 ? -diff : 0.0;
+            }
+            if (revise) {
+                gains.revise(gain.data(), gain.data());
+                losses.revise(loss.data(), loss.data());
+            } else {
+                gains.update(gain.data(), gain.data());
+                losses.update(loss.data(), loss.data());
+            }
+            for (int i = 0; i < n_series; i++) {
+                out[i] = 100.0 - 100.0 / (1.0 + gain[i] / loss[i]);
+            }
+        }
+
+    public:
+        using value_type = T;
+
+        /**
+        * @throws std::invalid_argument if `n_series` is negative or `period`
+        *     is less than 1
+        */
+        BasicRSIBank(int n_series, int period = 14)
+            : n_series(check_size(n_series, 0)), gains(n_series, period), losses(n_series, period),
+              gain(n_series), loss(n_series) {}
+
+        void update(const T *open_price, const T *close_price, T *out) {
+            step(open_price, close_price, out, false);
+        }
+
+        void revise(const T *open_price, const T *close_price, T *out) {
+            step(open_price, close_price, out, true);
+        }
+
+        int size() const { return n_series; }
+
+        void save(StateWriter &state) const {
+            state.write(n_series);
+            gains.save(state);
+            losses.save(state);
+            state.write(gain);
+            state.write(loss);
+        }
+
+        void load(StateReader &state) {
+            state.read(n_series);
+            gains.load(state);
+            losses.load(state);
+            state.read(gain);
+            state.read(loss);
+        }
+    };
+
+    using RSIBank = BasicRSIBank<double>;
+    using RSIBank32 = BasicRSIBank<float>;
+
+    /**
+    * ATRBank - Average True Range for many series
+    */
+    template <typename T>
+    class BasicATRBank {
+    private:
+        int n_series;
+        BasicMABank<T> prevs;
+        std::vector<T> tr;
+
+    public:
+        using value_type = T;
+
+        /**
+        * @throws std::invalid_argument if `n_series` is negative or `period`
+        *     is less than 1
+        */
+        BasicATRBank(int n_series, int period)
+            : n_series(check_size(n_series, 0)), prevs(n_series, period), tr(n_series) {}
+
+        void update(const T *low_price, const T *high_price,
+                    const T *close_price, T *out) {
+            for (int i = 0; i < n_series; i++) {
+                tr[i] = true_range(low_price[i], high_price[i], close_price[i]);
+            }
+            prevs.update(tr.data(), out);
+        }
+
+        void revise(const T *low_price, const T *high_price,
+                    const T *close_price, T *out) {
+            for (int i = 0; i < n_series; i++) {
+                tr[i] = true_range(low_price[i], high_price[i], close_price[i]);
+            }
+            prevs.revise(tr.data(), out);
+        }
+
+        int size() const { return n_series; }
+
+        void save(StateWriter &state) const {
+            state.write(n_series);
+            prevs.save(state);
+            state.write(tr);
+        }
+
+        void load(StateReader &state) {
+            state.read(n_series);
+            prevs.load(state);
+            state.read(tr);
+        }
+    };
+
+    using ATRBank = BasicATRBank<double>;
+    using ATRBank32 = BasicATRBank<float>;
+
+    /**
+    * MovingCovariance - Covariance and correlation matrices of many series
+    * over the last `period` updates
+    * Every update takes one value per series. The co-moments are updated
+    * with rank-one terms for the value entering the window and the one
+    * leaving it, so an update costs O(n_series^2) regardless of the period.
+    * Only the upper triangle of the co-moments is kept up to date.
+    * Like MV, covariances are population covariances. Correlations are NaN
+    * for series with zero variance. Both matrices are NaN until the window
+    * is full. Values must be finite, since a single NaN would stay in the
+    * running sums. With prices, a missing (NaN) price carries the previous
+    * one forward, and a return that cannot be computed counts as zero.
+    */
+    class MovingCovariance {
+    private:
+        int n_series;
+        int period;
+        std::vector<double> prevs;
+        std::vector<CompensatedSum> means;
+        std::vector<CompensatedSum> comoments;
+        std::vector<double> covariances;
+        std::vector<double> correlations;
+        int length;
+        int pos;
+        std::vector<double> last_prices;
+        std::vector<double> base_prices;
+        int price_updates;
+        std::vector<double> entering;
+        std::vector<double> leaving;
+
+        /** Add `values` to a window that is not full */
+        void add(const double *values) {
+            length++;
+            for (int i = 0; i < n_series; i++) {
+                entering[i] = values[i] - means[i].value();
+                means[i].add(entering[i] / length);
+            }
+            double scale = (length - 1.0) / length;
+            for (int i = 0; i < n_series; i++) {
+                CompensatedSum *row = comoments.data() + i * n_series;
+                for (int j = i; j < n_series; j++) {
+                    row[j].add(entering[i] * entering[j] * scale);
+                }
+            }
+        }
+
+        /** Replace `old` by `values` in the window */
+        void slide(const double *values, const double *old) {
+            for (int i = 0; i < n_series; i++) {
+                entering[i] = values[i] - means[i].value();
+                leaving[i] = old[i] - means[i].value();
+                means[i].add((entering[i] - leaving[i]) / length);
+            }
+            for (int i = 0; i < n_series; i++) {
+                CompensatedSum *row = comoments.data() + i * n_series;
+                double delta_i = entering[i] - leaving[i];
+                for (int j = i; j < n_series; j++) {
+                    double delta_j = entering[j] - leaving[j];
+                    row[j].add(entering[i] * entering[j] - leaving[i] * leaving[j]
+                               - delta_i * delta_j / length);
+                }
+            }
+        }
+
+        void output() {
+            if (length < period) {
+                std::fill(covariances.begin(), covariances.end(), std::nan(""));
+                std::fill(correlations.begin(), correlations.end(), std::nan(""));
+                return;
+            }
+            for (int i = 0; i < n_series; i++) {
+                for (int j = i; j < n_series; j++) {
+                    double cov = comoments[i * n_series + j].value() / period;
+                    covariances[i * n_series + j] = cov;
+                    covariances[j * n_series + i] = cov;
+                }
+            }
+            for (int i = 0; i < n_series; i++) {
+                double var_i = covariances[i * n_series + i];
+                for (int j = 0; j < n_series; j++) {
+                    double var_j = covariances[j * n_series + j];
+                    correlations[i * n_series + j] = var_i > 0.0 && var_j > 0.0
+                        ? covariances[i * n_series + j] / std::sqrt(var_i * var_j)
+                        : std::nan("");
+                }
+            }
+        }
+
+        /** Raise on values that are not finite, before updating anything */
+        void check(const double *values) const {
+            for (int i = 0; i < n_series; i++) {
+                if (!std::isfinite(values[i])) {
+                    throw std::invalid_argument("Values must be finite");
+                }
+            }
+        }
+
+        /**
+        * Returns from the base prices to `prices`. The prices are kept for
+        * the next call, carrying forward the base price of missing ones.
+        */
+        std::vector<double> price_returns(const double *prices) {
+            std::vector<double> returns(n_series);
+            for (int i = 0; i < n_series; i++) {
+                double roi = calculate_roi(base_prices[i], prices[i]);
+                returns[i] = std::isfinite(roi) ? roi : 0.0;
+                last_prices[i] = std::isnan(prices[i]) ? base_prices[i] : prices[i];
+            }
+            return returns;
+        }
+
+    public:
+        /**
+        * @throws std::invalid_argument if `n_series` is negative or `period`
+        *     is less than 1
+        */
+        MovingCovariance(int n_series, int period)
+            : n_series(check_size(n_series, 0)), period(check_size(period)),
+              prevs(n_series * period, 0.0),
+              means(n_series), comoments(n_series * n_series),
+              covariances(n_series * n_series, std::nan("")),
+              correlations(n_series * n_series, std::nan("")), length(0), pos(0),
+              last_prices(n_series, std::nan("")), base_prices(n_series, std::nan("")),
+              price_updates(0), entering(n_series), leaving(n_series) {}
+
+        /**
+        * @throws std::invalid_argument if a value is not finite
+        */
+        void update(const double *values) {
+            check(values);
+            double *row = prevs.data() + pos * n_series;
+            if (length < period) {
+                add(values);
+            } else {
+                slide(values, row);
+            }
+            std::copy(values, values + n_series, row);
+            pos = (pos + 1) % period;
+            output();
+        }
+
+        /**
+        * @throws std::invalid_argument if a value is not finite
+        */
+        void revise(const double *values) {
+            if (length == 0) {
+                update(values);
+                return;
+            }
+            check(values);
+            double *row = prevs.data() + ((pos + period - 1) % period) * n_series;
+            slide(values, row);
+            std::copy(values, values + n_series, row);
+            output();
+        }
+
+        /**
+        * Update with the returns from the prices of the previous call
+        * (see `calculate_roi`). The first call only records the prices.
+        */
+        void update_prices(const double *prices) {
+            if (price_updates > 0) {
+                base_prices = last_prices;
+                update(price_returns(prices).data());
+            } else {
+                std::copy(prices, prices + n_series, last_prices.begin());
+            }
+            price_updates++;
+        }
+
+        /**
+        * Replace the prices of the last call to `update_prices`
+        */
+        void revise_prices(const double *prices) {
+            if (price_updates > 1) {
+                revise(price_returns(prices).data());
+                return;
+            }
+            if (price_updates == 0) {
+                price_updates++;
+            }
+            std::copy(prices, prices + n_series, last_prices.begin());
+        }
+
+        int size() const { return n_series; }
+
+        /** Row major `n_series` x `n_series` covariance matrix */
+        const double *covariance() const { return covariances.data(); }
+
+        /** Row major `n_series` x `n_series` correlation matrix */
+        const double *correlation() const { return correlations.data(); }
+
+        void save(StateWriter &state) const {
+            state.write(n_series);
+            state.write(period);
+            state.write(prevs);
+            state.write(means);
+            state.write(comoments);
+            state.write(covariances);
+            state.write(correlations);
+            state.write(length);
+            state.write(pos);
+            state.write(last_prices);
+            state.write(base_prices);
+            state.write(price_updates);
+        }
+
+        void load(StateReader &state) {
+            state.read(n_series);
+            state.read(period);
+            state.read(prevs);
+            state.read(means);
+            state.read(comoments);
+            state.read(covariances);
+            state.read(correlations);
+            state.read(length);
+            state.read(pos);
+            state.read(last_prices);
+            state.read(base_prices);
+            state.read(price_updates);
+            entering.resize(n_series);
+            leaving.resize(n_series);
+        }
     };
 
 } // namespace indicators
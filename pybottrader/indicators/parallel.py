@@ -0,0 +1,39 @@
+"""
+Parallel computation of indicators
+
+Batch updates (`update_many`) release the GIL while they compute, so the
+indicators of many symbols can be computed in parallel with threads, in a
+single process.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, List, Optional, Sequence
+import numpy as np
+
+
+def update_many_parallel(
+    indicators: Sequence[Any],
+    inputs: Sequence[Any],
+    max_workers: Optional[int] = None,
+) -> List[np.ndarray]:
+    """
+    Calls `update_many` on every indicator with its own inputs, using a pool
+    of threads. Returns the outputs in the same order as the indicators.
+
+    :param indicators: Indicator objects. An indicator is not thread safe, so
+        the same object can not be included more than once.
+    :param inputs: For every indicator, an array or a tuple of arrays to pass
+        to `update_many`. For example, `(open_price, close_price)` for `RSI`.
+    :param max_workers: Maximum number of threads
+    """
+    if len(indicators) != len(inputs):
+        raise ValueError("One input is required for every indicator")
+    if len({id(indicator) for indicator in indicators}) != len(indicators):
+        raise ValueError("The same indicator can not be updated twice")
+    args = [data if isinstance(data, tuple) else (data,) for data in inputs]
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(indicator.update_many, *data)
+            for indicator, data in zip(indicators, args)
+        ]
+        return [future.result() for future in futures]
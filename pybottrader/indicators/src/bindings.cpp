@@ -1,48 +1,326 @@
 // bindings.cpp
 #include <pybind11/pybind11.h>
 #include <pybind11/stl.h>
+#include <pybind11/numpy.h>
 #include "indicators.hpp"
 
 namespace py = pybind11;
 using namespace indicators;
 
+/**
+ * One dimensional array of doubles. Contiguous float64 arrays are taken
+ * as they are, without copying. Any other input is converted.
+ */
+using DoubleArray = py::array_t<double, py::array::c_style | py::array::forcecast>;
+
+/**
+ * Like `DoubleArray`, for the float32 variants of the indicators
+ */
+using FloatArray = py::array_t<float, py::array::c_style | py::array::forcecast>;
+
+/**
+ * Check that all the input arrays are one dimensional and have the same
+ * length, returning that length.
+ */
+template <typename Array, typename... Arrays>
+py::ssize_t batch_size(const Array &first, const Arrays &...rest) {
+    const py::array *arrays[] = {&first, &rest...};
+    for (const py::array *array : arrays) {
+        if (array->ndim() != 1) {
+            throw std::invalid_argument("Input arrays must be one dimensional");
+        }
+        if (array->shape(0) != first.shape(0)) {
+            throw std::invalid_argument("Input arrays must have the same length");
+        }
+    }
+    return first.shape(0);
+}
+
+/**
+ * Batch version of `update`. Feeds the indicator with every element of
+ * the input arrays, in order, and returns an array with the outputs.
+ * The indicator ends in the same state as if `update` had been called
+ * once per element, so it can keep being updated one value at a time.
+ * The GIL is released during the computation.
+ */
+template <typename Ind, typename... Arrays>
+auto update_many(Ind &self, const Arrays &...arrays)
+    -> py::array_t<decltype(self.update(arrays.data()[0]...))> {
+    using Out = decltype(self.update(arrays.data()[0]...));
+    py::ssize_t n = batch_size(arrays...);
+    py::array_t<Out> result(n);
+    Out *out = result.mutable_data();
+    {
+        py::gil_scoped_release release;
+        for (py::ssize_t i = 0; i < n; i++) {
+            out[i] = self.update(arrays.data()[i]...);
+        }
+    }
+    return result;
+}
+
+/**
+ * Update a bank with one value per series taken from each input array,
+ * returning an array with one output per series. With `Revise`, the
+ * values replace the ones of the current step.
+ * The GIL is released during the computation.
+ */
+template <bool Revise, typename Bank, typename... Arrays>
+py::array_t<typename Bank::value_type> step_bank(Bank &self, const Arrays &...arrays) {
+    using T = typename Bank::value_type;
+    py::ssize_t n = batch_size(arrays...);
+    if (n != self.size()) {
+        throw std::invalid_argument("Input arrays must have one value per series");
+    }
+    py::array_t<T> result(n);
+    T *out = result.mutable_data();
+    {
+        py::gil_scoped_release release;
+        if (Revise) {
+            self.revise(arrays.data()..., out);
+        } else {
+            self.update(arrays.data()..., out);
+        }
+    }
+    return result;
+}
+
+template <typename Bank, typename... Arrays>
+py::array_t<typename Bank::value_type> update_bank(Bank &self, const Arrays &...arrays) {
+    return step_bank<false>(self, arrays...);
+}
+
+template <typename Bank, typename... Arrays>
+py::array_t<typename Bank::value_type> revise_bank(Bank &self, const Arrays &...arrays) {
+    return step_bank<true>(self, arrays...);
+}
+
+/**
+ * Pickle support. The state is the binary serialization of the whole
+ * object. To restore it, an object is built with placeholder arguments
+ * `args` and then its state is loaded.
+ */
+template <typename Ind, typename... Args>
+auto pickle(Args... args) {
+    return py::pickle(
+        [](const Ind &self) {
+            StateWriter state;
+            self.save(state);
+            return py::bytes(state.data());
+        },
+        [args...](const py::bytes &data) {
+            std::string buffer = data;
+            StateReader state(buffer);
+            Ind self(args...);
+            self.load(state);
+            if (!state.done()) {
+                throw std::invalid_argument("Invalid indicator state");
+            }
+            return self;
+        });
+}
+
+/**
+ * Read-only view of the values kept in memory by an indicator, in
+ * chronological order: the last element is the current value. No data is
+ * copied. The view reflects the buffer at the time of the call, so it has to
+ * be requested again after the indicator is updated.
+ */
+template <typename T>
+py::array_t<T> history(py::object self) {
+    const Indicator<T> &indicator = self.cast<const Indicator<T> &>();
+    py::array_t<T> view(indicator.memory_size(), indicator.history(), self);
+    view.attr("setflags")(py::arg("write") = false);
+    return view;
+}
+
+/**
+ * Copy of the slots of a graph. Slots are overwritten on every update and
+ * reallocated when a node is added, so a view could not be kept.
+ */
+py::array_t<double> graph_slots(const IndicatorGraph &graph, const double *slots) {
+    py::array_t<double> result(graph.size());
+    std::copy(slots, slots + graph.size(), result.mutable_data());
+    return result;
+}
+
+/**
+ * Read-only (n_series, n_series) view of a matrix of a MovingCovariance.
+ * No data is copied. The matrices are overwritten in place, so the view
+ * always shows the values of the latest update.
+ */
+py::array_t<double> covariance_matrix(py::object self, const double *matrix) {
+    const MovingCovariance &cov = self.cast<const MovingCovariance &>();
+    py::ssize_t n = cov.size();
+    py::array_t<double> view({n, n}, matrix, self);
+    view.attr("setflags")(py::arg("write") = false);
+    return view;
+}
+
+/**
+ * Update a MovingCovariance with one value per series taken from the
+ * input array, returning a view of the covariance matrix.
+ * The GIL is released during the computation.
+ */
+template <void (MovingCovariance::*Step)(const double *)>
+py::array_t<double> step_covariance(py::object self, const DoubleArray &values) {
+    MovingCovariance &cov = self.cast<MovingCovariance &>();
+    if (batch_size(values) != cov.size()) {
+        throw std::invalid_argument("Input arrays must have one value per series");
+    }
+    {
+        py::gil_scoped_release release;
+        (cov.*Step)(values.data());
+    }
+    return covariance_matrix(self, cov.covariance());
+}
+
 PYBIND11_MODULE(_indicators, m) {
-    m.doc() = "Financial indicators for streaming data implemented in C++";
+    m.doc() = "Financial indicators for streaming data implemented in C++\n\n"
+        "Batch (`update_many`) and bank updates release the GIL while they compute,\n"
+        "so different indicator objects can be updated from different threads in\n"
+        "parallel. An indicator object is not thread safe: the same object must not\n"
+        "be updated or read from more than one thread at the same time.";
+
+    PYBIND11_NUMPY_DTYPE(MACDResult, macd, signal, hist);
+    PYBIND11_NUMPY_DTYPE(BandsResult, upper, middle, lower);
+    PYBIND11_NUMPY_DTYPE(StochResult, k, d);
 
     py::class_<Indicator<double>>(m, "FloatIndicator")
         .def(py::init<int>(), py::arg("mem_size") = 1)
+        .def(pickle<Indicator<double>>(1))
+        .def("reset", &Indicator<double>::reset)
         .def("__getitem__", &Indicator<double>::operator[])
         .def("push", &Indicator<double>::push)
-        .def("get", &Indicator<double>::get, py::arg("key") = 0);
+        .def("get", &Indicator<double>::get, py::arg("key") = 0)
+        .def("history", &history<double>);
+
+    py::class_<Indicator<float>>(m, "Float32Indicator")
+        .def(py::init<int>(), py::arg("mem_size") = 1)
+        .def(pickle<Indicator<float>>(1))
+        .def("reset", &Indicator<float>::reset)
+        .def("__getitem__", &Indicator<float>::operator[])
+        .def("push", &Indicator<float>::push)
+        .def("get", &Indicator<float>::get, py::arg("key") = 0)
+        .def("history", &history<float>);
 
     py::class_<Indicator<MACDResult>>(m, "MACDIndicator")
         .def(py::init<int>(), py::arg("mem_size") = 1)
+        .def(pickle<Indicator<MACDResult>>(1))
+        .def("reset", &Indicator<MACDResult>::reset)
         .def("__getitem__", &Indicator<MACDResult>::operator[])
         .def("push", &Indicator<MACDResult>::push)
-        .def("get", &Indicator<MACDResult>::get, py::arg("key") = 0);
+        .def("get", &Indicator<MACDResult>::get, py::arg("key") = 0)
+        .def("history", &history<MACDResult>);
+
+    py::class_<Indicator<BandsResult>>(m, "BandsIndicator")
+        .def(py::init<int>(), py::arg("mem_size") = 1)
+        .def(pickle<Indicator<BandsResult>>(1))
+        .def("reset", &Indicator<BandsResult>::reset)
+        .def("__getitem__", &Indicator<BandsResult>::operator[])
+        .def("push", &Indicator<BandsResult>::push)
+        .def("get", &Indicator<BandsResult>::get, py::arg("key") = 0)
+        .def("history", &history<BandsResult>);
+
+    py::class_<Indicator<StochResult>>(m, "StochIndicator")
+        .def(py::init<int>(), py::arg("mem_size") = 1)
+        .def(pickle<Indicator<StochResult>>(1))
+        .def("reset", &Indicator<StochResult>::reset)
+        .def("__getitem__", &Indicator<StochResult>::operator[])
+        .def("push", &Indicator<StochResult>::push)
+        .def("get", &Indicator<StochResult>::get, py::arg("key") = 0)
+        .def("history", &history<StochResult>);
 
     py::class_<MA, Indicator<double>>(m, "MA")
         .def(py::init<int, int>(), py::arg("period"), py::arg("mem_size") = 1)
-        .def("update", &MA::update);
+        .def(pickle<MA>(1))
+        .def("reset", &MA::reset)
+        .def("reconfigure", &MA::reconfigure, py::arg("period"))
+        .def("update", &MA::update)
+        .def("revise", &MA::revise)
+        .def("update_many", &update_many<MA, DoubleArray>, py::arg("values"));
 
     py::class_<MV, Indicator<double>>(m, "MV")
         .def(py::init<int, int>(), py::arg("period"), py::arg("mem_size") = 1)
-        .def("update", &MV::update);
+        .def(pickle<MV>(1))
+        .def("reset", &MV::reset)
+        .def("reconfigure", &MV::reconfigure, py::arg("period"))
+        .def("update", &MV::update)
+        .def("revise", &MV::revise)
+        .def("update_many", &update_many<MV, DoubleArray>, py::arg("values"));
+
+    py::class_<StdDev, Indicator<double>>(m, "StdDev")
+        .def(py::init<int, int>(), py::arg("period"), py::arg("mem_size") = 1)
+        .def(pickle<StdDev>(1))
+        .def("reset", &StdDev::reset)
+        .def("reconfigure", &StdDev::reconfigure, py::arg("period"))
+        .def("update", &StdDev::update)
+        .def("revise", &StdDev::revise)
+        .def("update_many", &update_many<StdDev, DoubleArray>, py::arg("values"));
+
+    py::class_<ZScore, Indicator<double>>(m, "ZScore")
+        .def(py::init<int, int>(), py::arg("period"), py::arg("mem_size") = 1)
+        .def(pickle<ZScore>(1))
+        .def("reset", &ZScore::reset)
+        .def("reconfigure", &ZScore::reconfigure, py::arg("period"))
+        .def("update", &ZScore::update)
+        .def("revise", &ZScore::revise)
+        .def("update_many", &update_many<ZScore, DoubleArray>, py::arg("values"));
+
+    py::class_<BandsResult>(m, "BandsResult")
+        .def_readwrite("upper", &BandsResult::upper)
+        .def_readwrite("middle", &BandsResult::middle)
+        .def_readwrite("lower", &BandsResult::lower);
+
+    py::class_<BollingerBands, Indicator<BandsResult>>(m, "BollingerBands")
+        .def(py::init<int, double, int>(),
+             py::arg("period") = 20, py::arg("k") = 2.0, py::arg("mem_size") = 1)
+        .def(pickle<BollingerBands>(1))
+        .def("reset", &BollingerBands::reset)
+        .def("reconfigure", py::overload_cast<int>(&BollingerBands::reconfigure),
+            py::arg("period") = 20)
+        .def("reconfigure", py::overload_cast<int, double>(&BollingerBands::reconfigure),
+            py::arg("period"),
+            py::arg("k"))
+        .def("update", &BollingerBands::update)
+        .def("revise", &BollingerBands::revise)
+        .def("update_many", &update_many<BollingerBands, DoubleArray>, py::arg("values"));
 
     py::class_<EMA, Indicator<double>>(m, "EMA")
         .def(py::init<int, double, int>(), 
              py::arg("period"), py::arg("alpha") = 2.0, py::arg("mem_size") = 1)
-        .def("update", &EMA::update);
+        .def(pickle<EMA>(1))
+        .def("reset", &EMA::reset)
+        .def("reconfigure", py::overload_cast<int>(&EMA::reconfigure), py::arg("period"))
+        .def("reconfigure", py::overload_cast<int, double>(&EMA::reconfigure),
+            py::arg("period"),
+            py::arg("alpha"))
+        .def("update", &EMA::update)
+        .def("revise", &EMA::revise)
+        .def("update_many", &update_many<EMA, DoubleArray>, py::arg("values"));
 
     py::class_<RSI, Indicator<double>>(m, "RSI")
         .def(py::init<int, int>(), py::arg("period") = 14, py::arg("mem_size") = 1)
+        .def(pickle<RSI>(1))
+        .def("reset", &RSI::reset)
+        .def("reconfigure", &RSI::reconfigure, py::arg("period") = 14)
         .def("update", &RSI::update,
+            py::arg("open_price"),
+            py::arg("close_price"))
+        .def("revise", &RSI::revise,
+            py::arg("open_price"),
+            py::arg("close_price"))
+        .def("update_many", &update_many<RSI, DoubleArray, DoubleArray>,
             py::arg("open_price"),
             py::arg("close_price"));
 
     py::class_<ROI, Indicator<double>>(m, "ROI")
         .def(py::init<int>(), py::arg("mem_size") = 1)
-        .def("update", &ROI::update);
+        .def(pickle<ROI>(1))
+        .def("reset", &ROI::reset)
+        .def("update", &ROI::update)
+        .def("revise", &ROI::revise)
+        .def("update_many", &update_many<ROI, DoubleArray>, py::arg("values"));
 
     py::class_<MACDResult>(m, "MACDResult")
         .def_readwrite("macd", &MACDResult::macd)
@@ -55,16 +333,595 @@ PYBIND11_MODULE(_indicators, m) {
              py::arg("long_period"),
              py::arg("diff_period"),
              py::arg("mem_size") = 1)
-        .def("update", &MACD::update);
+        .def(pickle<MACD>(1, 1, 1))
+        .def("reset", &MACD::reset)
+        .def("reconfigure", &MACD::reconfigure,
+            py::arg("short_period"),
+            py::arg("long_period"),
+            py::arg("diff_period"))
+        .def("update", &MACD::update)
+        .def("revise", &MACD::revise)
+        .def("update_many", &update_many<MACD, DoubleArray>, py::arg("values"));
 
     py::class_<ATR, Indicator<double>>(m, "ATR")
         .def(py::init<int, int>(),
             py::arg("period"),
             py::arg("mem_size") = 1)
+        .def(pickle<ATR>(1))
+        .def("reset", &ATR::reset)
+        .def("reconfigure", &ATR::reconfigure, py::arg("period"))
         .def("update", &ATR::update,
+            py::arg("low_price"),
+            py::arg("high_price"),
+            py::arg("close_price"))
+        .def("revise", &ATR::revise,
+            py::arg("low_price"),
+            py::arg("high_price"),
+            py::arg("close_price"))
+        .def("update_many", &update_many<ATR, DoubleArray, DoubleArray, DoubleArray>,
             py::arg("low_price"),
             py::arg("high_price"),
             py::arg("close_price"));
 
+    py::class_<TimeMA, Indicator<double>>(m, "TimeMA")
+        .def(py::init<double, int>(), py::arg("duration"), py::arg("mem_size") = 1)
+        .def(pickle<TimeMA>(1.0))
+        .def("reset", &TimeMA::reset)
+        .def("reconfigure", &TimeMA::reconfigure, py::arg("duration"))
+        .def("update", &TimeMA::update,
+            py::arg("timestamp"),
+            py::arg("value"))
+        .def("revise", &TimeMA::revise,
+            py::arg("timestamp"),
+            py::arg("value"))
+        .def("update_many", &update_many<TimeMA, DoubleArray, DoubleArray>,
+            py::arg("timestamps"),
+            py::arg("values"));
+
+    py::class_<TimeEMA, Indicator<double>>(m, "TimeEMA")
+        .def(py::init<double, int>(), py::arg("duration"), py::arg("mem_size") = 1)
+        .def(pickle<TimeEMA>(1.0))
+        .def("reset", &TimeEMA::reset)
+        .def("reconfigure", &TimeEMA::reconfigure, py::arg("duration"))
+        .def("update", &TimeEMA::update,
+            py::arg("timestamp"),
+            py::arg("value"))
+        .def("revise", &TimeEMA::revise,
+            py::arg("timestamp"),
+            py::arg("value"))
+        .def("update_many", &update_many<TimeEMA, DoubleArray, DoubleArray>,
+            py::arg("timestamps"),
+            py::arg("values"));
+
+    py::class_<VWAP, Indicator<double>>(m, "VWAP")
+        .def(py::init<double, int>(), py::arg("duration"), py::arg("mem_size") = 1)
+        .def(pickle<VWAP>(1.0))
+        .def("reset", &VWAP::reset)
+        .def("reconfigure", &VWAP::reconfigure, py::arg("duration"))
+        .def("update", &VWAP::update,
+            py::arg("timestamp"),
+            py::arg("price"),
+            py::arg("volume"))
+        .def("revise", &VWAP::revise,
+            py::arg("timestamp"),
+            py::arg("price"),
+            py::arg("volume"))
+        .def("update_many", &update_many<VWAP, DoubleArray, DoubleArray, DoubleArray>,
+            py::arg("timestamps"),
+            py::arg("prices"),
+            py::arg("volumes"));
+
+    py::class_<MovingMax, Indicator<double>>(m, "MovingMax")
+        .def(py::init<int, int>(), py::arg("period"), py::arg("mem_size") = 1)
+        .def(pickle<MovingMax>(1))
+        .def("reset", &MovingMax::reset)
+        .def("reconfigure", &MovingMax::reconfigure, py::arg("period"))
+        .def("update", &MovingMax::update)
+        .def("revise", &MovingMax::revise)
+        .def("update_many", &update_many<MovingMax, DoubleArray>, py::arg("values"));
+
+    py::class_<MovingMin, Indicator<double>>(m, "MovingMin")
+        .def(py::init<int, int>(), py::arg("period"), py::arg("mem_size") = 1)
+        .def(pickle<MovingMin>(1))
+        .def("reset", &MovingMin::reset)
+        .def("reconfigure", &MovingMin::reconfigure, py::arg("period"))
+        .def("update", &MovingMin::update)
+        .def("revise", &MovingMin::revise)
+        .def("update_many", &update_many<MovingMin, DoubleArray>, py::arg("values"));
+
+    py::class_<MovingQuantile, Indicator<double>>(m, "MovingQuantile")
+        .def(py::init<int, double, int>(),
+            py::arg("period"),
+            py::arg("quantile"),
+            py::arg("mem_size") = 1)
+        .def(pickle<MovingQuantile>(1, 0.5))
+        .def("reset", &MovingQuantile::reset)
+        .def("reconfigure", &MovingQuantile::reconfigure,
+            py::arg("period"),
+            py::arg("quantile"))
+        .def("update", &MovingQuantile::update)
+        .def("revise", &MovingQuantile::revise)
+        .def("update_many", &update_many<MovingQuantile, DoubleArray>, py::arg("values"));
+
+    py::class_<MovingMedian, MovingQuantile>(m, "MovingMedian")
+        .def(py::init<int, int>(), py::arg("period"), py::arg("mem_size") = 1)
+        .def(pickle<MovingMedian>(1))
+        .def("reset", &MovingMedian::reset)
+        .def("reconfigure", &MovingMedian::reconfigure, py::arg("period"))
+        .def("update", &MovingMedian::update)
+        .def("revise", &MovingMedian::revise)
+        .def("update_many", &update_many<MovingMedian, DoubleArray>, py::arg("values"));
+
+    py::class_<Donchian, Indicator<BandsResult>>(m, "Donchian")
+        .def(py::init<int, int>(), py::arg("period") = 20, py::arg("mem_size") = 1)
+        .def(pickle<Donchian>(1))
+        .def("reset", &Donchian::reset)
+        .def("reconfigure", &Donchian::reconfigure, py::arg("period") = 20)
+        .def("update", &Donchian::update,
+            py::arg("low_price"),
+            py::arg("high_price"))
+        .def("revise", &Donchian::revise,
+            py::arg("low_price"),
+            py::arg("high_price"))
+        .def("update_many", &update_many<Donchian, DoubleArray, DoubleArray>,
+            py::arg("low_price"),
+            py::arg("high_price"));
+
+    py::class_<StochResult>(m, "StochResult")
+        .def_readwrite("k", &StochResult::k)
+        .def_readwrite("d", &StochResult::d);
+
+    py::class_<Stochastic, Indicator<StochResult>>(m, "Stochastic")
+        .def(py::init<int, int, int>(),
+            py::arg("k_period") = 14,
+            py::arg("d_period") = 3,
+            py::arg("mem_size") = 1)
+        .def(pickle<Stochastic>(1))
+        .def("reset", &Stochastic::reset)
+        .def("reconfigure", &Stochastic::reconfigure,
+            py::arg("k_period") = 14,
+            py::arg("d_period") = 3)
+        .def("update", &Stochastic::update,
+            py::arg("low_price"),
+            py::arg("high_price"),
+            py::arg("close_price"))
+        .def("revise", &Stochastic::revise,
+            py::arg("low_price"),
+            py::arg("high_price"),
+            py::arg("close_price"))
+        .def("update_many", &update_many<Stochastic, DoubleArray, DoubleArray, DoubleArray>,
+            py::arg("low_price"),
+            py::arg("high_price"),
+            py::arg("close_price"));
+
+    py::class_<WilliamsR, Indicator<double>>(m, "WilliamsR")
+        .def(py::init<int, int>(), py::arg("period") = 14, py::arg("mem_size") = 1)
+        .def(pickle<WilliamsR>(1))
+        .def("reset", &WilliamsR::reset)
+        .def("reconfigure", &WilliamsR::reconfigure, py::arg("period") = 14)
+        .def("update", &WilliamsR::update,
+            py::arg("low_price"),
+            py::arg("high_price"),
+            py::arg("close_price"))
+        .def("revise", &WilliamsR::revise,
+            py::arg("low_price"),
+            py::arg("high_price"),
+            py::arg("close_price"))
+        .def("update_many", &update_many<WilliamsR, DoubleArray, DoubleArray, DoubleArray>,
+            py::arg("low_price"),
+            py::arg("high_price"),
+            py::arg("close_price"));
+
+    py::class_<MABank>(m, "MABank")
+        .def(py::init<int, int>(), py::arg("n_series"), py::arg("period"))
+        .def(pickle<MABank>(1, 1))
+        .def("update", &update_bank<MABank, DoubleArray>, py::arg("values"))
+        .def("revise", &revise_bank<MABank, DoubleArray>, py::arg("values"))
+        .def("__len__", &MABank::size);
+
+    py::class_<EMABank>(m, "EMABank")
+        .def(py::init<int, int, double>(),
+            py::arg("n_series"), py::arg("period"), py::arg("alpha") = 2.0)
+        .def(pickle<EMABank>(1, 1))
+        .def("update", &update_bank<EMABank, DoubleArray>, py::arg("values"))
+        .def("revise", &revise_bank<EMABank, DoubleArray>, py::arg("values"))
+        .def("__len__", &EMABank::size);
+
+    py::class_<MultiEMA>(m, "MultiEMA")
+        .def(py::init<const std::vector<int> &, double>(),
+            py::arg("periods"), py::arg("alpha") = 2.0)
+        .def(pickle<MultiEMA>(std::vector<int>{1}))
+        .def("update", [](MultiEMA &self, double value) {
+                py::array_t<double> result(self.size());
+                self.update(value, result.mutable_data());
+                return result;
+            },
+            py::arg("value"),
+            "Update all the EMAs, returning one value per period.")
+        .def("revise", [](MultiEMA &self, double value) {
+                py::array_t<double> result(self.size());
+                self.revise(value, result.mutable_data());
+                return result;
+            },
+            py::arg("value"))
+        .def("update_many", [](MultiEMA &self, const DoubleArray &values) {
+                py::ssize_t n = batch_size(values);
+                py::array_t<double> result({n, static_cast<py::ssize_t>(self.size())});
+                double *out = result.mutable_data();
+                {
+                    py::gil_scoped_release release;
+                    self.update_many(values.data(), static_cast<int>(n), out);
+                }
+                return result;
+            },
+            py::arg("values"),
+            "Batch version of `update`. Returns an array with one row per value\n"
+            "and one column per period.")
+        .def("__len__", &MultiEMA::size);
+
+    py::class_<RSIBank>(m, "RSIBank")
+        .def(py::init<int, int>(), py::arg("n_series"), py::arg("period") = 14)
+        .def(pickle<RSIBank>(1, 1))
+        .def("update", &update_bank<RSIBank, DoubleArray, DoubleArray>,
+            py::arg("open_price"),
+            py::arg("close_price"))
+        .def("revise", &revise_bank<RSIBank, DoubleArray, DoubleArray>,
+            py::arg("open_price"),
+            py::arg("close_price"))
+        .def("__len__", &RSIBank::size);
+
+    py::class_<ATRBank>(m, "ATRBank")
+        .def(py::init<int, int>(), py::arg("n_series"), py::arg("period"))
+        .def(pickle<ATRBank>(1, 1))
+        .def("update", &update_bank<ATRBank, DoubleArray, DoubleArray, DoubleArray>,
+            py::arg("low_price"),
+            py::arg("high_price"),
+            py::arg("close_price"))
+        .def("revise", &revise_bank<ATRBank, DoubleArray, DoubleArray, DoubleArray>,
+            py::arg("low_price"),
+            py::arg("high_price"),
+            py::arg("close_price"))
+        .def("__len__", &ATRBank::size);
+
+    // float32 variants
+
+    py::class_<MA32, Indicator<float>>(m, "MA32")
+        .def(py::init<int, int>(), py::arg("period"), py::arg("mem_size") = 1)
+        .def(pickle<MA32>(1))
+        .def("reset", &MA32::reset)
+        .def("reconfigure", &MA32::reconfigure, py::arg("period"))
+        .def("update", &MA32::update)
+        .def("revise", &MA32::revise)
+        .def("update_many", &update_many<MA32, FloatArray>, py::arg("values"));
+
+    py::class_<EMA32, Indicator<float>>(m, "EMA32")
+        .def(py::init<int, double, int>(),
+             py::arg("period"), py::arg("alpha") = 2.0, py::arg("mem_size") = 1)
+        .def(pickle<EMA32>(1))
+        .def("reset", &EMA32::reset)
+        .def("reconfigure", py::overload_cast<int>(&EMA32::reconfigure), py::arg("period"))
+        .def("reconfigure", py::overload_cast<int, double>(&EMA32::reconfigure),
+            py::arg("period"),
+            py::arg("alpha"))
+        .def("update", &EMA32::update)
+        .def("revise", &EMA32::revise)
+        .def("update_many", &update_many<EMA32, FloatArray>, py::arg("values"));
+
+    py::class_<RSI32, Indicator<float>>(m, "RSI32")
+        .def(py::init<int, int>(), py::arg("period") = 14, py::arg("mem_size") = 1)
+        .def(pickle<RSI32>(1))
+        .def("reset", &RSI32::reset)
+        .def("reconfigure", &RSI32::reconfigure, py::arg("period") = 14)
+        .def("update", &RSI32::update,
+            py::arg("open_price"),
+            py::arg("close_price"))
+        .def("revise", &RSI32::revise,
+            py::arg("open_price"),
+            py::arg("close_price"))
+        .def("update_many", &update_many<RSI32, FloatArray, FloatArray>,
+            py::arg("open_price"),
+            py::arg("close_price"));
+
+    py::class_<ATR32, Indicator<float>>(m, "ATR32")
+        .def(py::init<int, int>(),
+            py::arg("period"),
+            py::arg("mem_size") = 1)
+        .def(pickle<ATR32>(1))
+        .def("reset", &ATR32::reset)
+        .def("reconfigure", &ATR32::reconfigure, py::arg("period"))
+        .def("update", &ATR32::update,
+            py::arg("low_price"),
+            py::arg("high_price"),
+            py::arg("close_price"))
+        .def("revise", &ATR32::revise,
+            py::arg("low_price"),
+            py::arg("high_price"),
+            py::arg("close_price"))
+        .def("update_many", &update_many<ATR32, FloatArray, FloatArray, FloatArray>,
+            py::arg("low_price"),
+            py::arg("high_price"),
+            py::arg("close_price"));
+
+    py::class_<MABank32>(m, "MABank32")
+        .def(py::init<int, int>(), py::arg("n_series"), py::arg("period"))
+        .def(pickle<MABank32>(1, 1))
+        .def("update", &update_bank<MABank32, FloatArray>, py::arg("values"))
+        .def("revise", &revise_bank<MABank32, FloatArray>, py::arg("values"))
+        .def("__len__", &MABank32::size);
+
+    py::class_<EMABank32>(m, "EMABank32")
+        .def(py::init<int, int, double>(),
+            py::arg("n_series"), py::arg("period"), py::arg("alpha") = 2.0)
+        .def(pickle<EMABank32>(1, 1))
+        .def("update", &update_bank<EMABank32, FloatArray>, py::arg("values"))
+        .def("revise", &revise_bank<EMABank32, FloatArray>, py::arg("values"))
+        .def("__len__", &EMABank32::size);
+
+    py::class_<RSIBank32>(m, "RSIBank32")
+        .def(py::init<int, int>(), py::arg("n_series"), py::arg("period") = 14)
+        .def(pickle<RSIBank32>(1, 1))
+        .def("update", &update_bank<RSIBank32, FloatArray, FloatArray>,
+            py::arg("open_price"),
+            py::arg("close_price"))
+        .def("revise", &revise_bank<RSIBank32, FloatArray, FloatArray>,
+            py::arg("open_price"),
+            py::arg("close_price"))
+        .def("__len__", &RSIBank32::size);
+
+    py::class_<ATRBank32>(m, "ATRBank32")
+        .def(py::init<int, int>(), py::arg("n_series"), py::arg("period"))
+        .def(pickle<ATRBank32>(1, 1))
+        .def("update", &update_bank<ATRBank32, FloatArray, FloatArray, FloatArray>,
+            py::arg("low_price"),
+            py::arg("high_price"),
+            py::arg("close_price"))
+        .def("revise", &revise_bank<ATRBank32, FloatArray, FloatArray, FloatArray>,
+            py::arg("low_price"),
+            py::arg("high_price"),
+            py::arg("close_price"))
+        .def("__len__", &ATRBank32::size);
+
+    py::class_<MovingCovariance>(m, "MovingCovariance")
+        .def(py::init<int, int>(), py::arg("n_series"), py::arg("period"))
+        .def(pickle<MovingCovariance>(1, 1))
+        .def("update", &step_covariance<&MovingCovariance::update>, py::arg("values"))
+        .def("revise", &step_covariance<&MovingCovariance::revise>, py::arg("values"))
+        .def("update_prices", &step_covariance<&MovingCovariance::update_prices>,
+            py::arg("prices"),
+            "Update with the returns from the prices of the previous call. The\n"
+            "first call only records the prices. A missing (NaN) price carries the\n"
+            "previous one forward, with a zero return.")
+        .def("revise_prices", &step_covariance<&MovingCovariance::revise_prices>,
+            py::arg("prices"))
+        .def("covariance", [](py::object self) {
+                return covariance_matrix(self, self.cast<const MovingCovariance &>().covariance());
+            })
+        .def("correlation", [](py::object self) {
+                return covariance_matrix(self, self.cast<const MovingCovariance &>().correlation());
+            })
+        .def("__len__", &MovingCovariance::size);
+
+    py::class_<IndicatorGraph> graph(m, "IndicatorGraph",
+        "A set of indicators evaluated together, with one call per bar.\n\n"
+        "Builder methods add a node and return the slot (or a tuple of slots)\n"
+        "where its outputs are written. Slots OPEN, HIGH, LOW, CLOSE and VOLUME\n"
+        "hold the fields of the current bar. The output of a node can be the\n"
+        "input of another one.");
+    graph.attr("OPEN") = static_cast<int>(IndicatorGraph::OPEN);
+    graph.attr("HIGH") = static_cast<int>(IndicatorGraph::HIGH);
+    graph.attr("LOW") = static_cast<int>(IndicatorGraph::LOW);
+    graph.attr("CLOSE") = static_cast<int>(IndicatorGraph::CLOSE);
+    graph.attr("VOLUME") = static_cast<int>(IndicatorGraph::VOLUME);
+    graph
+        .def(py::init<>())
+        .def(pickle<IndicatorGraph>())
+        .def("ma", [](IndicatorGraph &self, int source, int period) {
+                return self.add(NodeKind::MA, {source}, {double(period)});
+            }, py::arg("source"), py::arg("period"))
+        .def("ema", [](IndicatorGraph &self, int source, int period, double alpha) {
+                return self.add(NodeKind::EMA, {source}, {double(period), alpha});
+            }, py::arg("source"), py::arg("period"), py::arg("alpha") = 2.0)
+        .def("mv", [](IndicatorGraph &self, int source, int period) {
+                return self.add(NodeKind::MV, {source}, {double(period)});
+            }, py::arg("source"), py::arg("period"))
+        .def("stddev", [](IndicatorGraph &self, int source, int period) {
+                return self.add(NodeKind::STDDEV, {source}, {double(period)});
+            }, py::arg("source"), py::arg("period"))
+        .def("zscore", [](IndicatorGraph &self, int source, int period) {
+                return self.add(NodeKind::ZSCORE, {source}, {double(period)});
+            }, py::arg("source"), py::arg("period"))
+        .def("bollinger_bands", [](IndicatorGraph &self, int source, int period, double k) {
+                int first = self.add(NodeKind::BOLLINGER, {source}, {double(period), k});
+                return py::make_tuple(first, first + 1, first + 2);
+            }, py::arg("source"), py::arg("period") = 20, py::arg("k") = 2.0,
+            "Returns the (upper, middle, lower) slots")
+        .def("roi", [](IndicatorGraph &self, int source) {
+                return self.add(NodeKind::ROI, {source}, {});
+            }, py::arg("source"))
+        .def("rsi", [](IndicatorGraph &self, int open_price, int close_price, int period) {
+                return self.add(NodeKind::RSI, {open_price, close_price}, {double(period)});
+            },
+            py::arg("open_price") = static_cast<int>(IndicatorGraph::OPEN),
+            py::arg("close_price") = static_cast<int>(IndicatorGraph::CLOSE),
+            py::arg("period") = 14)
+        .def("atr", [](IndicatorGraph &self, int period, int low_price, int high_price,
+                       int close_price) {
+                return self.add(NodeKind::ATR, {low_price, high_price, close_price},
+                                {double(period)});
+            },
+            py::arg("period"),
+            py::arg("low_price") = static_cast<int>(IndicatorGraph::LOW),
+            py::arg("high_price") = static_cast<int>(IndicatorGraph::HIGH),
+            py::arg("close_price") = static_cast<int>(IndicatorGraph::CLOSE))
+        .def("macd", [](IndicatorGraph &self, int source, int short_period, int long_period,
+                        int diff_period) {
+                int first = self.add(NodeKind::MACD, {source},
+                                     {double(short_period), double(long_period),
+                                      double(diff_period)});
+                return py::make_tuple(first, first + 1, first + 2);
+            }, py::arg("source"), py::arg("short_period"), py::arg("long_period"),
+            py::arg("diff_period"), "Returns the (macd, signal, hist) slots")
+        .def("moving_max", [](IndicatorGraph &self, int source, int period) {
+                return self.add(NodeKind::MAX, {source}, {double(period)});
+            }, py::arg("source"), py::arg("period"))
+        .def("moving_min", [](IndicatorGraph &self, int source, int period) {
+                return self.add(NodeKind::MIN, {source}, {double(period)});
+            }, py::arg("source"), py::arg("period"))
+        .def("donchian", [](IndicatorGraph &self, int period, int low_price, int high_price) {
+                int first = self.add(NodeKind::DONCHIAN, {low_price, high_price},
+                                     {double(period)});
+                return py::make_tuple(first, first + 1, first + 2);
+            },
+            py::arg("period") = 20,
+            py::arg("low_price") = static_cast<int>(IndicatorGraph::LOW),
+            py::arg("high_price") = static_cast<int>(IndicatorGraph::HIGH),
+            "Returns the (upper, middle, lower) slots")
+        .def("stochastic", [](IndicatorGraph &self, int k_period, int d_period,
+                              int low_price, int high_price, int close_price) {
+                int first = self.add(NodeKind::STOCHASTIC,
+                                     {low_price, high_price, close_price},
+                                     {double(k_period), double(d_period)});
+                return py::make_tuple(first, first + 1);
+            },
+            py::arg("k_period") = 14, py::arg("d_period") = 3,
+            py::arg("low_price") = static_cast<int>(IndicatorGraph::LOW),
+            py::arg("high_price") = static_cast<int>(IndicatorGraph::HIGH),
+            py::arg("close_price") = static_cast<int>(IndicatorGraph::CLOSE),
+            "Returns the (k, d) slots")
+        .def("williams_r", [](IndicatorGraph &self, int period, int low_price,
+                              int high_price, int close_price) {
+                return self.add(NodeKind::WILLIAMS_R, {low_price, high_price, close_price},
+                                {double(period)});
+            },
+            py::arg("period") = 14,
+            py::arg("low_price") = static_cast<int>(IndicatorGraph::LOW),
+            py::arg("high_price") = static_cast<int>(IndicatorGraph::HIGH),
+            py::arg("close_price") = static_cast<int>(IndicatorGraph::CLOSE))
+        .def("add", [](IndicatorGraph &self, int a, int b) {
+                return self.add(NodeKind::ADD, {a, b}, {});
+            }, py::arg("a"), py::arg("b"))
+        .def("sub", [](IndicatorGraph &self, int a, int b) {
+                return self.add(NodeKind::SUB, {a, b}, {});
+            }, py::arg("a"), py::arg("b"))
+        .def("mul", [](IndicatorGraph &self, int a, int b) {
+                return self.add(NodeKind::MUL, {a, b}, {});
+            }, py::arg("a"), py::arg("b"))
+        .def("div", [](IndicatorGraph &self, int a, int b) {
+                return self.add(NodeKind::DIV, {a, b}, {});
+            }, py::arg("a"), py::arg("b"))
+        .def("update", [](IndicatorGraph &graph, double open_price, double high_price,
+                          double low_price, double close_price, double volume) {
+                const double *slots = graph.update(open_price, high_price, low_price,
+                                                   close_price, volume);
+                return graph_slots(graph, slots);
+            },
+            py::arg("open_price"), py::arg("high_price"), py::arg("low_price"),
+            py::arg("close_price"), py::arg("volume") = 0.0,
+            "Update all the nodes with a new bar. Returns a copy of the slots,\n"
+            "indexed by slot number.")
+        .def("revise", [](IndicatorGraph &graph, double open_price, double high_price,
+                          double low_price, double close_price, double volume) {
+                const double *slots = graph.revise(open_price, high_price, low_price,
+                                                   close_price, volume);
+                return graph_slots(graph, slots);
+            },
+            py::arg("open_price"), py::arg("high_price"), py::arg("low_price"),
+            py::arg("close_price"), py::arg("volume") = 0.0,
+            "Revise all the nodes with new values for the current bar, without\n"
+            "advancing them. Returns a copy of the slots.")
+        .def("update_many", [](IndicatorGraph &self, const DoubleArray &open_price,
+                               const DoubleArray &high_price, const DoubleArray &low_price,
+                               const DoubleArray &close_price, const DoubleArray &volume) {
+                py::ssize_t n = batch_size(open_price, high_price, low_price, close_price,
+                                           volume);
+                py::ssize_t n_slots = self.size();
+                py::array_t<double> result({n, n_slots});
+                double *out = result.mutable_data();
+                {
+                    py::gil_scoped_release release;
+                    for (py::ssize_t i = 0; i < n; i++) {
+                        const double *slots = self.update(
+                            open_price.data()[i], high_price.data()[i], low_price.data()[i],
+                            close_price.data()[i], volume.data()[i]);
+                        std::copy(slots, slots + n_slots, out + i * n_slots);
+                    }
+                }
+                return result;
+            },
+            py::arg("open_price"), py::arg("high_price"), py::arg("low_price"),
+            py::arg("close_price"), py::arg("volume"),
+            "Update the graph with many bars. Returns a 2D array with one row of\n"
+            "slots per bar.")
+        .def("__len__", &IndicatorGraph::size);
+
     m.def("roi", &calculate_roi, "Calculate return on investment");
+
+    m.def("roi_array",
+        [](const DoubleArray &initial_values, const DoubleArray &final_values) {
+            py::ssize_t n = batch_size(initial_values, final_values);
+            py::array_t<double> result(n);
+            double *out = result.mutable_data();
+            {
+                py::gil_scoped_release release;
+                roi_array(initial_values.data(), final_values.data(),
+                          static_cast<int>(n), out);
+            }
+            return result;
+        },
+        py::arg("initial_values"), py::arg("final_values"),
+        "Element-wise return on investment");
+
+    m.def("log_returns", [](const DoubleArray &values) {
+            py::ssize_t n = batch_size(values);
+            py::array_t<double> result(n);
+            double *out = result.mutable_data();
+            {
+                py::gil_scoped_release release;
+                log_returns(values.data(), static_cast<int>(n), out);
+            }
+            return result;
+        },
+        py::arg("values"),
+        "Logarithm of the ratio of every value to the previous one");
+
+    m.def("cumulative_returns", [](const DoubleArray &values) {
+            py::ssize_t n = batch_size(values);
+            py::array_t<double> result(n);
+            double *out = result.mutable_data();
+            {
+                py::gil_scoped_release release;
+                cumulative_returns(values.data(), static_cast<int>(n), out);
+            }
+            return result;
+        },
+        py::arg("values"),
+        "Return on investment of every value from the first one");
+
+    m.def("rolling_returns", [](const DoubleArray &values, int window) {
+            py::ssize_t n = batch_size(values);
+            py::array_t<double> result(n);
+            double *out = result.mutable_data();
+            {
+                py::gil_scoped_release release;
+                rolling_returns(values.data(), static_cast<int>(n), window, out);
+            }
+            return result;
+        },
+        py::arg("values"), py::arg("window"),
+        "Return on investment of every value from the one `window` positions\n"
+        "before it");
+
+    m.def("multi_ma", [](const DoubleArray &values, const std::vector<int> &periods) {
+            py::ssize_t n = batch_size(values);
+            py::array_t<double> result({n, static_cast<py::ssize_t>(periods.size())});
+            double *out = result.mutable_data();
+            {
+                py::gil_scoped_release release;
+                multi_ma(values.data(), static_cast<int>(n), periods, out);
+            }
+            return result;
+        },
+        py::arg("values"), py::arg("periods"),
+        "Moving averages of `values` for many periods, computed in a single pass.\n"
+        "Returns an array with one row per value and one column per period.");
 }
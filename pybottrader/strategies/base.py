@@ -1,4 +1,5 @@
 from typing import Union
+from collections.abc import Mapping
 from enum import Enum
 from datetime import datetime
 from attrs import define
@@ -32,9 +33,16 @@ class Strategy:
         Init Method. Included for future support.
         """
 
-    def evaluate(self, data: Union[dict, None]) -> StrategySignal:
+    def reset(self):
+        """
+        Reset the strategy to its initial state, so it can be run again
+        over another data stream.
+        """
+
+    def evaluate(self, data: Union[Mapping, None]) -> StrategySignal:
         """
         Evaluate method. Include for future support
+        :param data: An observation, a dictionary or a `Bar` in fast mode
         """
         # The default position is STAY
         return StrategySignal(name=type(self).__name__)
@@ -50,6 +50,12 @@ class CrossOver(Strategy):
             },
         }
 
+    def reset(self):
+        """Reset the moving averages and the last position"""
+        self.short_ma.reset()
+        self.long_ma.reset()
+        self.last_flip = Position.SELL
+
     def evaluate(self, data) -> StrategySignal:
         position = Position.STAY
         if "time" not in data or "close" not in data:
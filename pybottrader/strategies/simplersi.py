@@ -44,6 +44,11 @@ class SimpleRSI(Strategy):
             },
         }
 
+    def reset(self):
+        """Reset the RSI indicator and the last position"""
+        self.rsi.reset()
+        self.last_flip = Position.SELL
+
     def evaluate(self, data) -> StrategySignal:
         """
         This function is call every time a new data point is available.
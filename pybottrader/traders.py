@@ -8,6 +8,7 @@ useful for back-testing.
 """
 
 from typing import Union
+from collections.abc import Mapping
 from datetime import datetime
 from attrs import define
 from .datastreamers.base import DataStreamer
@@ -21,7 +22,7 @@ class TradingIteration:
     """Used to report results from a trading iteration"""
 
     signal: StrategySignal
-    data: dict
+    data: Mapping
     roi: Union[float, None]
     portfolio_value: float
     accumulated_roi: Union[float, None]
@@ -1,27 +1,107 @@
 from __future__ import annotations
 from pybottrader.indicators._indicators import ATR
+from pybottrader.indicators._indicators import ATR32
+from pybottrader.indicators._indicators import ATRBank
+from pybottrader.indicators._indicators import ATRBank32
+from pybottrader.indicators._indicators import BandsIndicator
+from pybottrader.indicators._indicators import BandsResult
+from pybottrader.indicators._indicators import BollingerBands
+from pybottrader.indicators._indicators import Donchian
 from pybottrader.indicators._indicators import EMA
+from pybottrader.indicators._indicators import EMA32
+from pybottrader.indicators._indicators import EMABank
+from pybottrader.indicators._indicators import EMABank32
+from pybottrader.indicators._indicators import Float32Indicator
 from pybottrader.indicators._indicators import FloatIndicator
+from pybottrader.indicators._indicators import IndicatorGraph
 from pybottrader.indicators._indicators import MA
+from pybottrader.indicators._indicators import MA32
+from pybottrader.indicators._indicators import MABank
+from pybottrader.indicators._indicators import MABank32
 from pybottrader.indicators._indicators import MACD
 from pybottrader.indicators._indicators import MACDIndicator
 from pybottrader.indicators._indicators import MACDResult
 from pybottrader.indicators._indicators import MV
+from pybottrader.indicators._indicators import MovingCovariance
+from pybottrader.indicators._indicators import MovingMax
+from pybottrader.indicators._indicators import MovingMedian
+from pybottrader.indicators._indicators import MovingMin
+from pybottrader.indicators._indicators import MovingQuantile
+from pybottrader.indicators._indicators import MultiEMA
 from pybottrader.indicators._indicators import ROI
 from pybottrader.indicators._indicators import RSI
+from pybottrader.indicators._indicators import RSI32
+from pybottrader.indicators._indicators import RSIBank
+from pybottrader.indicators._indicators import RSIBank32
+from pybottrader.indicators._indicators import StdDev
+from pybottrader.indicators._indicators import StochIndicator
+from pybottrader.indicators._indicators import StochResult
+from pybottrader.indicators._indicators import Stochastic
+from pybottrader.indicators._indicators import TimeEMA
+from pybottrader.indicators._indicators import TimeMA
+from pybottrader.indicators._indicators import VWAP
+from pybottrader.indicators._indicators import WilliamsR
+from pybottrader.indicators._indicators import ZScore
+from pybottrader.indicators._indicators import cumulative_returns
+from pybottrader.indicators._indicators import log_returns
+from pybottrader.indicators._indicators import multi_ma
 from pybottrader.indicators._indicators import roi
+from pybottrader.indicators._indicators import roi_array
+from pybottrader.indicators._indicators import rolling_returns
+from pybottrader.indicators.parallel import update_many_parallel
 from . import _indicators
+from . import parallel
 
 __all__ = [
     "ATR",
+    "ATR32",
+    "ATRBank",
+    "ATRBank32",
+    "BandsIndicator",
+    "BandsResult",
+    "BollingerBands",
+    "Donchian",
     "EMA",
+    "EMA32",
+    "EMABank",
+    "EMABank32",
+    "Float32Indicator",
     "FloatIndicator",
+    "IndicatorGraph",
     "MA",
+    "MA32",
+    "MABank",
+    "MABank32",
     "MACD",
     "MACDIndicator",
     "MACDResult",
     "MV",
+    "MovingCovariance",
+    "MovingMax",
+    "MovingMedian",
+    "MovingMin",
+    "MovingQuantile",
+    "MultiEMA",
     "ROI",
     "RSI",
+    "RSI32",
+    "RSIBank",
+    "RSIBank32",
+    "StdDev",
+    "StochIndicator",
+    "StochResult",
+    "Stochastic",
+    "TimeEMA",
+    "TimeMA",
+    "VWAP",
+    "WilliamsR",
+    "ZScore",
+    "cumulative_returns",
+    "log_returns",
+    "multi_ma",
+    "parallel",
     "roi",
+    "roi_array",
+    "rolling_returns",
+    "update_many_parallel",
 ]
@@ -1,66 +1,491 @@
 """
 Financial indicators for streaming data implemented in C++
+
+Batch (`update_many`) and bank updates release the GIL while they compute,
+so different indicator objects can be updated from different threads in
+parallel. An indicator object is not thread safe: the same object must not
+be updated or read from more than one thread at the same time.
 """
 
 from __future__ import annotations
+import numpy
+import numpy.typing
+import typing
 
 __all__ = [
     "ATR",
+    "ATR32",
+    "ATRBank",
+    "ATRBank32",
+    "BandsIndicator",
+    "BandsResult",
+    "BollingerBands",
+    "Donchian",
     "EMA",
+    "EMA32",
+    "EMABank",
+    "EMABank32",
+    "Float32Indicator",
     "FloatIndicator",
+    "IndicatorGraph",
     "MA",
+    "MA32",
+    "MABank",
+    "MABank32",
     "MACD",
     "MACDIndicator",
     "MACDResult",
     "MV",
+    "MovingCovariance",
+    "MovingMax",
+    "MovingMedian",
+    "MovingMin",
+    "MovingQuantile",
+    "MultiEMA",
     "ROI",
     "RSI",
+    "RSI32",
+    "RSIBank",
+    "RSIBank32",
+    "StdDev",
+    "StochIndicator",
+    "StochResult",
+    "Stochastic",
+    "TimeEMA",
+    "TimeMA",
+    "VWAP",
+    "WilliamsR",
+    "ZScore",
+    "cumulative_returns",
+    "log_returns",
+    "multi_ma",
     "roi",
+    "roi_array",
+    "rolling_returns",
 ]
 
 class ATR(FloatIndicator):
     @staticmethod
     def _pybind11_conduit_v1_(*args, **kwargs): ...
+    def __getstate__(self) -> bytes: ...
+    def __init__(self, period: int, mem_size: int = 1) -> None: ...
+    def __setstate__(self, arg0: bytes) -> None: ...
+    def reconfigure(self, period: int) -> None: ...
+    def reset(self) -> None: ...
+    def revise(
+        self, low_price: float, high_price: float, close_price: float
+    ) -> float: ...
+    def update(
+        self, low_price: float, high_price: float, close_price: float
+    ) -> float: ...
+    def update_many(
+        self,
+        low_price: numpy.typing.ArrayLike,
+        high_price: numpy.typing.ArrayLike,
+        close_price: numpy.typing.ArrayLike,
+    ) -> numpy.typing.NDArray[numpy.float64]: ...
+
+class ATR32(Float32Indicator):
+    @staticmethod
+    def _pybind11_conduit_v1_(*args, **kwargs): ...
+    def __getstate__(self) -> bytes: ...
     def __init__(self, period: int, mem_size: int = 1) -> None: ...
+    def __setstate__(self, arg0: bytes) -> None: ...
+    def reconfigure(self, period: int) -> None: ...
+    def reset(self) -> None: ...
+    def revise(
+        self, low_price: float, high_price: float, close_price: float
+    ) -> float: ...
     def update(
         self, low_price: float, high_price: float, close_price: float
     ) -> float: ...
+    def update_many(
+        self,
+        low_price: numpy.typing.ArrayLike,
+        high_price: numpy.typing.ArrayLike,
+        close_price: numpy.typing.ArrayLike,
+    ) -> numpy.typing.NDArray[numpy.float32]: ...
+
+class ATRBank:
+    @staticmethod
+    def _pybind11_conduit_v1_(*args, **kwargs): ...
+    def __getstate__(self) -> bytes: ...
+    def __init__(self, n_series: int, period: int) -> None: ...
+    def __len__(self) -> int: ...
+    def __setstate__(self, arg0: bytes) -> None: ...
+    def revise(
+        self,
+        low_price: numpy.typing.ArrayLike,
+        high_price: numpy.typing.ArrayLike,
+        close_price: numpy.typing.ArrayLike,
+    ) -> numpy.typing.NDArray[numpy.float64]: ...
+    def update(
+        self,
+        low_price: numpy.typing.ArrayLike,
+        high_price: numpy.typing.ArrayLike,
+        close_price: numpy.typing.ArrayLike,
+    ) -> numpy.typing.NDArray[numpy.float64]: ...
+
+class ATRBank32:
+    @staticmethod
+    def _pybind11_conduit_v1_(*args, **kwargs): ...
+    def __getstate__(self) -> bytes: ...
+    def __init__(self, n_series: int, period: int) -> None: ...
+    def __len__(self) -> int: ...
+    def __setstate__(self, arg0: bytes) -> None: ...
+    def revise(
+        self,
+        low_price: numpy.typing.ArrayLike,
+        high_price: numpy.typing.ArrayLike,
+        close_price: numpy.typing.ArrayLike,
+    ) -> numpy.typing.NDArray[numpy.float32]: ...
+    def update(
+        self,
+        low_price: numpy.typing.ArrayLike,
+        high_price: numpy.typing.ArrayLike,
+        close_price: numpy.typing.ArrayLike,
+    ) -> numpy.typing.NDArray[numpy.float32]: ...
+
+class BandsIndicator:
+    @staticmethod
+    def _pybind11_conduit_v1_(*args, **kwargs): ...
+    def __getitem__(self, arg0: int) -> BandsResult: ...
+    def __getstate__(self) -> bytes: ...
+    def __init__(self, mem_size: int = 1) -> None: ...
+    def __setstate__(self, arg0: bytes) -> None: ...
+    def get(self, key: int = 0) -> BandsResult: ...
+    def history(self) -> numpy.typing.NDArray[numpy.void]: ...
+    def push(self, arg0: BandsResult) -> None: ...
+    def reset(self) -> None: ...
+
+class BandsResult:
+    lower: float
+    middle: float
+    upper: float
+    @staticmethod
+    def _pybind11_conduit_v1_(*args, **kwargs): ...
+
+class BollingerBands(BandsIndicator):
+    @staticmethod
+    def _pybind11_conduit_v1_(*args, **kwargs): ...
+    def __getstate__(self) -> bytes: ...
+    def __init__(self, period: int = 20, k: float = 2.0, mem_size: int = 1) -> None: ...
+    def __setstate__(self, arg0: bytes) -> None: ...
+    @typing.overload
+    def reconfigure(self, period: int = 20) -> None: ...
+    @typing.overload
+    def reconfigure(self, period: int, k: float) -> None: ...
+    def reset(self) -> None: ...
+    def revise(self, arg0: float) -> BandsResult: ...
+    def update(self, arg0: float) -> BandsResult: ...
+    def update_many(
+        self, values: numpy.typing.ArrayLike
+    ) -> numpy.typing.NDArray[numpy.void]: ...
+
+class Donchian(BandsIndicator):
+    @staticmethod
+    def _pybind11_conduit_v1_(*args, **kwargs): ...
+    def __getstate__(self) -> bytes: ...
+    def __init__(self, period: int = 20, mem_size: int = 1) -> None: ...
+    def __setstate__(self, arg0: bytes) -> None: ...
+    def reconfigure(self, period: int = 20) -> None: ...
+    def reset(self) -> None: ...
+    def revise(self, low_price: float, high_price: float) -> BandsResult: ...
+    def update(self, low_price: float, high_price: float) -> BandsResult: ...
+    def update_many(
+        self, low_price: numpy.typing.ArrayLike, high_price: numpy.typing.ArrayLike
+    ) -> numpy.typing.NDArray[numpy.void]: ...
 
 class EMA(FloatIndicator):
     @staticmethod
     def _pybind11_conduit_v1_(*args, **kwargs): ...
+    def __getstate__(self) -> bytes: ...
+    def __init__(self, period: int, alpha: float = 2.0, mem_size: int = 1) -> None: ...
+    def __setstate__(self, arg0: bytes) -> None: ...
+    @typing.overload
+    def reconfigure(self, period: int) -> None: ...
+    @typing.overload
+    def reconfigure(self, period: int, alpha: float) -> None: ...
+    def reset(self) -> None: ...
+    def revise(self, arg0: float) -> float: ...
+    def update(self, arg0: float) -> float: ...
+    def update_many(
+        self, values: numpy.typing.ArrayLike
+    ) -> numpy.typing.NDArray[numpy.float64]: ...
+
+class EMA32(Float32Indicator):
+    @staticmethod
+    def _pybind11_conduit_v1_(*args, **kwargs): ...
+    def __getstate__(self) -> bytes: ...
     def __init__(self, period: int, alpha: float = 2.0, mem_size: int = 1) -> None: ...
+    def __setstate__(self, arg0: bytes) -> None: ...
+    @typing.overload
+    def reconfigure(self, period: int) -> None: ...
+    @typing.overload
+    def reconfigure(self, period: int, alpha: float) -> None: ...
+    def reset(self) -> None: ...
+    def revise(self, arg0: float) -> float: ...
     def update(self, arg0: float) -> float: ...
+    def update_many(
+        self, values: numpy.typing.ArrayLike
+    ) -> numpy.typing.NDArray[numpy.float32]: ...
+
+class EMABank:
+    @staticmethod
+    def _pybind11_conduit_v1_(*args, **kwargs): ...
+    def __getstate__(self) -> bytes: ...
+    def __init__(self, n_series: int, period: int, alpha: float = 2.0) -> None: ...
+    def __len__(self) -> int: ...
+    def __setstate__(self, arg0: bytes) -> None: ...
+    def revise(
+        self, values: numpy.typing.ArrayLike
+    ) -> numpy.typing.NDArray[numpy.float64]: ...
+    def update(
+        self, values: numpy.typing.ArrayLike
+    ) -> numpy.typing.NDArray[numpy.float64]: ...
+
+class EMABank32:
+    @staticmethod
+    def _pybind11_conduit_v1_(*args, **kwargs): ...
+    def __getstate__(self) -> bytes: ...
+    def __init__(self, n_series: int, period: int, alpha: float = 2.0) -> None: ...
+    def __len__(self) -> int: ...
+    def __setstate__(self, arg0: bytes) -> None: ...
+    def revise(
+        self, values: numpy.typing.ArrayLike
+    ) -> numpy.typing.NDArray[numpy.float32]: ...
+    def update(
+        self, values: numpy.typing.ArrayLike
+    ) -> numpy.typing.NDArray[numpy.float32]: ...
+
+class Float32Indicator:
+    @staticmethod
+    def _pybind11_conduit_v1_(*args, **kwargs): ...
+    def __getitem__(self, arg0: int) -> float: ...
+    def __getstate__(self) -> bytes: ...
+    def __init__(self, mem_size: int = 1) -> None: ...
+    def __setstate__(self, arg0: bytes) -> None: ...
+    def get(self, key: int = 0) -> float: ...
+    def history(self) -> numpy.typing.NDArray[numpy.float32]: ...
+    def push(self, arg0: float) -> None: ...
+    def reset(self) -> None: ...
 
 class FloatIndicator:
     @staticmethod
     def _pybind11_conduit_v1_(*args, **kwargs): ...
     def __getitem__(self, arg0: int) -> float: ...
+    def __getstate__(self) -> bytes: ...
     def __init__(self, mem_size: int = 1) -> None: ...
+    def __setstate__(self, arg0: bytes) -> None: ...
     def get(self, key: int = 0) -> float: ...
+    def history(self) -> numpy.typing.NDArray[numpy.float64]: ...
     def push(self, arg0: float) -> None: ...
+    def reset(self) -> None: ...
+
+class IndicatorGraph:
+    """
+    A set of indicators evaluated together, with one call per bar.
+
+    Builder methods add a node and return the slot (or a tuple of slots)
+    where its outputs are written. Slots OPEN, HIGH, LOW, CLOSE and VOLUME
+    hold the fields of the current bar. The output of a node can be the
+    input of another one.
+    """
+
+    CLOSE: typing.ClassVar[int] = 3
+    HIGH: typing.ClassVar[int] = 1
+    LOW: typing.ClassVar[int] = 2
+    OPEN: typing.ClassVar[int] = 0
+    VOLUME: typing.ClassVar[int] = 4
+    @staticmethod
+    def _pybind11_conduit_v1_(*args, **kwargs): ...
+    def __getstate__(self) -> bytes: ...
+    def __init__(self) -> None: ...
+    def __len__(self) -> int: ...
+    def __setstate__(self, arg0: bytes) -> None: ...
+    def add(self, a: int, b: int) -> int: ...
+    def atr(
+        self, period: int, low_price: int = 2, high_price: int = 1, close_price: int = 3
+    ) -> int: ...
+    def bollinger_bands(
+        self, source: int, period: int = 20, k: float = 2.0
+    ) -> tuple[int, int, int]:
+        """
+        Returns the (upper, middle, lower) slots
+        """
+
+    def div(self, a: int, b: int) -> int: ...
+    def donchian(
+        self, period: int = 20, low_price: int = 2, high_price: int = 1
+    ) -> tuple[int, int, int]:
+        """
+        Returns the (upper, middle, lower) slots
+        """
+
+    def ema(self, source: int, period: int, alpha: float = 2.0) -> int: ...
+    def ma(self, source: int, period: int) -> int: ...
+    def macd(
+        self, source: int, short_period: int, long_period: int, diff_period: int
+    ) -> tuple[int, int, int]:
+        """
+        Returns the (macd, signal, hist) slots
+        """
+
+    def moving_max(self, source: int, period: int) -> int: ...
+    def moving_min(self, source: int, period: int) -> int: ...
+    def mul(self, a: int, b: int) -> int: ...
+    def mv(self, source: int, period: int) -> int: ...
+    def revise(
+        self,
+        open_price: float,
+        high_price: float,
+        low_price: float,
+        close_price: float,
+        volume: float = 0.0,
+    ) -> numpy.typing.NDArray[numpy.float64]:
+        """
+        Revise all the nodes with new values for the current bar, without
+        advancing them. Returns a copy of the slots.
+        """
+
+    def roi(self, source: int) -> int: ...
+    def rsi(
+        self, open_price: int = 0, close_price: int = 3, period: int = 14
+    ) -> int: ...
+    def stddev(self, source: int, period: int) -> int: ...
+    def stochastic(
+        self,
+        k_period: int = 14,
+        d_period: int = 3,
+        low_price: int = 2,
+        high_price: int = 1,
+        close_price: int = 3,
+    ) -> tuple[int, int]:
+        """
+        Returns the (k, d) slots
+        """
+
+    def sub(self, a: int, b: int) -> int: ...
+    def update(
+        self,
+        open_price: float,
+        high_price: float,
+        low_price: float,
+        close_price: float,
+        volume: float = 0.0,
+    ) -> numpy.typing.NDArray[numpy.float64]:
+        """
+        Update all the nodes with a new bar. Returns a copy of the slots,
+        indexed by slot number.
+        """
+
+    def update_many(
+        self,
+        open_price: numpy.typing.ArrayLike,
+        high_price: numpy.typing.ArrayLike,
+        low_price: numpy.typing.ArrayLike,
+        close_price: numpy.typing.ArrayLike,
+        volume: numpy.typing.ArrayLike,
+    ) -> numpy.typing.NDArray[numpy.float64]:
+        """
+        Update the graph with many bars. Returns a 2D array with one row of
+        slots per bar.
+        """
+
+    def williams_r(
+        self,
+        period: int = 14,
+        low_price: int = 2,
+        high_price: int = 1,
+        close_price: int = 3,
+    ) -> int: ...
+    def zscore(self, source: int, period: int) -> int: ...
 
 class MA(FloatIndicator):
     @staticmethod
     def _pybind11_conduit_v1_(*args, **kwargs): ...
+    def __getstate__(self) -> bytes: ...
     def __init__(self, period: int, mem_size: int = 1) -> None: ...
+    def __setstate__(self, arg0: bytes) -> None: ...
+    def reconfigure(self, period: int) -> None: ...
+    def reset(self) -> None: ...
+    def revise(self, arg0: float) -> float: ...
     def update(self, arg0: float) -> float: ...
+    def update_many(
+        self, values: numpy.typing.ArrayLike
+    ) -> numpy.typing.NDArray[numpy.float64]: ...
+
+class MA32(Float32Indicator):
+    @staticmethod
+    def _pybind11_conduit_v1_(*args, **kwargs): ...
+    def __getstate__(self) -> bytes: ...
+    def __init__(self, period: int, mem_size: int = 1) -> None: ...
+    def __setstate__(self, arg0: bytes) -> None: ...
+    def reconfigure(self, period: int) -> None: ...
+    def reset(self) -> None: ...
+    def revise(self, arg0: float) -> float: ...
+    def update(self, arg0: float) -> float: ...
+    def update_many(
+        self, values: numpy.typing.ArrayLike
+    ) -> numpy.typing.NDArray[numpy.float32]: ...
+
+class MABank:
+    @staticmethod
+    def _pybind11_conduit_v1_(*args, **kwargs): ...
+    def __getstate__(self) -> bytes: ...
+    def __init__(self, n_series: int, period: int) -> None: ...
+    def __len__(self) -> int: ...
+    def __setstate__(self, arg0: bytes) -> None: ...
+    def revise(
+        self, values: numpy.typing.ArrayLike
+    ) -> numpy.typing.NDArray[numpy.float64]: ...
+    def update(
+        self, values: numpy.typing.ArrayLike
+    ) -> numpy.typing.NDArray[numpy.float64]: ...
+
+class MABank32:
+    @staticmethod
+    def _pybind11_conduit_v1_(*args, **kwargs): ...
+    def __getstate__(self) -> bytes: ...
+    def __init__(self, n_series: int, period: int) -> None: ...
+    def __len__(self) -> int: ...
+    def __setstate__(self, arg0: bytes) -> None: ...
+    def revise(
+        self, values: numpy.typing.ArrayLike
+    ) -> numpy.typing.NDArray[numpy.float32]: ...
+    def update(
+        self, values: numpy.typing.ArrayLike
+    ) -> numpy.typing.NDArray[numpy.float32]: ...
 
 class MACD(MACDIndicator):
     @staticmethod
     def _pybind11_conduit_v1_(*args, **kwargs): ...
+    def __getstate__(self) -> bytes: ...
     def __init__(
         self, short_period: int, long_period: int, diff_period: int, mem_size: int = 1
     ) -> None: ...
+    def __setstate__(self, arg0: bytes) -> None: ...
+    def reconfigure(
+        self, short_period: int, long_period: int, diff_period: int
+    ) -> None: ...
+    def reset(self) -> None: ...
+    def revise(self, arg0: float) -> MACDResult: ...
     def update(self, arg0: float) -> MACDResult: ...
+    def update_many(
+        self, values: numpy.typing.ArrayLike
+    ) -> numpy.typing.NDArray[numpy.void]: ...
 
 class MACDIndicator:
     @staticmethod
     def _pybind11_conduit_v1_(*args, **kwargs): ...
     def __getitem__(self, arg0: int) -> ...: ...
+    def __getstate__(self) -> bytes: ...
     def __init__(self, mem_size: int = 1) -> None: ...
+    def __setstate__(self, arg0: bytes) -> None: ...
     def get(self, key: int = 0) -> ...: ...
+    def history(self) -> numpy.typing.NDArray[numpy.void]: ...
     def push(self, arg0: ...) -> None: ...
+    def reset(self) -> None: ...
 
 class MACDResult:
     hist: float
@@ -69,25 +494,364 @@ class MACDResult:
     @staticmethod
     def _pybind11_conduit_v1_(*args, **kwargs): ...
 
+class MovingCovariance:
+    @staticmethod
+    def _pybind11_conduit_v1_(*args, **kwargs): ...
+    def __getstate__(self) -> bytes: ...
+    def __init__(self, n_series: int, period: int) -> None: ...
+    def __len__(self) -> int: ...
+    def __setstate__(self, arg0: bytes) -> None: ...
+    def correlation(self) -> numpy.typing.NDArray[numpy.float64]: ...
+    def covariance(self) -> numpy.typing.NDArray[numpy.float64]: ...
+    def revise(
+        self, values: numpy.typing.ArrayLike
+    ) -> numpy.typing.NDArray[numpy.float64]: ...
+    def revise_prices(
+        self, prices: numpy.typing.ArrayLike
+    ) -> numpy.typing.NDArray[numpy.float64]: ...
+    def update(
+        self, values: numpy.typing.ArrayLike
+    ) -> numpy.typing.NDArray[numpy.float64]: ...
+    def update_prices(
+        self, prices: numpy.typing.ArrayLike
+    ) -> numpy.typing.NDArray[numpy.float64]:
+        """
+        Update with the returns from the prices of the previous call. The
+        first call only records the prices. A missing (NaN) price carries the
+        previous one forward, with a zero return.
+        """
+
+class MovingMax(FloatIndicator):
+    @staticmethod
+    def _pybind11_conduit_v1_(*args, **kwargs): ...
+    def __getstate__(self) -> bytes: ...
+    def __init__(self, period: int, mem_size: int = 1) -> None: ...
+    def __setstate__(self, arg0: bytes) -> None: ...
+    def reconfigure(self, period: int) -> None: ...
+    def reset(self) -> None: ...
+    def revise(self, arg0: float) -> float: ...
+    def update(self, arg0: float) -> float: ...
+    def update_many(
+        self, values: numpy.typing.ArrayLike
+    ) -> numpy.typing.NDArray[numpy.float64]: ...
+
+class MovingMedian(MovingQuantile):
+    @staticmethod
+    def _pybind11_conduit_v1_(*args, **kwargs): ...
+    def __getstate__(self) -> bytes: ...
+    def __init__(self, period: int, mem_size: int = 1) -> None: ...
+    def __setstate__(self, arg0: bytes) -> None: ...
+    def reconfigure(self, period: int) -> None: ...  # type: ignore[override]
+    def reset(self) -> None: ...
+    def revise(self, arg0: float) -> float: ...
+    def update(self, arg0: float) -> float: ...
+    def update_many(
+        self, values: numpy.typing.ArrayLike
+    ) -> numpy.typing.NDArray[numpy.float64]: ...
+
+class MovingMin(FloatIndicator):
+    @staticmethod
+    def _pybind11_conduit_v1_(*args, **kwargs): ...
+    def __getstate__(self) -> bytes: ...
+    def __init__(self, period: int, mem_size: int = 1) -> None: ...
+    def __setstate__(self, arg0: bytes) -> None: ...
+    def reconfigure(self, period: int) -> None: ...
+    def reset(self) -> None: ...
+    def revise(self, arg0: float) -> float: ...
+    def update(self, arg0: float) -> float: ...
+    def update_many(
+        self, values: numpy.typing.ArrayLike
+    ) -> numpy.typing.NDArray[numpy.float64]: ...
+
+class MovingQuantile(FloatIndicator):
+    @staticmethod
+    def _pybind11_conduit_v1_(*args, **kwargs): ...
+    def __getstate__(self) -> bytes: ...
+    def __init__(self, period: int, quantile: float, mem_size: int = 1) -> None: ...
+    def __setstate__(self, arg0: bytes) -> None: ...
+    def reconfigure(self, period: int, quantile: float) -> None: ...
+    def reset(self) -> None: ...
+    def revise(self, arg0: float) -> float: ...
+    def update(self, arg0: float) -> float: ...
+    def update_many(
+        self, values: numpy.typing.ArrayLike
+    ) -> numpy.typing.NDArray[numpy.float64]: ...
+
+class MultiEMA:
+    @staticmethod
+    def _pybind11_conduit_v1_(*args, **kwargs): ...
+    def __getstate__(self) -> bytes: ...
+    def __init__(self, periods: list[int], alpha: float = 2.0) -> None: ...
+    def __len__(self) -> int: ...
+    def __setstate__(self, arg0: bytes) -> None: ...
+    def revise(self, value: float) -> numpy.typing.NDArray[numpy.float64]: ...
+    def update(self, value: float) -> numpy.typing.NDArray[numpy.float64]:
+        """
+        Update all the EMAs, returning one value per period.
+        """
+
+    def update_many(
+        self, values: numpy.typing.ArrayLike
+    ) -> numpy.typing.NDArray[numpy.float64]:
+        """
+        Batch version of `update`. Returns an array with one row per value
+        and one column per period.
+        """
+
 class MV(FloatIndicator):
     @staticmethod
     def _pybind11_conduit_v1_(*args, **kwargs): ...
+    def __getstate__(self) -> bytes: ...
     def __init__(self, period: int, mem_size: int = 1) -> None: ...
+    def __setstate__(self, arg0: bytes) -> None: ...
+    def reconfigure(self, period: int) -> None: ...
+    def reset(self) -> None: ...
+    def revise(self, arg0: float) -> float: ...
     def update(self, arg0: float) -> float: ...
+    def update_many(
+        self, values: numpy.typing.ArrayLike
+    ) -> numpy.typing.NDArray[numpy.float64]: ...
 
 class ROI(FloatIndicator):
     @staticmethod
     def _pybind11_conduit_v1_(*args, **kwargs): ...
+    def __getstate__(self) -> bytes: ...
     def __init__(self, mem_size: int = 1) -> None: ...
+    def __setstate__(self, arg0: bytes) -> None: ...
+    def reset(self) -> None: ...
+    def revise(self, arg0: float) -> float: ...
     def update(self, arg0: float) -> float: ...
+    def update_many(
+        self, values: numpy.typing.ArrayLike
+    ) -> numpy.typing.NDArray[numpy.float64]: ...
 
 class RSI(FloatIndicator):
     @staticmethod
     def _pybind11_conduit_v1_(*args, **kwargs): ...
+    def __getstate__(self) -> bytes: ...
     def __init__(self, period: int = 14, mem_size: int = 1) -> None: ...
+    def __setstate__(self, arg0: bytes) -> None: ...
+    def reconfigure(self, period: int = 14) -> None: ...
+    def reset(self) -> None: ...
+    def revise(self, open_price: float, close_price: float) -> float: ...
     def update(self, open_price: float, close_price: float) -> float: ...
+    def update_many(
+        self, open_price: numpy.typing.ArrayLike, close_price: numpy.typing.ArrayLike
+    ) -> numpy.typing.NDArray[numpy.float64]: ...
+
+class RSI32(Float32Indicator):
+    @staticmethod
+    def _pybind11_conduit_v1_(*args, **kwargs): ...
+    def __getstate__(self) -> bytes: ...
+    def __init__(self, period: int = 14, mem_size: int = 1) -> None: ...
+    def __setstate__(self, arg0: bytes) -> None: ...
+    def reconfigure(self, period: int = 14) -> None: ...
+    def reset(self) -> None: ...
+    def revise(self, open_price: float, close_price: float) -> float: ...
+    def update(self, open_price: float, close_price: float) -> float: ...
+    def update_many(
+        self, open_price: numpy.typing.ArrayLike, close_price: numpy.typing.ArrayLike
+    ) -> numpy.typing.NDArray[numpy.float32]: ...
+
+class RSIBank:
+    @staticmethod
+    def _pybind11_conduit_v1_(*args, **kwargs): ...
+    def __getstate__(self) -> bytes: ...
+    def __init__(self, n_series: int, period: int = 14) -> None: ...
+    def __len__(self) -> int: ...
+    def __setstate__(self, arg0: bytes) -> None: ...
+    def revise(
+        self, open_price: numpy.typing.ArrayLike, close_price: numpy.typing.ArrayLike
+    ) -> numpy.typing.NDArray[numpy.float64]: ...
+    def update(
+        self, open_price: numpy.typing.ArrayLike, close_price: numpy.typing.ArrayLike
+    ) -> numpy.typing.NDArray[numpy.float64]: ...
+
+class RSIBank32:
+    @staticmethod
+    def _pybind11_conduit_v1_(*args, **kwargs): ...
+    def __getstate__(self) -> bytes: ...
+    def __init__(self, n_series: int, period: int = 14) -> None: ...
+    def __len__(self) -> int: ...
+    def __setstate__(self, arg0: bytes) -> None: ...
+    def revise(
+        self, open_price: numpy.typing.ArrayLike, close_price: numpy.typing.ArrayLike
+    ) -> numpy.typing.NDArray[numpy.float32]: ...
+    def update(
+        self, open_price: numpy.typing.ArrayLike, close_price: numpy.typing.ArrayLike
+    ) -> numpy.typing.NDArray[numpy.float32]: ...
+
+class StdDev(FloatIndicator):
+    @staticmethod
+    def _pybind11_conduit_v1_(*args, **kwargs): ...
+    def __getstate__(self) -> bytes: ...
+    def __init__(self, period: int, mem_size: int = 1) -> None: ...
+    def __setstate__(self, arg0: bytes) -> None: ...
+    def reconfigure(self, period: int) -> None: ...
+    def reset(self) -> None: ...
+    def revise(self, arg0: float) -> float: ...
+    def update(self, arg0: float) -> float: ...
+    def update_many(
+        self, values: numpy.typing.ArrayLike
+    ) -> numpy.typing.NDArray[numpy.float64]: ...
+
+class Stochastic(StochIndicator):
+    @staticmethod
+    def _pybind11_conduit_v1_(*args, **kwargs): ...
+    def __getstate__(self) -> bytes: ...
+    def __init__(
+        self, k_period: int = 14, d_period: int = 3, mem_size: int = 1
+    ) -> None: ...
+    def __setstate__(self, arg0: bytes) -> None: ...
+    def reconfigure(self, k_period: int = 14, d_period: int = 3) -> None: ...
+    def reset(self) -> None: ...
+    def revise(
+        self, low_price: float, high_price: float, close_price: float
+    ) -> StochResult: ...
+    def update(
+        self, low_price: float, high_price: float, close_price: float
+    ) -> StochResult: ...
+    def update_many(
+        self,
+        low_price: numpy.typing.ArrayLike,
+        high_price: numpy.typing.ArrayLike,
+        close_price: numpy.typing.ArrayLike,
+    ) -> numpy.typing.NDArray[numpy.void]: ...
+
+class StochIndicator:
+    @staticmethod
+    def _pybind11_conduit_v1_(*args, **kwargs): ...
+    def __getitem__(self, arg0: int) -> StochResult: ...
+    def __getstate__(self) -> bytes: ...
+    def __init__(self, mem_size: int = 1) -> None: ...
+    def __setstate__(self, arg0: bytes) -> None: ...
+    def get(self, key: int = 0) -> StochResult: ...
+    def history(self) -> numpy.typing.NDArray[numpy.void]: ...
+    def push(self, arg0: StochResult) -> None: ...
+    def reset(self) -> None: ...
+
+class StochResult:
+    d: float
+    k: float
+    @staticmethod
+    def _pybind11_conduit_v1_(*args, **kwargs): ...
+
+class TimeEMA(FloatIndicator):
+    @staticmethod
+    def _pybind11_conduit_v1_(*args, **kwargs): ...
+    def __getstate__(self) -> bytes: ...
+    def __init__(self, duration: float, mem_size: int = 1) -> None: ...
+    def __setstate__(self, arg0: bytes) -> None: ...
+    def reconfigure(self, duration: float) -> None: ...
+    def reset(self) -> None: ...
+    def revise(self, timestamp: float, value: float) -> float: ...
+    def update(self, timestamp: float, value: float) -> float: ...
+    def update_many(
+        self, timestamps: numpy.typing.ArrayLike, values: numpy.typing.ArrayLike
+    ) -> numpy.typing.NDArray[numpy.float64]: ...
+
+class TimeMA(FloatIndicator):
+    @staticmethod
+    def _pybind11_conduit_v1_(*args, **kwargs): ...
+    def __getstate__(self) -> bytes: ...
+    def __init__(self, duration: float, mem_size: int = 1) -> None: ...
+    def __setstate__(self, arg0: bytes) -> None: ...
+    def reconfigure(self, duration: float) -> None: ...
+    def reset(self) -> None: ...
+    def revise(self, timestamp: float, value: float) -> float: ...
+    def update(self, timestamp: float, value: float) -> float: ...
+    def update_many(
+        self, timestamps: numpy.typing.ArrayLike, values: numpy.typing.ArrayLike
+    ) -> numpy.typing.NDArray[numpy.float64]: ...
+
+class VWAP(FloatIndicator):
+    @staticmethod
+    def _pybind11_conduit_v1_(*args, **kwargs): ...
+    def __getstate__(self) -> bytes: ...
+    def __init__(self, duration: float, mem_size: int = 1) -> None: ...
+    def __setstate__(self, arg0: bytes) -> None: ...
+    def reconfigure(self, duration: float) -> None: ...
+    def reset(self) -> None: ...
+    def revise(self, timestamp: float, price: float, volume: float) -> float: ...
+    def update(self, timestamp: float, price: float, volume: float) -> float: ...
+    def update_many(
+        self,
+        timestamps: numpy.typing.ArrayLike,
+        prices: numpy.typing.ArrayLike,
+        volumes: numpy.typing.ArrayLike,
+    ) -> numpy.typing.NDArray[numpy.float64]: ...
+
+class WilliamsR(FloatIndicator):
+    @staticmethod
+    def _pybind11_conduit_v1_(*args, **kwargs): ...
+    def __getstate__(self) -> bytes: ...
+    def __init__(self, period: int = 14, mem_size: int = 1) -> None: ...
+    def __setstate__(self, arg0: bytes) -> None: ...
+    def reconfigure(self, period: int = 14) -> None: ...
+    def reset(self) -> None: ...
+    def revise(
+        self, low_price: float, high_price: float, close_price: float
+    ) -> float: ...
+    def update(
+        self, low_price: float, high_price: float, close_price: float
+    ) -> float: ...
+    def update_many(
+        self,
+        low_price: numpy.typing.ArrayLike,
+        high_price: numpy.typing.ArrayLike,
+        close_price: numpy.typing.ArrayLike,
+    ) -> numpy.typing.NDArray[numpy.float64]: ...
+
+class ZScore(FloatIndicator):
+    @staticmethod
+    def _pybind11_conduit_v1_(*args, **kwargs): ...
+    def __getstate__(self) -> bytes: ...
+    def __init__(self, period: int, mem_size: int = 1) -> None: ...
+    def __setstate__(self, arg0: bytes) -> None: ...
+    def reconfigure(self, period: int) -> None: ...
+    def reset(self) -> None: ...
+    def revise(self, arg0: float) -> float: ...
+    def update(self, arg0: float) -> float: ...
+    def update_many(
+        self, values: numpy.typing.ArrayLike
+    ) -> numpy.typing.NDArray[numpy.float64]: ...
+
+def cumulative_returns(
+    values: numpy.typing.ArrayLike,
+) -> numpy.typing.NDArray[numpy.float64]:
+    """
+    Return on investment of every value from the first one
+    """
+
+def log_returns(values: numpy.typing.ArrayLike) -> numpy.typing.NDArray[numpy.float64]:
+    """
+    Logarithm of the ratio of every value to the previous one
+    """
+
+def multi_ma(
+    values: numpy.typing.ArrayLike, periods: list[int]
+) -> numpy.typing.NDArray[numpy.float64]:
+    """
+    Moving averages of `values` for many periods, computed in a single pass.
+    Returns an array with one row per value and one column per period.
+    """
 
 def roi(arg0: float, arg1: float) -> float:
     """
     Calculate return on investment
     """
+
+def roi_array(
+    initial_values: numpy.typing.ArrayLike, final_values: numpy.typing.ArrayLike
+) -> numpy.typing.NDArray[numpy.float64]:
+    """
+    Element-wise return on investment
+    """
+
+def rolling_returns(
+    values: numpy.typing.ArrayLike, window: int
+) -> numpy.typing.NDArray[numpy.float64]:
+    """
+    Return on investment of every value from the one `window` positions
+    before it
+    """
@@ -0,0 +1,9 @@
+from __future__ import annotations
+from typing import Any, List, Optional, Sequence
+import numpy as np
+
+def update_many_parallel(
+    indicators: Sequence[Any],
+    inputs: Sequence[Any],
+    max_workers: Optional[int] = None,
+) -> List[np.ndarray]: ...
@@ -0,0 +1,376 @@
+import os
+import threading
+import time
+import numpy as np
+import pandas as pd
+import pytest
+import requests
+from requests.exceptions import HTTPError
+from pybottrader.datastreamers import (
+    Bar,
+    CSVFileStreamer,
+    HistoryCache,
+    HistoryStore,
+    MmapStreamer,
+    StoreStreamer,
+    write_columnar,
+)
+from pybottrader.datastreamers import cache as history_cache
+from pybottrader.datastreamers import coinbase, yfinance
+from pybottrader.datastreamers.coinbase import CBHistory
+from pybottrader.datastreamers.yfinance import YFHistory
+from pybottrader.strategies import CrossOver
+
+DATA = os.path.join(os.path.dirname(__file__), "data", "BTC-USD-DAILY-2023.csv")
+
+
+def test_fast_mode():
+    slow = CSVFileStreamer(DATA)
+    fast = CSVFileStreamer(DATA, fast=True)
+    counter = 0
+    while True:
+        row = slow.next()
+        bar = fast.next()
+        if row is None:
+            assert bar is None
+            break
+        assert isinstance(bar, Bar)
+        assert dict(bar) == row
+        assert "close" in bar
+        assert bar["close"] == row["close"]
+        counter += 1
+    assert counter == len(slow.data)
+    fast.reset()
+    assert fast.result() == slow.data.iloc[0].to_dict()
+
+
+def test_fast_mode_strategy():
+    signals = []
+    for fast in [False, True]:
+        streamer = CSVFileStreamer(DATA, fast=fast)
+        strategy = CrossOver(5, 20)
+        positions = []
+        while (data := streamer.next()) is not None:
+            positions.append(strategy.evaluate(data).position)
+        signals.append(positions)
+    assert signals[0] == signals[1]
+
+
+def test_next_batch():
+    streamer = CSVFileStreamer(DATA)
+    length = len(streamer.data)
+    first = streamer.next()
+    batch = streamer.next_batch(100)
+    assert streamer.index == 101
+    assert list(batch) == list(streamer.data.columns)
+    assert np.array_equal(batch["close"], streamer.data["close"].to_numpy()[1:101])
+    assert np.shares_memory(batch["close"], streamer.data["close"].to_numpy())
+    assert streamer.next() == streamer.data.iloc[101].to_dict()
+    batch = streamer.next_batch(length)
+    assert len(batch["close"]) == length - 102
+    assert streamer.next_batch(10) is None
+    assert streamer.next() is None
+    streamer.reset()
+    assert streamer.next() == first
+    with pytest.raises(ValueError):
+        streamer.next_batch(0)
+
+
+def test_chunked_csv():
+    full = CSVFileStreamer(DATA)
+    chunked = CSVFileStreamer(DATA, chunksize=50, prefetch=2)
+    for _ in range(len(full.data)):
+        assert chunked.next() == full.next()
+    assert chunked.next() is None
+    chunked.reset()
+    assert chunked.next() == full.data.iloc[0].to_dict()
+    batch = chunked.next_batch(120)
+    assert np.array_equal(batch["close"], full.data["close"].to_numpy()[1:121])
+    chunked.close()
+
+
+def test_chunked_csv_columns():
+    streamer = CSVFileStreamer(
+        DATA,
+        fast=True,
+        chunksize=30,
+        usecols=["time", "close"],
+        dtype={"close": np.float32},
+    )
+    bar = streamer.next()
+    assert list(bar) == ["time", "close"]
+    assert bar["close"].dtype == np.float32
+    counter = 1
+    while streamer.next() is not None:
+        counter += 1
+    assert counter == len(CSVFileStreamer(DATA).data)
+
+
+def test_columnar(tmp_path):
+    csv = CSVFileStreamer(DATA)
+    write_columnar(csv.data, tmp_path / "full")
+    write_columnar(CSVFileStreamer(DATA, chunksize=40), tmp_path / "chunked")
+    times = pd.to_datetime(csv.data["time"], utc=True)
+    for directory in ["full", "chunked"]:
+        streamer = MmapStreamer(tmp_path / directory)
+        counter = 0
+        while (row := streamer.next()) is not None:
+            expected = csv.data.iloc[counter].to_dict()
+            assert row["time"] == times.iloc[counter].timestamp()
+            for col in ["open", "high", "low", "close", "volume"]:
+                assert row[col] == expected[col]
+            counter += 1
+        assert counter == len(csv.data)
+    fast = MmapStreamer(tmp_path / "chunked", fast=True)
+    assert isinstance(fast.next(), Bar)
+    batch = fast.next_batch(100)
+    assert isinstance(batch["close"], np.memmap)
+    assert np.array_equal(batch["close"], csv.data["close"].to_numpy()[1:101])
+
+
+def test_history_store(tmp_path):
+    data = pd.read_csv(DATA)
+    store = HistoryStore(tmp_path)
+    store.write("BTC-USD", data.iloc[:200])
+    store.write("BTC-USD", data.iloc[150:])
+    store.write("HALF", data.iloc[::2].assign(close=data["close"].iloc[::2] / 2))
+    assert store.symbols() == ["BTC-USD", "HALF"]
+    assert len(store.select(["BTC-USD"])) == 13
+    assert sum(part["rows"] for part in store.select(["BTC-USD"])) == len(data)
+    streamer = StoreStreamer(tmp_path, "BTC-USD")
+    counter = 0
+    while (row := streamer.next()) is not None:
+        assert row["close"] == data["close"].iloc[counter]
+        counter += 1
+    assert counter == len(data)
+    start, end = "2023-03-10", "2023-05-20"
+    assert len(store.select(["BTC-USD", "HALF"], 1678406400.0, 1684540800.0)) == 6
+    streamer = StoreStreamer(store, ["BTC-USD", "HALF"], start, end, fast=True)
+    times = pd.to_datetime(data["time"], utc=True)
+    selected = data[(times >= start) & (times < end)]
+    expected = len(selected) + len(selected.iloc[selected.index % 2 == 0])
+    rows = []
+    while (row := streamer.next()) is not None:
+        rows.append(dict(row))
+    assert len(rows) == expected
+    assert all(a["time"] <= b["time"] for a, b in zip(rows, rows[1:]))
+    assert {row["symbol"] for row in rows} == {"BTC-USD", "HALF"}
+    streamer.reset()
+    assert dict(streamer.next()) == rows[0]
+
+
+def test_seek(tmp_path):
+    data = pd.read_csv(DATA)
+    write_columnar(data, tmp_path / "columnar")
+    HistoryStore(tmp_path / "store").write("BTC-USD", data)
+    streamers = [
+        CSVFileStreamer(DATA),
+        CSVFileStreamer(DATA, chunksize=40),
+        MmapStreamer(tmp_path / "columnar"),
+        StoreStreamer(tmp_path / "store", "BTC-USD"),
+    ]
+    times = pd.to_datetime(data["time"], utc=True)
+    for streamer in streamers:
+        index = int((times < pd.Timestamp("2023-06-15 12:00", tz="UTC")).sum())
+        assert streamer.seek("2023-06-15 12:00") == index
+        assert streamer.next()["close"] == data["close"].iloc[index]
+        assert streamer.seek(times.iloc[300].timestamp()) == 300
+        assert streamer.seek(times.iloc[30] - pd.Timedelta(hours=1)) == 30
+        assert streamer.next()["close"] == data["close"].iloc[30]
+        streamer.seek_index(len(data) - 1)
+        assert streamer.next()["close"] == data["close"].iloc[-1]
+        assert streamer.next() is None
+        streamer.seek_index(5)
+        assert streamer.next()["close"] == data["close"].iloc[5]
+        assert streamer.seek("2030-01-01") == len(data)
+        assert streamer.next() is None
+        with pytest.raises(ValueError):
+            streamer.seek_index(-1)
+
+
+def seconds_data() -> pd.DataFrame:
+    data = pd.read_csv(DATA)
+    times = pd.to_datetime(data["time"], utc=True)
+    return data.assign(time=(times - pd.Timestamp(0, tz="UTC")).dt.total_seconds())
+
+
+def test_history_cache(tmp_path):
+    data = seconds_data()
+    times = data["time"]
+    calls = []
+
+    def fetch(start, end):
+        calls.append((start, end))
+        return data[(times >= start) & (times < end)]
+
+    cache = HistoryCache(tmp_path)
+    result = cache.get("test", "BTC-USD", "1d", times[100], times[200], fetch)
+    assert calls == [(times[100], times[200])]
+    assert result.equals(data.iloc[100:200].reset_index(drop=True))
+    result = cache.get("test", "BTC-USD", "1d", times[120], times[150], fetch)
+    assert len(calls) == 1
+    assert result.equals(data.iloc[120:150].reset_index(drop=True))
+    result = cache.get("test", "BTC-USD", "1d", times[50], times[250], fetch)
+    assert calls[1:] == [(times[50], times[100]), (times[200], times[250])]
+    assert result.equals(data.iloc[50:250].reset_index(drop=True))
+    cache.get("test", "BTC-USD", "1d", times[60], times[240], fetch)
+    cache.get("test", "ETH-USD", "1d", times[60], times[240], fetch)
+    assert len(calls) == 4
+
+
+def test_history_cache_streamers(tmp_path, monkeypatch):
+    data = seconds_data()
+    calls = []
+
+    class Ticker:
+        def __init__(self, symbol):
+            self.symbol = symbol
+
+        def history(self, start, end, interval):
+            calls.append(("yfinance", start, end))
+            selected = data[
+                (data["time"] >= start.timestamp()) & (data["time"] < end.timestamp())
+            ]
+            index = pd.to_datetime(selected["time"], unit="s", utc=True).dt.as_unit(
+                "ns"
+            )
+            frame = selected.drop(columns="time").set_axis(index)
+            return frame.rename(columns=str.capitalize)
+
+    class Candle(dict):
+        def to_dict(self):
+            return dict(self)
+
+    class RESTClient:
+        def __init__(self, api_key, api_secret):
+            self.session = requests.Session()
+
+        def get_candles(self, symbol, start, end, period):
+            calls.append(("coinbase", start, end))
+            selected = data[(data["time"] >= start) & (data["time"] < end)]
+            candles = [
+                Candle(row, start=str(int(row.pop("time"))))
+                for row in selected.to_dict("records")
+            ]
+            return {"candles": candles[::-1]}
+
+    monkeypatch.setattr(yfinance.yfinance, "Ticker", Ticker)
+    monkeypatch.setattr(coinbase, "RESTClient", RESTClient)
+    monkeypatch.setenv("COINBASE_API_KEY", "key")
+    monkeypatch.setenv("COINBASE_SECRET_KEY", "secret")
+    cache = HistoryCache(tmp_path)
+    first = data["time"].searchsorted(pd.Timestamp("2023-03-01", tz="UTC").timestamp())
+    for _ in range(2):
+        streamer = YFHistory("BTC-USD", "2023-03-01", "2023-06-01", cache=cache)
+        assert len(streamer.data) == 92
+        assert streamer.next()["close"] == data["close"].iloc[first]
+        streamer = CBHistory("BTC-USD", "2023-03-01", "2023-06-01", cache=cache)
+        assert len(streamer.data) == 92
+        assert streamer.next()["close"] == data["close"].iloc[first]
+    assert [call[0] for call in calls] == ["yfinance", "coinbase"]
+    YFHistory("BTC-USD", "2023-02-01", "2023-06-01", cache=cache)
+    assert len(calls) == 3
+    # The default end is the current time, whatever the local time zone
+    monkeypatch.setenv("TZ", "Asia/Tokyo")
+    time.tzset()
+    try:
+        YFHistory("BTC-USD", "2023-02-01")
+    finally:
+        monkeypatch.delenv("TZ")
+        time.tzset()
+    assert calls[-1][2].tzinfo is not None
+    assert abs(calls[-1][2].timestamp() - time.time()) < 60
+
+
+def test_history_cache_forming_bar(tmp_path, monkeypatch):
+    data = seconds_data()
+    times = data["time"]
+    calls = []
+
+    def fetch(start, end):
+        calls.append((start, end))
+        return data[(times >= start) & (times < end)]
+
+    # The bar of index 150 started one hour ago, and it is not complete
+    now = times[150] + 3600
+    monkeypatch.setattr(history_cache.time, "time", lambda: now)
+    cache = HistoryCache(tmp_path)
+    result = cache.get("test", "BTC-USD", "1d", times[100], now, fetch)
+    assert len(result) == 51
+    result = cache.get("test", "BTC-USD", "1d", times[100], now, fetch)
+    assert len(result) == 51
+    assert calls == [(times[100], now), (now - 86400, now)]
+    assert history_cache.interval_seconds("15m") == 900
+    with pytest.raises(ValueError):
+        history_cache.interval_seconds("daily")
+
+
+class FakeResponse:
+    def __init__(self, status_code):
+        self.status_code = status_code
+
+
+def test_coinbase_pagination(monkeypatch):
+    calls = []
+    active = []
+    lock = threading.Lock()
+
+    class Candle(dict):
+        def to_dict(self):
+            return dict(self)
+
+    class RESTClient:
+        def __init__(self, api_key, api_secret):
+            self.session = requests.Session()
+
+        def get_candles(self, symbol, start, end, period):
+            assert period == "ONE_MINUTE"
+            if (end - start) // 60 + 1 > coinbase.LIMIT:
+                raise HTTPError(response=FakeResponse(400))
+            with lock:
+                calls.append(start)
+                active.append(1)
+                concurrent = len(active)
+                first_call = calls.count(start) == 1
+            try:
+                assert concurrent <= 3
+                if first_call and len(calls) % 4 == 0:
+                    raise HTTPError(response=FakeResponse(429))
+                times = range(start - start % 60, end + 1, 60)
+                candles = [
+                    Candle(start=str(t), low="1", high="2", open="1", close=str(t))
+                    for t in times
+                    if t >= start
+                ]
+                for candle in candles:
+                    candle["volume"] = "10"
+                return {"candles": candles[::-1]}
+            finally:
+                with lock:
+                    active.pop()
+
+    monkeypatch.setattr(coinbase, "RESTClient", RESTClient)
+    monkeypatch.setattr(coinbase, "BACKOFF", 0.0)
+    monkeypatch.setenv("COINBASE_API_KEY", "key")
+    monkeypatch.setenv("COINBASE_SECRET_KEY", "secret")
+    streamer = CBHistory(
+        "BTC-USD",
+        "2023-01-01T00:00:00+00:00",
+        "2023-01-04T00:00:00+00:00",
+        interval="1m",
+        workers=3,
+        limiter=coinbase.TokenBucket(1000.0),
+    )
+    start = pd.Timestamp("2023-01-01", tz="UTC").timestamp()
+    assert len(streamer.data) == 3 * 24 * 60 + 1
+    assert np.array_equal(streamer.data["time"], start + 60 * np.arange(4321))
+    assert np.array_equal(streamer.data["close"], streamer.data["time"])
+    assert len(set(calls)) == 13
+    assert len(calls) > 13
+    adapter = streamer.client.session.get_adapter("https://api.coinbase.com")
+    assert adapter.poolmanager.connection_pool_kw["maxsize"] == 3
+    # Streamers share the rate limit unless given their own
+    first = CBHistory("BTC-USD", "2023-01-01", "2023-01-01")
+    second = CBHistory("ETH-USD", "2023-01-01", "2023-01-01")
+    assert first.limiter is second.limiter is coinbase.LIMITER
+    assert streamer.limiter is not coinbase.LIMITER
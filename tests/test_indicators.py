@@ -1,3 +1,4 @@
+import pickle
 import numpy as np
 import pytest
 from pybottrader.indicators import *
@@ -259,3 +260,624 @@ def test_MACD():
         else:
             assert abs(macd[0].signal - res[i - 33]) < 1e-3
             assert abs(macd[-1].signal - res[i - 34]) < 1e-3
+
+
+def test_update_many():
+    ts = np.array([1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0, 8.0, 9.0, 10.0])
+    for streamed, batched in [(MA(3), MA(3)), (EMA(3), EMA(3)), (MV(3), MV(3))]:
+        expected = np.array([streamed.update(value) for value in ts])
+        result = batched.update_many(ts[:6])
+        np.testing.assert_allclose(result, expected[:6])
+        # Streaming picks up where the batch left off
+        for i in range(6, 10):
+            assert batched.update(ts[i]) == pytest.approx(expected[i])
+    with pytest.raises(ValueError):
+        MA(3).update_many(np.ones((2, 2)))
+
+
+def test_update_many_multiple_inputs():
+    open_price = np.array([1.0, 2.0, 4.0, 3.0, 5.0])
+    close_price = np.array([2.0, 4.0, 3.0, 5.0, 4.0])
+    streamed = RSI(period=3)
+    expected = [streamed.update(o, c) for o, c in zip(open_price, close_price)]
+    rsi = RSI(period=3)
+    np.testing.assert_allclose(rsi.update_many(open_price, close_price), expected)
+    atr = ATR(period=2, mem_size=2)
+    result = atr.update_many(open_price, close_price, close_price)
+    assert np.isnan(result[0])
+    assert result[-1] == pytest.approx(atr[0])
+    assert result[-2] == pytest.approx(atr[-1])
+    with pytest.raises(ValueError):
+        rsi.update_many(open_price, close_price[:2])
+
+
+def test_update_many_macd():
+    ts = np.linspace(10.0, 20.0, 40)
+    macd = MACD(short_period=3, long_period=6, diff_period=4)
+    result = macd.update_many(ts)
+    assert result.dtype.names == ("macd", "signal", "hist")
+    assert np.isnan(result["signal"][7])
+    assert result["signal"][-1] == pytest.approx(macd[0].signal)
+    assert result["hist"][-1] == pytest.approx(macd[0].hist)
+
+
+def test_mv_long_run():
+    """The incremental update should not drift on long series"""
+    period = 200
+    rng = np.random.default_rng(42)
+    ts = 1e4 + np.cumsum(rng.normal(size=100_000))
+    mv = MV(period)
+    result = mv.update_many(ts)
+    assert np.isnan(result[period - 2])
+    expected = np.var(ts[-period:])
+    assert result[-1] == pytest.approx(expected, rel=1e-9)
+
+
+def test_stddev():
+    sd = StdDev(3, mem_size=2)
+    for value in [1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0, 8.0, 9.0, 10.0]:
+        sd.update(value)
+    assert sd[0] == pytest.approx(np.sqrt(2.0 / 3.0))
+    assert sd[-1] == pytest.approx(np.sqrt(2.0 / 3.0))
+
+
+def test_zscore():
+    zs = ZScore(3)
+    assert np.isnan(zs.update(1.0))
+    assert np.isnan(zs.update(2.0))
+    assert zs.update(3.0) == pytest.approx(1.0 / np.sqrt(2.0 / 3.0))
+    # No dispersion
+    zs = ZScore(3)
+    for _ in range(3):
+        zs.update(5.0)
+    assert np.isnan(zs[0])
+
+
+def test_bollinger_bands():
+    bb = BollingerBands(period=3, k=2.0, mem_size=2)
+    bb.update(1.0)
+    bb.update(2.0)
+    assert np.isnan(bb[0].middle)
+    bb.update(3.0)
+    bb.update(4.0)
+    width = 2.0 * np.sqrt(2.0 / 3.0)
+    assert bb[0].middle == pytest.approx(3.0)
+    assert bb[0].upper == pytest.approx(3.0 + width)
+    assert bb[0].lower == pytest.approx(3.0 - width)
+    assert bb[-1].middle == pytest.approx(2.0)
+    for indicator_class in (MV, StdDev, ZScore, BollingerBands):
+        for period in (0, -1):
+            with pytest.raises(ValueError):
+                indicator_class(period)
+
+
+def test_moving_max_min():
+    period = 5
+    rng = np.random.default_rng(7)
+    ts = np.round(rng.normal(size=500) * 3.0)
+    highest = MovingMax(period).update_many(ts)
+    lowest = MovingMin(period).update_many(ts)
+    assert np.isnan(highest[: period - 1]).all()
+    for i in range(period - 1, len(ts)):
+        assert highest[i] == ts[i - period + 1 : i + 1].max()
+        assert lowest[i] == ts[i - period + 1 : i + 1].min()
+
+
+def test_donchian():
+    dc = Donchian(period=3, mem_size=2)
+    dc.update(low_price=1.0, high_price=4.0)
+    dc.update(low_price=2.0, high_price=6.0)
+    assert np.isnan(dc[0].upper)
+    dc.update(low_price=0.5, high_price=3.0)
+    dc.update(low_price=2.5, high_price=5.0)
+    assert dc[-1].upper == pytest.approx(6.0)
+    assert dc[-1].lower == pytest.approx(0.5)
+    assert dc[0].upper == pytest.approx(6.0)
+    assert dc[0].lower == pytest.approx(0.5)
+    assert dc[0].middle == pytest.approx(3.25)
+
+
+def test_stochastic():
+    stoch = Stochastic(k_period=3, d_period=2)
+    low = np.array([1.0, 2.0, 3.0, 2.0, 1.0])
+    high = np.array([3.0, 4.0, 5.0, 4.0, 3.0])
+    close = np.array([2.0, 3.0, 5.0, 2.0, 1.0])
+    result = stoch.update_many(low, high, close)
+    assert np.isnan(result["k"][1])
+    assert result["k"][2] == pytest.approx(100.0)
+    assert np.isnan(result["d"][2])
+    assert result["k"][3] == pytest.approx(0.0)
+    assert result["d"][3] == pytest.approx(50.0)
+    assert stoch[0].k == pytest.approx(0.0)
+
+
+def test_williams_r():
+    wr = WilliamsR(period=3)
+    wr.update(1.0, 3.0, 2.0)
+    assert np.isnan(wr.update(2.0, 4.0, 3.0))
+    assert wr.update(3.0, 5.0, 5.0) == pytest.approx(0.0)
+    assert wr.update(2.0, 4.0, 2.0) == pytest.approx(-100.0)
+
+
+def test_history():
+    ma = MA(period=2, mem_size=4)
+    ma.update_many(np.array([1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0]))
+    history = ma.history()
+    np.testing.assert_allclose(history, [2.5, 3.5, 4.5, 5.5, 6.5][1:])
+    assert history[-1] == ma[0]
+    assert history[-2] == ma[-1]
+    with pytest.raises(ValueError):
+        history[0] = 0.0
+    ma.update(8.0)
+    np.testing.assert_allclose(ma.history(), [4.5, 5.5, 6.5, 7.5])
+
+
+def test_history_macd():
+    macd = MACD(short_period=3, long_period=5, diff_period=2, mem_size=3)
+    macd.update_many(np.linspace(1.0, 10.0, 20))
+    history = macd.history()
+    assert history.dtype.names == ("macd", "signal", "hist")
+    assert len(history) == 3
+    for i in range(3):
+        assert history["signal"][-1 - i] == pytest.approx(macd[-i].signal)
+        assert history["hist"][-1 - i] == pytest.approx(macd[-i].hist)
+
+
+def test_banks():
+    n_steps, n_series, period = 40, 5, 4
+    rng = np.random.default_rng(3)
+    open_price = rng.random((n_steps, n_series)) + 1.0
+    close_price = rng.random((n_steps, n_series)) + 1.0
+    high_price = np.maximum(open_price, close_price) + 0.1
+    low_price = np.minimum(open_price, close_price) - 0.1
+    cases = [
+        (MABank, MA, (open_price,)),
+        (EMABank, EMA, (open_price,)),
+        (RSIBank, RSI, (open_price, close_price)),
+        (ATRBank, ATR, (low_price, high_price, close_price)),
+    ]
+    for bank_class, indicator_class, inputs in cases:
+        bank = bank_class(n_series, period)
+        assert len(bank) == n_series
+        result = np.array(
+            [bank.update(*[data[t] for data in inputs]) for t in range(n_steps)]
+        )
+        for i in range(n_series):
+            indicator = indicator_class(period)
+            expected = indicator.update_many(*[data[:, i] for data in inputs])
+            np.testing.assert_allclose(result[:, i], expected)
+    with pytest.raises(ValueError):
+        MABank(n_series, period).update(np.ones(n_series + 1))
+    for bank_class, _, _ in cases:
+        for args in ((n_series, 0), (n_series, -1), (-1, period)):
+            with pytest.raises(ValueError):
+                bank_class(*args)
+        assert len(bank_class(0, period)) == 0
+
+
+def test_update_many_parallel():
+    rng = np.random.default_rng(5)
+    prices = [rng.random(1000) for _ in range(8)]
+    opens = [rng.random(1000) for _ in range(8)]
+    indicators = [MA(10) for _ in range(4)] + [RSI(10) for _ in range(4)]
+    inputs = prices[:4] + list(zip(opens[4:], prices[4:]))
+    results = update_many_parallel(indicators, inputs, max_workers=4)
+    for i in range(4):
+        np.testing.assert_allclose(results[i], MA(10).update_many(prices[i]))
+        expected = RSI(10).update_many(opens[4 + i], prices[4 + i])
+        np.testing.assert_allclose(results[4 + i], expected)
+    with pytest.raises(ValueError):
+        update_many_parallel([indicators[0], indicators[0]], prices[:2])
+
+
+def test_pickle():
+    rng = np.random.default_rng(11)
+    close = rng.random(200) + 1.0
+    high = close + 0.5
+    low = close - 0.5
+    cases = [
+        (MA(10, mem_size=3), (close,)),
+        (MV(10), (close,)),
+        (EMA(7), (close,)),
+        (RSI(5), (low, close)),
+        (ROI(), (close,)),
+        (MACD(3, 6, 4, mem_size=2), (close,)),
+        (ATR(4), (low, high, close)),
+        (BollingerBands(5), (close,)),
+        (Stochastic(5, 3), (low, high, close)),
+    ]
+    for indicator, inputs in cases:
+        indicator.update_many(*[data[:100] for data in inputs])
+        restored = pickle.loads(pickle.dumps(indicator))
+        assert type(restored) is type(indicator)
+        np.testing.assert_array_equal(restored.history(), indicator.history())
+        expected = indicator.update_many(*[data[100:] for data in inputs])
+        result = restored.update_many(*[data[100:] for data in inputs])
+        np.testing.assert_array_equal(result, expected)
+
+
+def test_pickle_bank():
+    bank = EMABank(n_series=3, period=2)
+    bank.update(np.array([1.0, 2.0, 3.0]))
+    bank.update(np.array([2.0, 3.0, 4.0]))
+    restored = pickle.loads(pickle.dumps(bank))
+    values = np.array([4.0, 5.0, 6.0])
+    np.testing.assert_array_equal(restored.update(values), bank.update(values))
+
+
+def test_indicator_graph():
+    rng = np.random.default_rng(13)
+    close = rng.random(120) + 10.0
+    open_price = close + rng.normal(size=120) * 0.1
+    high = np.maximum(open_price, close) + 0.1
+    low = np.minimum(open_price, close) - 0.1
+    volume = np.ones(120)
+    graph = IndicatorGraph()
+    fast = graph.ema(IndicatorGraph.CLOSE, 12)
+    slow = graph.ema(IndicatorGraph.CLOSE, 26)
+    signal = graph.ema(graph.sub(fast, slow), 9)
+    macd = graph.macd(IndicatorGraph.CLOSE, 12, 26, 9)
+    rsi = graph.rsi(period=5)
+    atr = graph.atr(period=4)
+    assert len(macd) == 3
+    result = graph.update_many(open_price, high, low, close, volume)
+    assert result.shape == (120, len(graph))
+    np.testing.assert_array_equal(result[:, IndicatorGraph.CLOSE], close)
+    # MACD built from EMA nodes matches the MACD indicator
+    expected = MACD(12, 26, 9).update_many(close)
+    np.testing.assert_allclose(result[:, signal], expected["signal"])
+    np.testing.assert_allclose(result[:, macd[1]], expected["signal"])
+    np.testing.assert_allclose(result[:, rsi], RSI(5).update_many(open_price, close))
+    np.testing.assert_allclose(result[:, atr], ATR(4).update_many(low, high, close))
+    # Streaming after the batch, and after pickling
+    restored = pickle.loads(pickle.dumps(graph))
+    values = graph.update(10.0, 10.5, 9.5, 10.2, 1.0)
+    np.testing.assert_array_equal(values, restored.update(10.0, 10.5, 9.5, 10.2, 1.0))
+    # Results are copies, not changed by later updates or nodes
+    previous = values.copy()
+    graph.update(11.0, 11.5, 10.5, 11.2, 1.0)
+    graph.ma(IndicatorGraph.CLOSE, 3)
+    np.testing.assert_array_equal(values, previous)
+    with pytest.raises(ValueError):
+        graph.ma(len(graph), 3)
+    for period in [0, -2]:
+        with pytest.raises(ValueError):
+            graph.ema(IndicatorGraph.CLOSE, period)
+
+
+def test_revise():
+    rng = np.random.default_rng(17)
+    close = np.round(rng.random(200) * 10.0, 1) + 10.0
+    high = close + 0.5
+    low = close - 0.5
+    cases = [
+        (lambda: MA(5, mem_size=3), (close,)),
+        (lambda: MV(5), (close,)),
+        (lambda: EMA(5), (close,)),
+        (lambda: RSI(5), (low, close)),
+        (lambda: ROI(), (close,)),
+        (lambda: ATR(4), (low, high, close)),
+        (lambda: MovingMax(7, mem_size=3), (close,)),
+        (lambda: MovingMin(30), (close,)),
+        (lambda: WilliamsR(5), (low, high, close)),
+    ]
+    for factory, inputs in cases:
+        streamed = factory()
+        revised = factory()
+        for i in range(len(close)):
+            expected = streamed.update(*[data[i] for data in inputs])
+            # A live bar changing twice before closing
+            revised.update(*[data[i] + rng.normal() for data in inputs])
+            revised.revise(*[data[i] - rng.normal() for data in inputs])
+            result = revised.revise(*[data[i] for data in inputs])
+            if np.isnan(expected):
+                assert np.isnan(result)
+            else:
+                assert result == pytest.approx(expected)
+        np.testing.assert_allclose(revised.history(), streamed.history())
+
+
+def test_revise_extremum():
+    # Revisions of a new high keep the entries it replaces
+    highest = MovingMax(1000)
+    values = np.arange(1000.0)[::-1]
+    highest.update_many(values)
+    for value in [2000.0, 500.0, 3000.0, -1.0]:
+        assert highest.revise(value) == max(value, values[0])
+    assert highest.update(998.0) == 998.0
+    with pytest.raises(ValueError):
+        MovingMax(0)
+    with pytest.raises(ValueError):
+        MovingMin(3).reconfigure(0)
+
+
+def test_revise_macd_and_graph():
+    macd = MACD(3, 6, 4)
+    expected = MACD(3, 6, 4).update_many(np.arange(20.0))
+    for value in np.arange(20.0):
+        macd.update(value * 2.0)
+        result = macd.revise(value)
+    assert result.signal == pytest.approx(expected["signal"][-1])
+    graph = IndicatorGraph()
+    slot = graph.ema(graph.ma(IndicatorGraph.CLOSE, 3), 3)
+    reference = EMA(3).update_many(MA(3).update_many(np.arange(20.0))[2:])
+    for value in np.arange(20.0):
+        graph.update(0.0, 0.0, 0.0, value + 1.0)
+        values = graph.revise(0.0, 0.0, 0.0, value)
+    assert values[slot] == pytest.approx(reference[-1])
+
+
+def test_revise_bank():
+    bank = MABank(n_series=2, period=2)
+    bank.update(np.array([1.0, 2.0]))
+    bank.update(np.array([5.0, 5.0]))
+    np.testing.assert_allclose(bank.revise(np.array([3.0, 4.0])), [2.0, 3.0])
+
+
+def test_time_ma():
+    ma = TimeMA(duration=10.0)
+    assert np.isnan(ma.update(0.0, 1.0))
+    assert np.isnan(ma.update(4.0, 2.0))
+    assert ma.update(10.0, 3.0) == pytest.approx(2.5)
+    assert ma.update(13.0, 5.0) == pytest.approx(10.0 / 3.0)
+    assert ma.update(30.0, 7.0) == pytest.approx(7.0)
+    with pytest.raises(ValueError):
+        ma.update(29.0, 1.0)
+    with pytest.raises(ValueError):
+        TimeMA(duration=0.0)
+
+
+def test_time_ema():
+    ema = TimeEMA(duration=2.0)
+    assert np.isnan(ema.update(0.0, 1.0))
+    value = ema.update(2.0, 3.0)
+    assert value == pytest.approx(1.0 + (1.0 - np.exp(-1.0)) * 2.0)
+    # No time elapsed, no weight for the new value
+    assert ema.update(2.0, 100.0) == pytest.approx(value)
+
+
+def test_vwap():
+    rng = np.random.default_rng(7)
+    timestamps = np.cumsum(rng.exponential(1.0, 500))
+    prices = rng.normal(100.0, 1.0, 500)
+    volumes = rng.uniform(0.0, 10.0, 500)
+    result = VWAP(duration=20.0).update_many(timestamps, prices, volumes)
+    for i in range(500):
+        if timestamps[i] - timestamps[0] < 20.0:
+            assert np.isnan(result[i])
+            continue
+        window = slice(
+            np.searchsorted(timestamps, timestamps[i] - 20.0, "right"), i + 1
+        )
+        expected = np.average(prices[window], weights=volumes[window])
+        assert result[i] == pytest.approx(expected)
+
+
+def test_time_revise():
+    updated = VWAP(duration=5.0)
+    revised = VWAP(duration=5.0)
+    for i in range(50):
+        revised.update(float(i) + 3.0, 1.0, 1.0)
+        revised.revise(float(i), float(i % 7), 2.0)
+        updated.update(float(i), float(i % 7), 2.0)
+        assert revised[0] == pytest.approx(updated[0], nan_ok=True)
+    assert pickle.loads(pickle.dumps(revised))[0] == pytest.approx(updated[0])
+
+
+def test_moving_median_quantile():
+    rng = np.random.default_rng(11)
+    values = rng.integers(0, 10, 300).astype(float)
+    medians = MovingMedian(period=8).update_many(values)
+    quantiles = MovingQuantile(period=8, quantile=0.3).update_many(values)
+    assert np.isnan(medians[:7]).all()
+    for i in range(7, 300):
+        assert medians[i] == pytest.approx(np.median(values[i - 7 : i + 1]))
+        assert quantiles[i] == pytest.approx(np.quantile(values[i - 7 : i + 1], 0.3))
+    med = MovingMedian(period=3)
+    med.update(1.0)
+    med.update(5.0)
+    med.update(2.0)
+    assert med.revise(9.0) == pytest.approx(5.0)
+    with pytest.raises(ValueError):
+        MovingQuantile(period=3, quantile=1.5)
+    for period in (0, -1):
+        with pytest.raises(ValueError):
+            MovingMedian(period=period)
+        with pytest.raises(ValueError):
+            MovingQuantile(period=period, quantile=0.5)
+        with pytest.raises(ValueError):
+            med.reconfigure(period)
+    assert med.revise(9.0) == pytest.approx(5.0)
+
+
+def test_moving_covariance():
+    rng = np.random.default_rng(13)
+    values = rng.normal(size=(100, 4)) + rng.normal(size=(100, 1))
+    cov = MovingCovariance(n_series=4, period=10)
+    assert len(cov) == 4
+    for i in range(100):
+        result = cov.update(values[i])
+        cov.revise(values[i] * 2.0)
+        cov.revise(values[i])
+        if i < 9:
+            assert np.isnan(result).all()
+            continue
+        window = values[i - 9 : i + 1].T
+        assert np.allclose(cov.covariance(), np.cov(window, ddof=0))
+        assert np.allclose(cov.correlation(), np.corrcoef(window))
+    restored = pickle.loads(pickle.dumps(cov))
+    assert np.allclose(restored.update(values[0]), cov.update(values[0]))
+    with pytest.raises(ValueError):
+        cov.update(np.zeros(3))
+
+
+def test_moving_covariance_prices():
+    rng = np.random.default_rng(17)
+    prices = 100.0 * np.cumprod(1.0 + rng.normal(0.0, 0.01, size=(30, 3)), axis=0)
+    cov = MovingCovariance(n_series=3, period=5)
+    for row in prices:
+        cov.update_prices(row)
+    returns = prices[1:] / prices[:-1] - 1.0
+    assert np.allclose(cov.covariance(), np.cov(returns[-5:].T, ddof=0))
+    # A missing price carries the previous one forward, with a zero return
+    cov = MovingCovariance(n_series=3, period=5)
+    missing = prices.copy()
+    missing[10, 1] = np.nan
+    missing[12, 2] = 0.0
+    for row in missing:
+        cov.update_prices(row)
+    assert np.allclose(cov.covariance(), np.cov(returns[-5:].T, ddof=0))
+    cov.revise_prices(np.array([np.nan, 100.0, 100.0]))
+    assert np.isfinite(cov.covariance()).all()
+    with pytest.raises(ValueError):
+        cov.update(np.array([0.0, np.nan, 0.0]))
+    with pytest.raises(ValueError):
+        MovingCovariance(n_series=2, period=0)
+
+
+def test_multi_ema():
+    rng = np.random.default_rng(19)
+    values = rng.normal(100.0, 1.0, 200)
+    periods = [3, 12, 26]
+    multi = MultiEMA(periods)
+    assert len(multi) == 3
+    result = multi.update_many(values)
+    assert result.shape == (200, 3)
+    for i, period in enumerate(periods):
+        expected = EMA(period).update_many(values)
+        assert np.allclose(result[:, i], expected, equal_nan=True)
+    emas = [EMA(period) for period in periods]
+    multi = MultiEMA(periods)
+    for value in values[:30]:
+        multi.update(0.0)
+        output = multi.revise(value)
+        assert np.allclose(output, [ema.update(value) for ema in emas], equal_nan=True)
+    for periods in ([0], [3, -1]):
+        with pytest.raises(ValueError):
+            MultiEMA(periods)
+
+
+def test_multi_ma():
+    rng = np.random.default_rng(23)
+    values = rng.normal(1000.0, 10.0, 300)
+    periods = [1, 5, 20, 50]
+    result = multi_ma(values, periods)
+    assert result.shape == (300, 4)
+    for i, period in enumerate(periods):
+        expected = MA(period).update_many(values)
+        assert np.allclose(result[:, i], expected, equal_nan=True)
+    with pytest.raises(ValueError):
+        multi_ma(values, [0])
+
+
+def test_float32():
+    rng = np.random.default_rng(29)
+    open_price = rng.normal(100.0, 1.0, 200)
+    close_price = open_price + rng.normal(0.0, 1.0, 200)
+    ma = MA32(period=10)
+    result = ma.update_many(close_price)
+    assert result.dtype == np.float32
+    assert ma.history().dtype == np.float32
+    assert np.allclose(
+        result, MA(10).update_many(close_price), equal_nan=True, rtol=1e-5
+    )
+    result = RSI32(period=14).update_many(open_price, close_price)
+    expected = RSI(period=14).update_many(open_price, close_price)
+    assert np.allclose(result, expected, equal_nan=True, rtol=1e-4)
+    bank = EMABank32(n_series=200, period=3)
+    for _ in range(3):
+        output = bank.update(close_price)
+    assert output.dtype == np.float32
+    assert np.allclose(output, close_price, rtol=1e-6)
+    restored = pickle.loads(pickle.dumps(ma))
+    assert restored.update(1.0) == ma.update(1.0)
+
+
+def test_reset_reconfigure():
+    rng = np.random.default_rng(31)
+    values = rng.normal(100.0, 1.0, 100)
+    ema = EMA(period=5, mem_size=3)
+    expected = ema.update_many(values)
+    ema.reset()
+    assert np.isnan(ema.update(1.0))
+    ema.reset()
+    assert np.array_equal(ema.update_many(values), expected, equal_nan=True)
+    ema.reconfigure(period=8)
+    assert np.array_equal(
+        ema.update_many(values), EMA(period=8).update_many(values), equal_nan=True
+    )
+    macd = MACD(3, 6, 2)
+    macd.update_many(values)
+    macd.reconfigure(short_period=5, long_period=10, diff_period=3)
+    result = macd.update_many(values)
+    expected = MACD(5, 10, 3).update_many(values)
+    assert np.allclose(result["hist"], expected["hist"], equal_nan=True)
+    median = MovingMedian(period=3)
+    median.update_many(values)
+    median.reconfigure(period=5)
+    assert np.isnan(median.update(1.0))
+    # Parameters not given are kept
+    ema = EMA(period=5, alpha=3.0)
+    ema.reconfigure(period=3)
+    assert ema.update_many(values)[-1] == pytest.approx(
+        EMA(period=3, alpha=3.0).update_many(values)[-1]
+    )
+    bands = BollingerBands(period=20, k=3.0)
+    bands.update_many(values)
+    bands.reconfigure(10)
+    assert bands.update_many(values)[-1] == BollingerBands(10, 3.0).update_many(values)[-1]
+    bands.reconfigure(10, 1.0)
+    assert bands.update_many(values)[-1] == BollingerBands(10, 1.0).update_many(values)[-1]
+    # Rejected periods leave the indicators unchanged
+    indicators = [
+        (MA(3), (1.0,)),
+        (MA32(3), (1.0,)),
+        (EMA(3), (1.0,)),
+        (EMA32(3), (1.0,)),
+        (MV(3), (1.0,)),
+        (StdDev(3), (1.0,)),
+        (ZScore(3), (1.0,)),
+        (BollingerBands(3), (1.0,)),
+        (RSI(3), (1.0, 2.0)),
+        (ATR(3), (1.0, 2.0, 1.5)),
+        (MovingMax(3), (1.0,)),
+        (Donchian(3), (1.0, 2.0)),
+        (WilliamsR(3), (1.0, 2.0, 1.5)),
+    ]
+    for indicator, inputs in indicators:
+        for period in (0, -1):
+            with pytest.raises(ValueError):
+                indicator.reconfigure(period)
+        for i in range(3):
+            result = indicator.update(*[value + i for value in inputs])
+        assert not np.isnan(getattr(result, "middle", result))
+    for periods in ((0, 3), (3, 0)):
+        with pytest.raises(ValueError):
+            Stochastic(3, 3).reconfigure(*periods)
+    for periods in ((0, 6, 2), (3, 0, 2), (3, 6, -1)):
+        with pytest.raises(ValueError):
+            MACD(3, 6, 2).reconfigure(*periods)
+        with pytest.raises(ValueError):
+            MACD(*periods)
+    for indicator_class in (MA, MA32, EMA, EMA32, RSI, ATR):
+        with pytest.raises(ValueError):
+            indicator_class(0)
+
+
+def test_return_series():
+    values = np.array([100.0, 110.0, 0.0, 50.0, np.nan, 60.0, 66.0])
+    expected = [roi(a, b) for a, b in zip(values[:-1], values[1:])]
+    assert np.allclose(roi_array(values[:-1], values[1:]), expected, equal_nan=True)
+    result = log_returns(values)
+    assert np.isnan(result[0])
+    assert result[1] == pytest.approx(np.log(1.1))
+    assert np.isnan(result[3])
+    assert np.allclose(
+        cumulative_returns(values), [roi(100.0, v) for v in values], equal_nan=True
+    )
+    result = rolling_returns(values, 2)
+    assert np.isnan(result[:2]).all()
+    assert result[3] == pytest.approx(roi(110.0, 50.0))
+    assert np.isnan(result[6])
+    with pytest.raises(ValueError):
+        rolling_returns(values, 0)